@@ -0,0 +1,259 @@
+"""
+Availability windows and blackout periods for StudyBunny
+
+A user's availability is stored compactly on UserAvailability: seven lists
+of [start, end] minutes from local midnight (Monday first) for the weekly
+windows, plus one-off [start, end] datetime blackouts (exams, travel).
+Availability compiles them into the free intervals and the available
+seconds of each day of a horizon, which CapacityCalendar turns into
+per-day capacity, so the schedulers keep an O(1) lookup per day.
+
+Users without a row get DEFAULT_WEEKLY_WINDOWS (08:00-24:00, the 16 hours
+TimeCalculation.get_time_d assumes) and no blackouts; the capacity code
+keeps using the TimeCalculation formulas for them unchanged.
+"""
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+SECONDS_PER_DAY = 24 * 3600
+
+# No work between midnight and 08:00, as in TimeCalculation
+DEFAULT_WEEKLY_WINDOWS = [[[8 * 60, 24 * 60]] for _ in range(7)]
+
+
+def merge_intervals(intervals):
+    """
+    Sort intervals and merge the overlapping and touching ones
+
+    Args:
+        intervals (list): (start, end) pairs
+
+    Returns:
+        list: Disjoint (start, end) tuples in ascending order
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(intervals, removed):
+    """
+    Remove one sorted, disjoint interval list from another in a single pass
+
+    Returns:
+        list: The parts of intervals not covered by removed
+    """
+    result = []
+    index = 0
+    for start, end in intervals:
+        # Skip removals that end before this interval
+        while index < len(removed) and removed[index][1] <= start:
+            index += 1
+        cursor = start
+        position = index
+        while position < len(removed) and removed[position][0] < end:
+            removed_start, removed_end = removed[position]
+            if removed_start > cursor:
+                result.append((cursor, removed_start))
+            cursor = max(cursor, removed_end)
+            position += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def _seconds_of_day(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _parse_datetime(value):
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Invalid datetime: {value}")
+        value = parsed
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class Availability:
+    """
+    Compiled weekly windows and blackouts of one user
+    """
+
+    def __init__(self, weekly_windows=None, blackouts=None):
+        """
+        Args:
+            weekly_windows (list, optional): Seven lists (Monday first) of [start, end] minutes
+                from local midnight (defaults to DEFAULT_WEEKLY_WINDOWS)
+            blackouts (list, optional): [start, end] datetimes or ISO 8601 strings
+
+        Raises:
+            ValueError: If a window or blackout is malformed
+        """
+        self.is_default = not weekly_windows and not blackouts
+        if not weekly_windows:
+            weekly_windows = DEFAULT_WEEKLY_WINDOWS
+        if len(weekly_windows) != 7:
+            raise ValueError("weekly_windows must have one list of windows per weekday")
+
+        self.weekly_windows = []
+        for day_windows in weekly_windows:
+            windows = []
+            for start, end in day_windows:
+                if not 0 <= start < end <= 24 * 60:
+                    raise ValueError("Windows must be [start, end] minutes with 0 <= start < end <= 1440")
+                windows.append((start * 60, end * 60))
+            self.weekly_windows.append(merge_intervals(windows))
+
+        self.blackouts = []
+        for start, end in blackouts or []:
+            start, end = _parse_datetime(start), _parse_datetime(end)
+            if start >= end:
+                raise ValueError("Blackouts must end after they start")
+            self.blackouts.append((start, end))
+        self.blackouts.sort()
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Load a user's availability with one query (the default one if they have none)
+        """
+        from .models import UserAvailability
+
+        row = UserAvailability.objects.filter(user=user).values('weekly_windows', 'blackouts').first()
+        if row is None:
+            return cls()
+        return cls(row['weekly_windows'], row['blackouts'])
+
+    def _blackouts_by_day(self, start_date, days):
+        """
+        Get the blackout parts falling on each day of the horizon, as local
+        seconds from midnight
+        """
+        end_date = start_date + timedelta(days=days - 1)
+        by_day = {}
+        for start, end in self.blackouts:
+            local_start, local_end = timezone.localtime(start), timezone.localtime(end)
+            first_day = max(local_start.date(), start_date)
+            last_day = min(local_end.date(), end_date)
+            current_date = first_day
+            while current_date <= last_day:
+                day_start = _seconds_of_day(local_start) if current_date == local_start.date() else 0
+                day_end = _seconds_of_day(local_end) if current_date == local_end.date() else SECONDS_PER_DAY
+                if day_start < day_end:
+                    by_day.setdefault(current_date, []).append((day_start, day_end))
+                current_date += timedelta(days=1)
+        return {day: merge_intervals(intervals) for day, intervals in by_day.items()}
+
+    def day_intervals(self, start_date, days, now=None):
+        """
+        Compile the free intervals of every day of a horizon
+
+        Args:
+            start_date (date): First day
+            days (int): Number of days
+            now (datetime, optional): Current time; on its local date only the
+                intervals after it are kept
+
+        Returns:
+            list: For each day, disjoint (start, end) local seconds from midnight
+        """
+        if days <= 0:
+            return []
+        blackouts = self._blackouts_by_day(start_date, days)
+        local_now = timezone.localtime(now) if now is not None else None
+
+        compiled = []
+        for day_index in range(days):
+            current_date = start_date + timedelta(days=day_index)
+            intervals = self.weekly_windows[current_date.weekday()]
+            if current_date in blackouts:
+                intervals = subtract_intervals(intervals, blackouts[current_date])
+            if local_now is not None and current_date == local_now.date():
+                intervals = subtract_intervals(intervals, [(0, _seconds_of_day(local_now))])
+            compiled.append(intervals)
+        return compiled
+
+    def available_seconds(self, start_date, days, now=None):
+        """
+        Compile the available seconds of every day of a horizon (see day_intervals)
+
+        Returns:
+            list: Seconds per day
+        """
+        return [
+            sum(end - start for start, end in intervals)
+            for intervals in self.day_intervals(start_date, days, now=now)
+        ]
+
+
+def get_user_availability(user):
+    """
+    Get a user's compiled availability (one query)
+    """
+    return Availability.for_user(user)
+
+
+def get_user_availabilities(user_ids):
+    """
+    Get the compiled availability of several users with one query
+
+    Returns:
+        dict: user id -> Availability
+    """
+    from .models import UserAvailability
+
+    rows = {
+        row['user_id']: row
+        for row in UserAvailability.objects.filter(user_id__in=user_ids).values(
+            'user_id', 'weekly_windows', 'blackouts'
+        )
+    }
+    default = Availability()
+    return {
+        user_id: Availability(rows[user_id]['weekly_windows'], rows[user_id]['blackouts'])
+        if user_id in rows else default
+        for user_id in user_ids
+    }
+
+
+def set_user_availability(user, weekly_windows=None, blackouts=None):
+    """
+    Store a user's availability and make their schedules recompute
+
+    Args:
+        user: User instance
+        weekly_windows (list, optional): See Availability (None for the default windows)
+        blackouts (list, optional): See Availability
+
+    Returns:
+        Availability: The compiled availability
+
+    Raises:
+        ValueError: If a window or blackout is malformed
+    """
+    from .models import UserAvailability
+    from apps.study.models import DailySchedule
+    from apps.study.schedule_cache import invalidate_user_schedule
+
+    availability = Availability(weekly_windows, blackouts)
+    UserAvailability.objects.update_or_create(
+        user=user,
+        defaults={
+            'weekly_windows': [[list(window) for window in day_windows] for day_windows in weekly_windows or []],
+            'blackouts': [[start.isoformat(), end.isoformat()] for start, end in availability.blackouts],
+        }
+    )
+
+    # Cached schedules are keyed by the task-set version, materialized ones by
+    # their data version; reset both
+    invalidate_user_schedule(user.id)
+    DailySchedule.objects.filter(user=user, plan_start_date__isnull=False).update(data_version='')
+    return availability
@@ -0,0 +1,105 @@
+"""
+Precomputed daily capacity for StudyBunny
+
+The scheduler loops look up the free time of the same days over and over,
+once per simulated day and intensity probe. A CapacityCalendar computes the
+free time of every day of a horizon at one intensity up front, using the
+same formulas as TimeCalculation.get_free_d and get_free_today, so the loops
+read it by day index.
+
+With a user's Availability, the compiled available time of each day (weekly
+windows minus blackouts, and for the current day only what is left after
+now) takes the place of get_time_d's fixed 16 hours and of the bedtime rule
+of get_free_today.
+"""
+from datetime import timedelta
+from django.utils import timezone
+
+from .models import TimeCalculation
+
+
+class CapacityCalendar:
+    """
+    Free time of each day from start_date for a number of days, at one intensity.
+
+    Days other than the user's current day get TimeCalculation.get_free_d's
+    value. The current day gets the time left today (get_free_today) unless
+    use_free_today is False.
+    """
+
+    def __init__(self, start_date, days, intensity, user_today=None, use_free_today=True, availability=None):
+        """
+        Args:
+            start_date (date): First day of the calendar
+            days (int): Number of days
+            intensity (float): Intensity value between 0.0 and 1.0
+            user_today (date, optional): The user's current date (defaults to today in CDT)
+            use_free_today (bool, optional): Size the user's current day with the time left
+                today (defaults to True)
+            availability (Availability, optional): The user's availability windows and
+                blackouts (defaults to 08:00-24:00 every day)
+
+        Raises:
+            ValueError: If the intensity value is out of range
+        """
+        if not 0.0 <= intensity <= 1.0:
+            raise ValueError("Intensity value must be between 0.0 and 1.0")
+        if user_today is None and use_free_today:
+            from apps.study.simulation import get_user_today
+            user_today = get_user_today()
+
+        self.start_date = start_date
+        self.intensity = intensity
+        self.user_today = user_today if use_free_today else None
+
+        if availability is not None and availability.is_default:
+            availability = None
+        available_seconds = None
+        if availability is not None:
+            now = timezone.now() if self.user_today is not None else None
+            available_seconds = availability.available_seconds(start_date, days, now=now)
+
+        free_factor = TimeCalculation.get_free_factor(intensity)
+        self.free_time = []
+        for day_index in range(days):
+            current_date = start_date + timedelta(days=day_index)
+            if available_seconds is not None:
+                available_time = timedelta(seconds=available_seconds[day_index])
+                if current_date == self.user_today:
+                    self.free_time.append(TimeCalculation.get_free_today(
+                        intensity_value=intensity, available_time=available_time
+                    ))
+                else:
+                    self.free_time.append(available_time * free_factor)
+            elif current_date == self.user_today:
+                self.free_time.append(TimeCalculation.get_free_today(intensity_value=intensity))
+            else:
+                # Same expression as get_free_d, so the values match exactly
+                self.free_time.append(TimeCalculation.get_time_d(current_date) * free_factor)
+        self.free_seconds = [free_time.total_seconds() for free_time in self.free_time]
+
+    @classmethod
+    def for_period(cls, start_date, end_date, intensity, user_today=None, use_free_today=True, availability=None):
+        """
+        Build a calendar covering start_date to end_date (inclusive)
+        """
+        days = max(0, (end_date - start_date).days + 1)
+        return cls(
+            start_date, days, intensity,
+            user_today=user_today, use_free_today=use_free_today, availability=availability
+        )
+
+    def __len__(self):
+        return len(self.free_time)
+
+    def day_index(self, target_date):
+        """
+        Get the index of a date in the calendar
+        """
+        return (target_date - self.start_date).days
+
+    def total_free_time(self):
+        """
+        Get the free time of all days combined
+        """
+        return sum(self.free_time, timedelta())
@@ -1,21 +1,83 @@
 """
 Intensity utility functions for StudyBunny
+
+The global intensity is read on almost every scheduler call, so get_intensity
+keeps the value in a process-local cache stamped with a version token. The
+token lives in Django's cache and is replaced by set_intensity, so every
+process (e.g. each gunicorn worker) sharing that cache reloads the row on
+its next read; production always configures a shared cache. Both the local
+value and the token also expire after SCHEDULE_CACHE_TIMEOUT, so a process
+that cannot see the new token (a per-process cache) reloads it then.
+
+Users can have their own intensity (UserIntensity), which replaces the
+global value for their schedules only. get_user_intensity resolves it once
+and the scheduler passes the value down explicitly, so a user's change only
+affects that user's cached and materialized schedules. The per-user value
+is cached for SCHEDULE_CACHE_TIMEOUT as well, so a process that did not
+see set_user_intensity rewrite it reads the new value once it expires.
 """
+import threading
+import time
+import uuid
 from django.conf import settings
+from django.core.cache import cache
+from study_bunny.caching import get_cache_timeout
 from typing import Dict, Any, Tuple
 from datetime import date, timedelta
 
+INTENSITY_VERSION_KEY = 'core:intensity_version'
+
+_local_intensity = {'version': None, 'value': None, 'expires': 0.0}
+_local_intensity_lock = threading.Lock()
+
+
+def _get_intensity_version() -> str:
+    """
+    Get the current intensity version token, creating one if needed
+    """
+    version = cache.get(INTENSITY_VERSION_KEY)
+    if version is None:
+        # add() keeps a token another process created in the meantime
+        cache.add(INTENSITY_VERSION_KEY, uuid.uuid4().hex, timeout=get_cache_timeout())
+        version = cache.get(INTENSITY_VERSION_KEY)
+    return version
+
+
+def invalidate_intensity_cache() -> None:
+    """
+    Make every process reload the intensity from the database on its next read
+    """
+    cache.set(INTENSITY_VERSION_KEY, uuid.uuid4().hex, timeout=get_cache_timeout())
+    with _local_intensity_lock:
+        _local_intensity['version'] = None
+
 
 def get_intensity() -> float:
     """
-    Get the current global intensity value from the database
+    Get the current global intensity value, from the process-local cache
+    while its version is current and it has not expired, otherwise from the
+    database
     
     Returns:
         float: Intensity value between 0.0 and 1.0
     """
     try:
+        # Read the version before the row, so a concurrent update is never
+        # cached under the newer version
+        version = _get_intensity_version()
+        now = time.time()
+        with _local_intensity_lock:
+            if (version is not None and _local_intensity['version'] == version
+                    and now < _local_intensity['expires']):
+                return _local_intensity['value']
+        
         from .models import GlobalIntensity
-        return GlobalIntensity.get_current_intensity()
+        value = GlobalIntensity.get_current_intensity()
+        with _local_intensity_lock:
+            _local_intensity['version'] = version
+            _local_intensity['value'] = value
+            _local_intensity['expires'] = now + get_cache_timeout()
+        return value
     except Exception as e:
         # If database access fails, fall back to settings
         import logging
@@ -48,16 +110,90 @@ def set_intensity(value: float) -> None:
         logger = logging.getLogger(__name__)
         logger.warning(f"Failed to save intensity to database: {e}")
         settings.STUDYBUNNY_INTENSITY = value
+    finally:
+        invalidate_intensity_cache()
+
+
+def _user_intensity_key(user_id) -> str:
+    return f'core:user_intensity:{user_id}'
+
+
+def get_user_intensity(user) -> float:
+    """
+    Get the intensity a user's schedules use: their own if they set one,
+    otherwise the global intensity
+    
+    Args:
+        user: User instance
+        
+    Returns:
+        float: Intensity value between 0.0 and 1.0
+    """
+    key = _user_intensity_key(user.id)
+    # Cached as a dict so "no profile" (None) is distinguishable from a miss
+    cached = cache.get(key)
+    if cached is None:
+        from .models import UserIntensity
+        value = UserIntensity.objects.filter(user=user).values_list('intensity', flat=True).first()
+        cached = {'intensity': value}
+        cache.set(key, cached, timeout=get_cache_timeout())
+    
+    if cached['intensity'] is None:
+        return get_intensity()
+    return cached['intensity']
+
+
+def get_user_intensities(user_ids) -> Dict[int, float]:
+    """
+    Get the intensity of several users with at most one query
+    
+    Args:
+        user_ids (list): User ids
+        
+    Returns:
+        dict: user id -> intensity value
+    """
+    from .models import UserIntensity
+    profiles = dict(
+        UserIntensity.objects.filter(user_id__in=user_ids).values_list('user_id', 'intensity')
+    )
+    global_intensity = get_intensity()
+    return {user_id: profiles.get(user_id, global_intensity) for user_id in user_ids}
 
 
-def get_intensity_info() -> Dict[str, Any]:
+def set_user_intensity(user, value) -> None:
+    """
+    Set a user's own intensity, or remove it to fall back to the global one
+    
+    Args:
+        user: User instance
+        value (float): Intensity value between 0.15 and 0.85, or None to remove it
+        
+    Raises:
+        ValueError: If value is not between 0.15 and 0.85
+    """
+    from .models import UserIntensity
+    if value is None:
+        UserIntensity.objects.filter(user=user).delete()
+    else:
+        if not 0.15 <= value <= 0.85:
+            raise ValueError("Intensity must be between 0.15 and 0.85")
+        UserIntensity.objects.update_or_create(user=user, defaults={'intensity': value})
+    cache.set(_user_intensity_key(user.id), {'intensity': value}, timeout=get_cache_timeout())
+
+
+def get_intensity_info(intensity: float = None) -> Dict[str, Any]:
     """
     Get comprehensive intensity information
     
+    Args:
+        intensity: Intensity value to describe (defaults to the global intensity)
+    
     Returns:
         Dict containing intensity details and impact
     """
-    intensity = get_intensity()
+    if intensity is None:
+        intensity = get_intensity()
     
     # Calculate intensity impact factors
     intensityXcap = intensity * 2/5 + 3/5 * (2 * intensity - intensity**2)
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0003_user_intensity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weekly_windows",
+                    models.JSONField(
+                        default=list,
+                        help_text="Seven lists (Monday first) of [start, end] minutes from local midnight",
+                    ),
+                ),
+                (
+                    "blackouts",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="List of [start, end] ISO 8601 datetimes when the user can't work",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User Availability",
+                "verbose_name_plural": "User Availability",
+            },
+        ),
+    ]
@@ -54,6 +54,52 @@ class GlobalIntensity(models.Model):
         intensity_obj.save()
         return intensity_obj
 
+class UserIntensity(models.Model):
+    """
+    A user's own intensity, used instead of the global intensity for that
+    user's schedules
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='intensity_profile')
+    intensity = models.FloatField(
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
+        help_text="User intensity value between 0.0 and 1.0"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "User Intensity"
+        verbose_name_plural = "User Intensities"
+    
+    def __str__(self):
+        return f"Intensity for {self.user}: {self.intensity}"
+
+class UserAvailability(models.Model):
+    """
+    A user's weekly availability windows and one-off blackout periods
+    (see availability.py). Users without a row are available 08:00-24:00
+    every day.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='availability')
+    weekly_windows = models.JSONField(
+        default=list,
+        help_text="Seven lists (Monday first) of [start, end] minutes from local midnight"
+    )
+    blackouts = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="List of [start, end] ISO 8601 datetimes when the user can't work"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "User Availability"
+        verbose_name_plural = "User Availability"
+    
+    def __str__(self):
+        return f"Availability for {self.user}"
+
 def currentTimeInHours():
     """
     Get current time in hours (0-24)
@@ -67,8 +113,9 @@ def get_intensity():
     Get the current global intensity value
     Returns: float between 0.0 and 1.0
     """
-    from django.conf import settings
-    return getattr(settings, 'STUDYBUNNY_INTENSITY', 0.7)
+    # Cached database value, the same one the scheduler uses (falls back to settings)
+    from .intensity import get_intensity as get_cached_intensity
+    return get_cached_intensity()
 
 class TimeCalculation(models.Model):
     """Model to store time calculations for different dates"""
@@ -111,7 +158,7 @@ class TimeCalculation(models.Model):
         return max(timedelta(0), time_left)  # Don't return negative time
     
     @classmethod
-    def get_free_today(cls, target_date=None, intensity_value=None):
+    def get_free_today(cls, target_date=None, intensity_value=None, available_time=None):
         """
         Calculate free time available today
         Excludes bedtime hours (00:00 to 08:00) only if current time is before 8:00 AM
@@ -120,25 +167,28 @@ class TimeCalculation(models.Model):
         Args:
             target_date: Date to calculate for (defaults to today)
             intensity_value: Optional intensity value (0.0-1.0). If None, uses global intensity
+            available_time: Optional time the user can still work today (e.g. from their
+                availability windows). If None, the time until midnight minus bedtime is used
         """
-        time_today = cls.get_time_today(target_date)
-        
-        # Check if current time is before 8:00 AM
-        from django.utils import timezone
-        import pytz
-        
-        user_tz = pytz.timezone('America/Chicago')  # CDT timezone
-        now_user = timezone.now().astimezone(user_tz)
-        current_hour = now_user.hour
-        
-        # Only subtract bedtime hours if it's before 8:00 AM
-        if current_hour < 8:
-            # Subtract remaining bedtime hours (from current time to 8:00 AM)
-            bedtime_remaining = timedelta(hours=8 - current_hour)
-            available_time = time_today - bedtime_remaining
-        else:
-            # It's already past 8:00 AM, so bedtime period has passed
-            available_time = time_today
+        if available_time is None:
+            time_today = cls.get_time_today(target_date)
+            
+            # Check if current time is before 8:00 AM
+            from django.utils import timezone
+            import pytz
+            
+            user_tz = pytz.timezone('America/Chicago')  # CDT timezone
+            now_user = timezone.now().astimezone(user_tz)
+            current_hour = now_user.hour
+            
+            # Only subtract bedtime hours if it's before 8:00 AM
+            if current_hour < 8:
+                # Subtract remaining bedtime hours (from current time to 8:00 AM)
+                bedtime_remaining = timedelta(hours=8 - current_hour)
+                available_time = time_today - bedtime_remaining
+            else:
+                # It's already past 8:00 AM, so bedtime period has passed
+                available_time = time_today
         
         # Ensure we don't go negative
         if available_time.total_seconds() < 0:
@@ -167,6 +217,37 @@ class TimeCalculation(models.Model):
         """
         return timedelta(hours=16)  # 24 hours - 8 hours bedtime = 16 hours
     
+    @classmethod
+    def get_free_factor(cls, intensity):
+        """
+        Fraction of a day's available time that is free at the given intensity
+        Returns: float between 0.0 and 0.975
+        """
+        intensityY = min(0.95, (2 * intensity - intensity**2))
+        return (intensity + intensityY) / 2
+    
+    @classmethod
+    def get_intensity_for_free_factor(cls, factor):
+        """
+        Inverse of get_free_factor: the lowest intensity whose free factor
+        is at least the given value
+        Returns: float between 0.0 and 1.0, or None if no intensity is high enough
+        """
+        if factor <= 0.0:
+            return 0.0
+        if factor > cls.get_free_factor(1.0):
+            return None
+        
+        # intensityY reaches its 0.95 cap at 2x - x^2 = 0.95
+        cap_intensity = 1 - math.sqrt(0.05)
+        if factor <= cls.get_free_factor(cap_intensity):
+            # factor = (3x - x^2) / 2
+            intensity = (3 - math.sqrt(9 - 8 * factor)) / 2
+        else:
+            # factor = (x + 0.95) / 2
+            intensity = 2 * factor - 0.95
+        return min(1.0, intensity)
+    
     @classmethod
     def get_free_d(cls, target_date, intensity_value=None):
         """
@@ -197,6 +278,5 @@ class TimeCalculation(models.Model):
             # For future dates, assume a reasonable time (e.g., 12:00 PM = 12.0 hours)
             # This can be customized based on your scheduling preferences
             current_hours = 18.0  # Midday assumption for future dates
-        intensityY = min(0.95, (2 * intensityX - intensityX**2))
         
-        return time_d * ((intensityX + intensityY)/2)
+        return time_d * cls.get_free_factor(intensityX)
@@ -0,0 +1,169 @@
+"""
+Time-slot placement for StudyBunny
+
+The schedulers decide how much time each task gets on a day; this module
+turns a day's allocations into concrete, non-overlapping sessions inside
+the day's free intervals (see Availability.day_intervals).
+
+FreeIntervals keeps the day's gaps sorted by start time with a max
+segment tree over their remaining lengths, so the leftmost gap that can
+hold a block is found in O(log m). Blocks only ever take time from the
+front of a gap, and a gap is emptied at most once, so placing k blocks
+among m gaps costs O((k + m) log m).
+"""
+from datetime import time, timedelta
+
+SECONDS_PER_DAY = 24 * 3600
+
+# Gaps shorter than this are not worth starting a session in
+MIN_SESSION_SECONDS = 1.0
+
+
+def seconds_to_time(seconds):
+    """
+    Convert seconds from local midnight to a time (midnight at the end of the day is 00:00)
+    """
+    seconds = int(round(seconds)) % SECONDS_PER_DAY
+    return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+
+class FreeIntervals:
+    """
+    The free gaps of one day with a max segment tree over their remaining lengths.
+    """
+
+    def __init__(self, intervals):
+        """
+        Args:
+            intervals (list): Disjoint (start, end) seconds from local midnight, sorted by start
+        """
+        self.starts = [float(start) for start, _ in intervals]
+        self.ends = [float(end) for _, end in intervals]
+        self.size = 1
+        while self.size < len(self.starts):
+            self.size *= 2
+        self.tree = [0.0] * (2 * self.size)
+        for index, (start, end) in enumerate(zip(self.starts, self.ends)):
+            self.tree[self.size + index] = end - start
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def largest(self):
+        """Get the length of the longest remaining gap"""
+        return self.tree[1]
+
+    def first_fit(self, length):
+        """
+        Get the index of the leftmost gap with at least length seconds left, or None
+        """
+        if not self.starts or self.tree[1] < length:
+            return None
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.tree[2 * node] >= length else 2 * node + 1
+        return node - self.size
+
+    def take(self, index, length):
+        """
+        Take length seconds from the front of a gap
+
+        Returns:
+            tuple: The (start, end) seconds taken
+        """
+        start = self.starts[index]
+        end = min(self.ends[index], start + length)
+        self.starts[index] = end
+        node = self.size + index
+        self.tree[node] = self.ends[index] - end
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+        return start, end
+
+
+def place_day_plan(daily_plan, intervals):
+    """
+    Place a day's allocations into non-overlapping sessions within its free intervals.
+
+    Items keep their plan order. Each one goes into the leftmost gap that can
+    hold it whole (first fit); an item longer than every remaining gap is split
+    into sessions over the leftmost gaps, each session becoming its own item
+    with its share of the time and progress. Only if the allocations exceed the
+    day's free time, which the capacity calendar prevents, do sessions run past
+    the last interval.
+
+    Args:
+        daily_plan (list): Plan items, each with a time_allotted timedelta
+        intervals (list): Disjoint (start, end) seconds from local midnight, sorted by start
+
+    Returns:
+        list: The plan items with start_time and end_time set
+    """
+    gaps = FreeIntervals(intervals)
+    overflow_start = gaps.ends[-1] if len(gaps) else 0.0
+    placed = []
+    for item in daily_plan:
+        length = item['time_allotted'].total_seconds()
+        index = gaps.first_fit(length)
+        if index is not None:
+            placed.append(_session(item, *gaps.take(index, length)))
+            continue
+
+        # Split over the leftmost gaps in order
+        sessions = []
+        remaining = length
+        while remaining > 0:
+            index = gaps.first_fit(min(remaining, MIN_SESSION_SECONDS))
+            if index is None:
+                sessions.append((overflow_start, overflow_start + remaining))
+                overflow_start += remaining
+                break
+            start, end = gaps.take(index, remaining)
+            sessions.append((start, end))
+            remaining -= end - start
+        placed.extend(_split_item(item, sessions))
+    return placed
+
+
+def _session(item, start, end):
+    session = dict(item)
+    session['start_time'] = seconds_to_time(start)
+    session['end_time'] = seconds_to_time(end)
+    return session
+
+
+def _split_item(item, sessions):
+    """
+    Split an item into one item per session, sharing out its time and progress
+    """
+    if len(sessions) == 1:
+        return [_session(item, *sessions[0])]
+
+    total_time = item['time_allotted']
+    total_seconds = total_time.total_seconds()
+    completion_before = item.get('completion_before')
+    completion_after = item.get('completion_after')
+    track_progress = completion_before is not None and completion_after is not None
+
+    pieces = []
+    allotted_so_far = timedelta()
+    for position, (start, end) in enumerate(sessions):
+        piece = _session(item, start, end)
+        last = position == len(sessions) - 1
+        piece['time_allotted'] = total_time - allotted_so_far if last else timedelta(seconds=end - start)
+        if track_progress:
+            share = (allotted_so_far + piece['time_allotted']).total_seconds() / total_seconds
+            piece['completion_before'] = pieces[-1]['completion_after'] if pieces else completion_before
+            piece['completion_after'] = completion_after if last else (
+                completion_before + (completion_after - completion_before) * share
+            )
+        if not last:
+            # Only the day's last session of the task can be a partial completion
+            piece.pop('partial_completion', None)
+        allotted_so_far += piece['time_allotted']
+        pieces.append(piece)
+    return pieces
@@ -1,3 +1,296 @@
-from django.test import TestCase
+import io
+import re
+import time as time_module
+from contextlib import redirect_stdout
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
-# Create your tests here.
+from django.contrib.auth.models import User
+
+from apps.core.intensity import (
+    INTENSITY_VERSION_KEY, get_intensity, get_user_intensity, set_intensity, set_user_intensity,
+)
+from apps.core.availability import Availability, merge_intervals, subtract_intervals
+from apps.core.capacity import CapacityCalendar
+from apps.core.models import GlobalIntensity, TimeCalculation, UserIntensity
+from apps.core.slots import FreeIntervals, place_day_plan
+from apps.study.models import Task
+from study_bunny.instrumentation import endpoint_stats
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True)
+class InstrumentationMiddlewareTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        endpoint_stats.reset()
+
+    def test_server_timing_header_reports_queries_and_simulations(self):
+        with redirect_stdout(io.StringIO()):
+            self.client.post('/api/study/tasks/create/', {
+                'title': 'Essay', 'T_n': '03:00:00', 'delta': 3,
+                'due_date': (date.today() + timedelta(days=5)).isoformat(), 'due_time': '17:00:00',
+            }, content_type='application/json')
+            response = self.client.get('/api/study/get-14-day-schedule/')
+
+        server_timing = response['Server-Timing']
+        queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', server_timing).group(1))
+        simulations = int(re.search(r'simulations;desc="(\d+)"', server_timing).group(1))
+        self.assertGreater(queries, 0)
+        self.assertGreater(simulations, 0)
+        self.assertRegex(server_timing, r'scheduler;dur=[\d.]+')
+
+    def test_stats_endpoint_aggregates_per_url_name(self):
+        for _ in range(3):
+            self.client.get('/api/core/intensity/')
+
+        stats = self.client.get('/api/core/instrumentation/stats/').json()
+
+        self.assertTrue(stats['enabled'])
+        endpoint = stats['endpoints']['get-intensity']
+        self.assertEqual(endpoint['count'], 3)
+        self.assertEqual(set(endpoint['total_ms']), {'p50', 'p95'})
+        self.assertGreaterEqual(endpoint['queries']['p95'], endpoint['queries']['p50'])
+
+    def test_streamed_response_is_recorded_once_its_body_is_sent(self):
+        # Warm the intensity cache so both requests run the same queries
+        self.client.get('/api/study/tasks/')
+        endpoint_stats.reset()
+        self.client.get('/api/study/tasks/')
+        regular_queries = endpoint_stats.summary()['list-user-tasks']['queries']['p50']
+        endpoint_stats.reset()
+
+        response = self.client.get('/api/study/tasks/', {'stream': 'true'})
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(endpoint_stats.summary(), {})
+        b''.join(response.streaming_content)
+        endpoint = endpoint_stats.summary()['list-user-tasks']
+        self.assertEqual(endpoint['count'], 1)
+        # The task rows are only read while the body is streamed
+        self.assertEqual(endpoint['queries']['p50'], regular_queries)
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = self.client.get('/api/core/intensity/')
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(endpoint_stats.summary(), {})
+
+
+class IntensityCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_reads_hit_the_database_once(self):
+        GlobalIntensity.set_intensity(0.7)
+
+        with self.assertNumQueries(1):
+            for _ in range(5):
+                get_intensity()
+
+    def test_set_intensity_invalidates(self):
+        get_intensity()
+
+        set_intensity(0.3)
+
+        self.assertEqual(get_intensity(), 0.3)
+
+    def test_version_change_from_another_process_reloads(self):
+        self.assertEqual(get_intensity(), 0.7)
+        # Another worker updated the row and replaced the shared version token
+        GlobalIntensity.objects.filter(id=1).update(intensity=0.4)
+        self.assertEqual(get_intensity(), 0.7)
+
+        cache.set(INTENSITY_VERSION_KEY, 'other-process')
+
+        self.assertEqual(get_intensity(), 0.4)
+
+    def test_value_written_behind_the_cache_is_read_after_the_timeout(self):
+        self.assertEqual(get_intensity(), 0.7)
+        # Another worker updated the row, but this process cannot see its token
+        GlobalIntensity.objects.filter(id=1).update(intensity=0.4)
+        self.assertEqual(get_intensity(), 0.7)
+
+        with mock.patch('time.time', return_value=time_module.time() + 301):
+            self.assertEqual(get_intensity(), 0.4)
+
+    def test_time_calculation_uses_database_intensity(self):
+        set_intensity(0.3)
+
+        self.assertEqual(
+            TimeCalculation.get_free_d(date.today() + timedelta(days=3)),
+            TimeCalculation.get_free_d(date.today() + timedelta(days=3), intensity_value=0.3)
+        )
+
+
+class UserIntensityTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+
+    def test_falls_back_to_global_intensity(self):
+        set_intensity(0.4)
+
+        self.assertEqual(get_user_intensity(self.user), 0.4)
+
+    def test_user_intensity_overrides_global(self):
+        set_user_intensity(self.user, 0.3)
+        set_intensity(0.6)
+
+        self.assertEqual(get_user_intensity(self.user), 0.3)
+        self.assertEqual(get_intensity(), 0.6)
+
+        set_user_intensity(self.user, None)
+        self.assertEqual(get_user_intensity(self.user), 0.6)
+
+    def test_repeated_reads_are_cached(self):
+        set_user_intensity(self.user, 0.3)
+
+        with self.assertNumQueries(0):
+            get_user_intensity(self.user)
+
+    def test_value_written_behind_the_cache_is_read_after_the_timeout(self):
+        set_user_intensity(self.user, 0.3)
+        # Another worker changed the row; this process's cache still has the old value
+        UserIntensity.objects.filter(user=self.user).update(intensity=0.5)
+        self.assertEqual(get_user_intensity(self.user), 0.3)
+
+        with mock.patch('time.time', return_value=time_module.time() + 301):
+            self.assertEqual(get_user_intensity(self.user), 0.5)
+
+    def test_intensity_endpoint_changes_the_schedule(self):
+        demo_user = User.objects.create_user(username='demo_user')
+        Task.objects.create(
+            user=demo_user, title='Essay', T_n=timedelta(hours=2), delta=3,
+            due_date=date.today() + timedelta(days=10), due_time=time(17, 0),
+        )
+        with redirect_stdout(io.StringIO()):
+            before = self.client.get('/api/study/get-14-day-schedule/').json()
+
+            self.client.post('/api/core/intensity/set/', {'intensity': 0.3}, content_type='application/json')
+            after = self.client.get('/api/study/get-14-day-schedule/').json()
+
+        self.assertEqual(self.client.get('/api/core/intensity/').json()['intensity'], 0.3)
+        # Scheduled at the lower intensity's cap (the task needs far less)
+        self.assertLess(after['intensity_used_for_scheduling'], before['intensity_used_for_scheduling'])
+
+
+class CapacityCalendarTests(TestCase):
+
+    def test_matches_time_calculation(self):
+        today = date.today()
+        calendar = CapacityCalendar(today, 5, 0.6, user_today=today)
+
+        self.assertEqual(len(calendar), 5)
+        for day_index in range(1, 5):
+            target_date = today + timedelta(days=day_index)
+            self.assertEqual(calendar.free_time[day_index], TimeCalculation.get_free_d(target_date, intensity_value=0.6))
+            self.assertEqual(calendar.free_seconds[calendar.day_index(target_date)], calendar.free_time[day_index].total_seconds())
+        # Today's capacity depends on the time of day; it never exceeds a full future day
+        self.assertLessEqual(calendar.free_time[0], calendar.free_time[1])
+
+    def test_without_free_today_every_day_is_a_full_day(self):
+        today = date.today()
+        calendar = CapacityCalendar.for_period(today, today + timedelta(days=2), 0.6, use_free_today=False)
+
+        self.assertEqual(len(calendar), 3)
+        self.assertEqual(calendar.free_time[0], TimeCalculation.get_free_d(today, intensity_value=0.6))
+        self.assertEqual(calendar.total_free_time(), calendar.free_time[0] * 3)
+
+    def test_invalid_intensity(self):
+        with self.assertRaises(ValueError):
+            CapacityCalendar(date.today(), 3, 1.5)
+
+
+class AvailabilityTests(TestCase):
+
+    def test_interval_helpers(self):
+        self.assertEqual(merge_intervals([(5, 8), (0, 2), (2, 3), (7, 10)]), [(0, 3), (5, 10)])
+        self.assertEqual(
+            subtract_intervals([(0, 10), (20, 30)], [(2, 4), (8, 22), (29, 40)]),
+            [(0, 2), (4, 8), (22, 29)]
+        )
+
+    def test_blackout_and_current_time_are_removed(self):
+        monday = date(2026, 10, 19)
+        availability = Availability(
+            weekly_windows=[[[9 * 60, 12 * 60], [13 * 60, 17 * 60]]] * 7,
+            blackouts=[[
+                timezone.make_aware(datetime.combine(monday, time(11, 0))),
+                timezone.make_aware(datetime.combine(monday + timedelta(days=1), time(14, 0))),
+            ]],
+        )
+        now = timezone.make_aware(datetime.combine(monday + timedelta(days=2), time(15, 30)))
+
+        intervals = availability.day_intervals(monday, 3, now=now)
+
+        self.assertEqual(intervals[0], [(9 * 3600, 11 * 3600)])
+        self.assertEqual(intervals[1], [(14 * 3600, 17 * 3600)])
+        self.assertEqual(intervals[2], [(int(15.5 * 3600), 17 * 3600)])
+        self.assertEqual(availability.available_seconds(monday, 3, now=now), [7200, 10800, 5400])
+
+    def test_invalid_window_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Availability(weekly_windows=[[[600, 500]]] * 7)
+
+    def test_capacity_calendar_uses_windows(self):
+        start = date.today() + timedelta(days=2)
+        availability = Availability(weekly_windows=[[[8 * 60, 12 * 60]]] * 7)
+
+        calendar = CapacityCalendar(start, 3, 0.6, user_today=date.today(), availability=availability)
+        default = CapacityCalendar(start, 3, 0.6, user_today=date.today(), availability=Availability())
+
+        factor = TimeCalculation.get_free_factor(0.6)
+        self.assertEqual(calendar.free_time, [timedelta(hours=4) * factor] * 3)
+        self.assertEqual(default.free_time[0], TimeCalculation.get_free_d(start, intensity_value=0.6))
+
+
+class SlotPlacementTests(TestCase):
+
+    def test_first_fit_finds_leftmost_gap_that_holds_the_block(self):
+        gaps = FreeIntervals([(0, 60), (100, 400), (500, 1000)])
+
+        self.assertEqual(gaps.first_fit(200), 1)
+        self.assertEqual(gaps.take(1, 250), (100, 350))
+        self.assertEqual(gaps.first_fit(200), 2)
+        self.assertEqual(gaps.first_fit(10), 0)
+        self.assertIsNone(gaps.first_fit(600))
+
+    def test_blocks_are_placed_in_order_without_overlap(self):
+        intervals = [(9 * 3600, 12 * 3600), (13 * 3600, 17 * 3600)]
+        plan = [
+            {'task_id': 1, 'time_allotted': timedelta(hours=2), 'completion_before': 0.0, 'completion_after': 100.0},
+            {'task_id': 2, 'time_allotted': timedelta(hours=3), 'completion_before': 0.0, 'completion_after': 100.0},
+            {'task_id': 3, 'time_allotted': timedelta(minutes=30), 'completion_before': 0.0, 'completion_after': 100.0},
+        ]
+
+        placed = place_day_plan(plan, intervals)
+
+        self.assertEqual(
+            [(item['task_id'], item['start_time'], item['end_time']) for item in placed],
+            [(1, time(9, 0), time(11, 0)), (2, time(13, 0), time(16, 0)), (3, time(11, 0), time(11, 30))]
+        )
+
+    def test_block_longer_than_every_gap_is_split_into_sessions(self):
+        intervals = [(9 * 3600, 12 * 3600), (13 * 3600, 17 * 3600)]
+        plan = [{
+            'task_id': 1, 'time_allotted': timedelta(hours=5),
+            'completion_before': 20.0, 'completion_after': 70.0, 'partial_completion': True,
+        }]
+
+        placed = place_day_plan(plan, intervals)
+
+        self.assertEqual([(item['start_time'], item['end_time']) for item in placed],
+                         [(time(9, 0), time(12, 0)), (time(13, 0), time(15, 0))])
+        self.assertEqual(sum((item['time_allotted'] for item in placed), timedelta()), timedelta(hours=5))
+        self.assertAlmostEqual(placed[0]['completion_after'], 50.0)
+        self.assertEqual(placed[1]['completion_before'], placed[0]['completion_after'])
+        self.assertEqual(placed[1]['completion_after'], 70.0)
+        self.assertNotIn('partial_completion', placed[0])
+        self.assertTrue(placed[1]['partial_completion'])
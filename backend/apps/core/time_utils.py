@@ -4,7 +4,9 @@ Time calculation utilities for StudyBunny
 from django.utils import timezone
 from datetime import datetime, timedelta, date
 from typing import List, Dict, Any
+from apps.core.availability import get_user_availability
 from apps.core.models import TimeCalculation
+from apps.core.slots import place_day_plan
 from apps.study.models import Task, DailySchedule
 
 
@@ -16,6 +18,25 @@ class TimeManager:
         """Get current datetime in timezone-aware format"""
         return timezone.now()
     
+    @staticmethod
+    def get_day_bounds(target_date: date):
+        """
+        Get the start and end of a day in the current timezone.
+        
+        Filtering a datetime field with field__gte=start, field__lt=end matches
+        the same rows as field__date=target_date, but as a range it can use an
+        index on the field.
+        
+        Args:
+            target_date: The day
+        
+        Returns:
+            tuple: (start, end) timezone-aware datetimes, end exclusive
+        """
+        start = timezone.make_aware(datetime.combine(target_date, datetime.min.time()))
+        end = timezone.make_aware(datetime.combine(target_date + timedelta(days=1), datetime.min.time()))
+        return start, end
+    
     @staticmethod
     def get_time_today(target_date: date = None) -> timedelta:
         """
@@ -149,6 +170,7 @@ class TaskScheduler:
                     'task': Task instance,
                     'time_allotted': timedelta,
                     'start_time': time,
+                    'end_time': time,
                     'priority_score': float,
                     'reason': str
                 },
@@ -189,13 +211,14 @@ class TaskScheduler:
                 daily_plan.append({
                     'task': task,
                     'time_allotted': time_to_allocate,
-                    'start_time': timezone.now().time(),  # TODO: Calculate proper start time
                     'priority_score': priority_score,
                     'reason': f"Priority: {task.delta}, Due: {task.due_date}"
                 })
                 remaining_time -= time_to_allocate
         
-        return daily_plan
+        # Place the allocations into the day's free intervals (sets start_time and end_time)
+        free_intervals = get_user_availability(user).day_intervals(target_date, 1, now=timezone.now())[0]
+        return place_day_plan(daily_plan, free_intervals)
     
     @staticmethod
     def _calculate_priority_score(task: Task, target_date: date) -> float:
@@ -14,4 +14,7 @@ urlpatterns = [
     # Intensity endpoints
     path('intensity/', views.get_intensity_value, name='get-intensity'),
     path('intensity/set/', views.set_intensity_value, name='set-intensity'),
+    
+    # Request instrumentation (enabled with INSTRUMENTATION_ENABLED)
+    path('instrumentation/stats/', views.get_instrumentation_stats, name='instrumentation-stats'),
 ]
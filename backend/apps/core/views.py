@@ -7,6 +7,7 @@ from .models import TimeCalculation
 from .serializers import TimeCalculationSerializer, TimeAnalysisSerializer
 from .time_utils import TimeManager, TaskScheduler, TimeAnalytics
 from .intensity import get_intensity, set_intensity
+from study_bunny.instrumentation import endpoint_stats, is_instrumentation_enabled
 
 
 class TimeCalculationListCreateView(generics.ListCreateAPIView):
@@ -126,6 +127,8 @@ def set_intensity_value(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # The global value: the study views schedule for the demo user, who has no
+        # intensity of their own, so a per-user value would not reach their schedules
         set_intensity(intensity)
         return Response({
             'intensity': get_intensity(),
@@ -137,3 +140,20 @@ def set_intensity_value(request):
             {'error': 'intensity must be a number'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+@api_view(['GET'])
+def get_instrumentation_stats(request):
+    """
+    Get rolling per-endpoint request stats (p50/p95 of total time, SQL time,
+    query count, scheduler time and simulations) recorded by the
+    instrumentation middleware. Pass ?reset=true to clear them afterwards.
+    """
+    stats = {
+        'enabled': is_instrumentation_enabled(),
+        'window': endpoint_stats.window,
+        'endpoints': endpoint_stats.summary(),
+    }
+    if request.query_params.get('reset', '').lower() == 'true':
+        endpoint_stats.reset()
+    return Response(stats)
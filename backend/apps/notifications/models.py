@@ -50,6 +50,8 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['created_at']),
+            # Notification list: keyset pages of a user's notifications, newest first
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_list_idx'),
         ]
 
     def __str__(self):
@@ -0,0 +1,35 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Notification
+
+
+class NotificationListTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='demo_user')
+        now = timezone.now()
+        for index in range(25):
+            notification = Notification.objects.create(user=self.user, title=f'Note {index}', message='Keep going')
+            # Two notifications per timestamp, so the id has to break ties
+            Notification.objects.filter(id=notification.id).update(created_at=now - timedelta(minutes=index // 2))
+
+    def test_pages_walk_every_notification_newest_first(self):
+        first = self.client.get('/api/notifications/').json()
+        self.assertEqual(len(first['notifications']), 20)
+        self.assertEqual(first['total_count'], 25)
+
+        second = self.client.get('/api/notifications/', {'cursor': first['next_cursor']}).json()
+
+        self.assertEqual(len(second['notifications']), 5)
+        self.assertIsNone(second['next_cursor'])
+        ids = [item['id'] for item in first['notifications'] + second['notifications']]
+        expected = list(Notification.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.client.get('/api/notifications/', {'limit': 0})
+
+        self.assertEqual(response.status_code, 400)
@@ -9,12 +9,23 @@ from datetime import timedelta
 from .models import Notification, NotificationSettings
 from .serializers import NotificationSerializer, NotificationSettingsSerializer
 from .services import NotificationService
+from study_bunny.pagination import paginate_keyset, parse_limit
+
+# Keyset ordering of the notification list, newest first (unique thanks to id)
+NOTIFICATION_ORDERING = ('-created_at', '-id')
+NOTIFICATION_PAGE_SIZE = 20
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_notifications(request):
-    """Get all notifications for the user"""
+    """
+    Get the user's notifications, newest first, a page at a time
+    
+    Query parameters:
+        limit: Page size (defaults to 20)
+        cursor: next_cursor of the previous page
+    """
     try:
         # Get demo user for now
         user, created = User.objects.get_or_create(
@@ -22,21 +33,29 @@ def get_notifications(request):
             defaults={'email': 'demo@studybunny.com', 'first_name': 'Demo', 'last_name': 'User'}
         )
         
-        # Get all notifications for this user
-        all_notifications = Notification.objects.filter(user=user).order_by('-created_at')
+        all_notifications = Notification.objects.filter(user=user)
         
         # Count unread notifications
         unread_count = all_notifications.filter(is_read=False).count()
         
-        # Get recent notifications (limit to 20)
-        recent_notifications = all_notifications[:20]
-        serializer = NotificationSerializer(recent_notifications, many=True)
+        # Get one page of notifications (the 20 most recent by default)
+        try:
+            notifications, next_cursor = paginate_keyset(
+                all_notifications,
+                NOTIFICATION_ORDERING,
+                cursor=request.query_params.get('cursor'),
+                limit=parse_limit(request.query_params.get('limit'), default=NOTIFICATION_PAGE_SIZE),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = NotificationSerializer(notifications, many=True)
         
         return Response({
             'success': True,
             'notifications': serializer.data,
             'unread_count': unread_count,
-            'total_count': all_notifications.count()
+            'total_count': all_notifications.count(),
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
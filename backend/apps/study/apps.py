@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class StudyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.study'
+    
+    def ready(self):
+        # Import signal handlers
+        from . import signals
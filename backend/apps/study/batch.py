@@ -0,0 +1,175 @@
+"""
+Vectorized multi-intensity evaluation of the 14-day schedule
+
+Runs the greedy day fill used by get_14_day_schedule for a whole vector
+of candidate intensities at once. Each intensity is one row of NumPy
+arrays, so sweeping 100 intensities costs about as much as a single
+Python-level schedule run.
+"""
+from datetime import timedelta
+import numpy as np
+from django.utils import timezone
+from apps.core.availability import get_user_availability
+from apps.core.models import TimeCalculation
+from .models import Task
+from .simulation import get_user_today
+from study_bunny.instrumentation import record_simulation
+
+# Minimum free time (in seconds) needed to start a partial work session,
+# matching get_14_day_schedule
+MIN_PARTIAL_SECONDS = 15 * 60
+
+
+def evaluate_schedule_batch(tasks, intensities, start_date, days=14, task_progress=None, user_today=None,
+                            availability=None):
+    """
+    Evaluate the 14-day greedy schedule for many intensities at once.
+
+    Args:
+        tasks: Incomplete Task instances to schedule
+        intensities: Sequence of intensity values between 0.0 and 1.0
+        start_date (date): First day of the schedule
+        days (int, optional): Number of days to evaluate (defaults to 14)
+        task_progress (dict, optional): Task id -> completion percentage to start from
+            (defaults to each task's completed_so_far)
+        user_today (date, optional): The user's current date (defaults to today in CDT)
+        availability (Availability, optional): The user's availability (defaults to
+            08:00-24:00 every day)
+
+    Returns:
+        dict: Result arrays, one row per intensity:
+            - intensities (ndarray): The intensities evaluated, shape (k,)
+            - dates (list): The dates evaluated, length days
+            - task_ids (list): Task ids in scheduling order, length n
+            - free_time (ndarray): Free seconds per day, shape (k, days)
+            - time_scheduled (ndarray): Seconds allotted per day, shape (k, days)
+            - tasks_completed (ndarray): Tasks at 100% after each day, shape (k, days)
+            - deadlines_met (ndarray): Whether every task due by each day is done, shape (k, days)
+            - progress (ndarray): Final completion percentage per task, shape (k, n)
+            - all_completed (ndarray): Whether every task reaches 100%, shape (k,)
+
+    Raises:
+        ValueError: If any intensity is outside 0.0 to 1.0
+    """
+    intensities = np.asarray(intensities, dtype=float).reshape(-1)
+    if intensities.size and (intensities.min() < 0.0 or intensities.max() > 1.0):
+        raise ValueError("Intensity value must be between 0.0 and 1.0")
+    if user_today is None:
+        user_today = get_user_today()
+    record_simulation(len(intensities))
+
+    tasks = sorted(tasks, key=lambda t: (t.due_date, t.due_time, -t.delta))
+    if task_progress is None:
+        task_progress = {}
+
+    count = len(intensities)
+    task_ids = [task.id for task in tasks]
+    due_ordinals = np.array([task.due_date.toordinal() for task in tasks], dtype=np.int64)
+    durations = np.array([task.T_n.total_seconds() for task in tasks], dtype=float)
+    initial_progress = np.array(
+        [task_progress.get(task.id, task.completed_so_far) for task in tasks], dtype=float
+    )
+    progress = np.tile(initial_progress, (count, 1))
+
+    dates = [start_date + timedelta(days=day_index) for day_index in range(days)]
+    available_seconds = None
+    if availability is not None and not availability.is_default:
+        available_seconds = availability.available_seconds(start_date, days, now=timezone.now())
+    # Same formula as TimeCalculation.get_free_factor, applied to every row
+    free_factor = (intensities + np.minimum(0.95, 2 * intensities - intensities**2)) / 2
+    free_time = np.zeros((count, days))
+    time_scheduled = np.zeros((count, days))
+    tasks_completed = np.zeros((count, days), dtype=np.int64)
+    deadlines_met = np.zeros((count, days), dtype=bool)
+
+    for day_index, current_date in enumerate(dates):
+        if available_seconds is not None:
+            available_time = timedelta(seconds=available_seconds[day_index])
+        if current_date == user_today:
+            day_free = np.array([
+                TimeCalculation.get_free_today(
+                    intensity_value=float(intensity),
+                    available_time=available_time if available_seconds is not None else None
+                ).total_seconds()
+                for intensity in intensities
+            ])
+        elif available_seconds is not None:
+            day_free = available_seconds[day_index] * free_factor
+        else:
+            day_free = TimeCalculation.get_time_d(current_date).total_seconds() * free_factor
+
+        ordinal = current_date.toordinal()
+        first_task = int(np.searchsorted(due_ordinals, ordinal, side='left'))
+        remaining = day_free.copy()
+        # Rows stop filling the day after their first partial assignment
+        open_rows = np.ones(count, dtype=bool)
+
+        for index in range(first_task, len(tasks)):
+            if not open_rows.any():
+                break
+            candidates = open_rows & (progress[:, index] < 100.0)
+            if not candidates.any():
+                continue
+
+            time_needed = durations[index] * (1.0 - progress[:, index] / 100.0)
+            fits = candidates & (time_needed <= remaining)
+            remaining[fits] -= time_needed[fits]
+            progress[fits, index] = 100.0
+
+            partial = candidates & ~fits & (remaining > MIN_PARTIAL_SECONDS)
+            if partial.any():
+                partial_completion = remaining[partial] / durations[index] * 100
+                progress[partial, index] = np.minimum(100.0, progress[partial, index] + partial_completion)
+                remaining[partial] = 0.0
+                open_rows &= ~partial
+
+        free_time[:, day_index] = day_free
+        time_scheduled[:, day_index] = day_free - remaining
+        done = progress >= 100.0
+        tasks_completed[:, day_index] = done.sum(axis=1)
+        due_by_today = due_ordinals <= ordinal
+        deadlines_met[:, day_index] = done[:, due_by_today].all(axis=1)
+
+    return {
+        'intensities': intensities,
+        'dates': dates,
+        'task_ids': task_ids,
+        'free_time': free_time,
+        'time_scheduled': time_scheduled,
+        'tasks_completed': tasks_completed,
+        'deadlines_met': deadlines_met,
+        'progress': progress,
+        'all_completed': (progress >= 100.0).all(axis=1),
+    }
+
+
+def sweep_intensities(user, count=100, start_date=None, days=14):
+    """
+    Evaluate the user's schedule for evenly spaced intensities from 0.0 to 1.0.
+
+    Loads the incomplete tasks and the availability with one query each and runs a
+    single batch evaluation.
+
+    Args:
+        user: User instance (owner of the tasks)
+        count (int, optional): Number of intensities to evaluate (defaults to 100)
+        start_date (date, optional): First day of the schedule (defaults to today in CDT)
+        days (int, optional): Number of days to evaluate (defaults to 14)
+
+    Returns:
+        dict: evaluate_schedule_batch result plus lowest_complete_intensity, the
+            smallest evaluated intensity that completes every task (None if none does)
+    """
+    if start_date is None:
+        start_date = get_user_today()
+
+    tasks = list(Task.objects.filter(user=user, is_completed=False))
+    result = evaluate_schedule_batch(
+        tasks, np.linspace(0.0, 1.0, count), start_date, days=days, availability=get_user_availability(user)
+    )
+
+    complete_rows = np.flatnonzero(result['all_completed'])
+    result['lowest_complete_intensity'] = (
+        float(result['intensities'][complete_rows[0]]) if complete_rows.size else None
+    )
+    return result
@@ -0,0 +1,231 @@
+"""
+Bulk task writes for StudyBunny
+
+Importers and the voice agent create, update and delete many tasks in a
+row. Going through create_task and update_task_progress_api costs a
+request, a save and the Task signals (a rollup update and a schedule
+invalidation) per task. apply_bulk_task_changes validates a whole batch,
+writes it in one transaction with bulk_create, one bulk_update and one
+delete, then updates the statistics rollup once per affected day and
+invalidates the user's schedule once.
+
+Items that fail validation are reported and skipped; the valid ones are
+still applied. Each result list mirrors its input list.
+"""
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .materialize import schedule_background_recompute
+from .models import Task
+from .schedule_cache import invalidate_user_schedule
+from .signals import task_signals_deferred
+from .stats_rollup import CONTRIBUTION_FIELDS, apply_task_changes, task_contribution_values
+
+# Most creates, updates and deletes accepted in one batch
+MAX_BULK_ITEMS = 500
+
+
+def parse_duration(value):
+    """
+    Parse an HH:MM:SS duration
+
+    Raises:
+        ValueError: If the value is not in HH:MM:SS format
+    """
+    time_parts = str(value).split(':')
+    if len(time_parts) != 3:
+        raise ValueError('T_n must be in HH:MM:SS format')
+    hours, minutes, seconds = map(int, time_parts)
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def parse_completion(value):
+    """
+    Parse a completion percentage
+
+    Raises:
+        ValueError: If the value is not a number between 0 and 100
+    """
+    try:
+        completion = float(value)
+    except (ValueError, TypeError):
+        raise ValueError('completed_so_far must be a valid number')
+    if not 0 <= completion <= 100:
+        raise ValueError('completed_so_far must be between 0 and 100')
+    return completion
+
+
+def _build_task(user, item):
+    """
+    Validate one create item into an unsaved Task
+
+    Raises:
+        ValueError: If a field is missing or malformed
+    """
+    if not isinstance(item, dict):
+        raise ValueError('Each create must be an object')
+    for field in ('title', 'T_n', 'delta', 'due_date', 'due_time'):
+        if field not in item:
+            raise ValueError(f'{field} is required')
+
+    try:
+        delta = int(item['delta'])
+    except (ValueError, TypeError):
+        raise ValueError('delta must be an integer')
+    if not 1 <= delta <= 5:
+        raise ValueError('delta must be between 1 and 5')
+
+    completed_so_far = parse_completion(item.get('completed_so_far', 0.0))
+    return Task(
+        user=user,
+        title=item['title'],
+        description=item.get('description', ''),
+        T_n=parse_duration(item['T_n']),
+        completed_so_far=completed_so_far,
+        # bulk_create skips Task.save, which sets this
+        is_completed=completed_so_far >= 100.0,
+        delta=delta,
+        due_date=date.fromisoformat(item['due_date']),
+        due_time=datetime.strptime(item['due_time'], '%H:%M:%S').time(),
+    )
+
+
+def _parse_update(item):
+    if not isinstance(item, dict):
+        raise ValueError('Each update must be an object')
+    if 'id' not in item:
+        raise ValueError('id is required')
+    if item.get('completed_so_far') is None:
+        raise ValueError('completed_so_far is required')
+    return int(item['id']), parse_completion(item['completed_so_far'])
+
+
+def _task_data(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'T_n': str(task.T_n),
+        'completed_so_far': task.completed_so_far,
+        'delta': task.delta,
+        'due_date': task.due_date.isoformat(),
+        'due_time': task.due_time.isoformat(),
+        'is_completed': task.is_completed,
+        'updated_at': task.updated_at.isoformat(),
+    }
+
+
+def _failure(index, error):
+    return {'index': index, 'success': False, 'error': str(error)}
+
+
+def apply_bulk_task_changes(user, creates=None, updates=None, deletes=None):
+    """
+    Create tasks, update task progress and delete tasks in one transaction
+
+    Args:
+        user: Owner of the tasks
+        creates (list, optional): Task objects with the create_task fields
+        updates (list, optional): {'id', 'completed_so_far'} objects
+        deletes (list, optional): Task IDs
+
+    Returns:
+        dict: success, created, updated and deleted (per-item results with index,
+            success and the task data or an error) and the number of failed items
+    """
+    creates, updates, deletes = creates or [], updates or [], deletes or []
+    if len(creates) + len(updates) + len(deletes) > MAX_BULK_ITEMS:
+        return {
+            'success': False,
+            'error': f'At most {MAX_BULK_ITEMS} items can be sent in one batch',
+        }
+
+    created_results, new_tasks = [], []
+    for index, item in enumerate(creates):
+        try:
+            new_tasks.append((index, _build_task(user, item)))
+            created_results.append(None)
+        except (ValueError, TypeError) as e:
+            created_results.append(_failure(index, e))
+
+    updated_results, progress_updates = [], []
+    for index, item in enumerate(updates):
+        try:
+            progress_updates.append((index, *_parse_update(item)))
+            updated_results.append(None)
+        except (ValueError, TypeError) as e:
+            updated_results.append(_failure(index, e))
+
+    deleted_results, delete_ids = [], []
+    for index, task_id in enumerate(deletes):
+        try:
+            delete_ids.append((index, int(task_id)))
+            deleted_results.append(None)
+        except (ValueError, TypeError):
+            deleted_results.append(_failure(index, f'Invalid task ID: {task_id}'))
+
+    statistics_changes = []
+    with transaction.atomic(), task_signals_deferred():
+        if new_tasks:
+            Task.objects.bulk_create([task for _, task in new_tasks], batch_size=MAX_BULK_ITEMS)
+            for index, task in new_tasks:
+                created_results[index] = {'index': index, 'success': True, 'task': _task_data(task)}
+                statistics_changes.append((None, task_contribution_values(task)))
+
+        if progress_updates:
+            tasks = Task.objects.select_for_update().filter(user=user).in_bulk(
+                [task_id for _, task_id, _ in progress_updates]
+            )
+            before = {}
+            now = timezone.now()
+            for index, task_id, completed_so_far in progress_updates:
+                task = tasks.get(task_id)
+                if task is None:
+                    updated_results[index] = _failure(index, f'Task with ID {task_id} not found')
+                    continue
+                before.setdefault(task_id, task_contribution_values(task))
+                task.completed_so_far = completed_so_far
+                task.is_completed = completed_so_far >= 100.0
+                # bulk_update does not touch auto_now fields
+                task.updated_at = now
+                updated_results[index] = {'index': index, 'success': True, 'task': _task_data(task)}
+
+            changed = [tasks[task_id] for task_id in before]
+            Task.objects.bulk_update(changed, ['completed_so_far', 'is_completed', 'updated_at'])
+            statistics_changes.extend((before[task.id], task_contribution_values(task)) for task in changed)
+
+        if delete_ids:
+            stored = {
+                row['id']: row
+                for row in Task.objects.filter(user=user, id__in=[task_id for _, task_id in delete_ids]).values(
+                    'id', *CONTRIBUTION_FIELDS
+                )
+            }
+            deleted = set()
+            for index, task_id in delete_ids:
+                if task_id in stored and task_id not in deleted:
+                    deleted.add(task_id)
+                    deleted_results[index] = {'index': index, 'success': True, 'id': task_id}
+                else:
+                    deleted_results[index] = _failure(index, f'Task with ID {task_id} not found')
+            if deleted:
+                # A regular delete so TaskAssignments cascade; the signals are deferred
+                Task.objects.filter(id__in=deleted).delete()
+                statistics_changes.extend((stored[task_id], None) for task_id in deleted)
+
+        if statistics_changes:
+            apply_task_changes(user.id, statistics_changes)
+            # Invalidated after commit so a concurrent reader cannot cache the pre-batch tasks
+            # under the new version
+            transaction.on_commit(lambda: invalidate_user_schedule(user.id))
+            schedule_background_recompute(user.id)
+
+    results = created_results + updated_results + deleted_results
+    return {
+        'success': True,
+        'created': created_results,
+        'updated': updated_results,
+        'deleted': deleted_results,
+        'failed': sum(1 for result in results if not result['success']),
+    }
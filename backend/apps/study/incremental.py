@@ -0,0 +1,353 @@
+"""
+Incremental 14-day scheduling for StudyBunny
+
+The 14-day schedule is a day-by-day greedy fill: a day's plan depends
+only on the task progress at the start of that day. IncrementalSchedule
+keeps that per-day state (starting progress, free and remaining time,
+and which tasks each day looked at), so when a single task's progress
+changes only the days from the first one that looked at the task need
+to be replayed. The state is kept in the cache next to the schedule
+result (see schedule_cache.py) and updated from the Task post_save
+signal for progress-only saves.
+
+The replay is limited to the affected days, but the update first checks
+that the scheduling intensity is unchanged, which needs the minimum
+intensity of the new task set: a TaskSnapshot sort and the O(n) bound,
+plus simulations of the whole task set. When progress was only added the
+previous minimum is still feasible, so the search starts at the bound and
+stops there, usually after one simulation or none.
+"""
+import logging
+import time as time_module
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from apps.core.availability import Availability
+from apps.core.capacity import CapacityCalendar
+from apps.core.slots import place_day_plan
+from .simulation import TaskSnapshot, get_user_today
+from study_bunny.instrumentation import record_simulation
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_DAYS = 14
+
+# Minimum free time needed to start a partial work session in the 14-day schedule
+MIN_PARTIAL_TIME = timedelta(minutes=15)
+
+# Task fields that decide where a task lands in the schedule; a save that
+# changes any of them needs a full rebuild
+SCHEDULING_FIELDS = ('title', 'description', 'T_n', 'delta', 'due_date', 'due_time')
+
+
+class IncrementalSchedule:
+    """
+    Replayable state of a 14-day greedy schedule.
+
+    Attributes:
+        tasks (list): Incomplete tasks in scheduling order
+        intensity (float): Intensity used to size every day
+        day_start_progress (list): Task id -> progress at the start of each day
+        free_time (list): Free time of each day
+        remaining_time (list): Free time left over at the end of each day
+        plans (list): Task assignments of each day, placed into the day's free intervals
+        examined (list): Ids of the tasks each day's fill looked at
+        day_intensity (list): Intensity recorded for each day (0.0 when nothing was scheduled)
+    """
+
+    def __init__(self, tasks, start_date, intensity, minimum_required_intensity,
+                 cap_intensity, total_tasks=None, max_intensity=0.9, user_intensity=None, availability=None):
+        self.tasks = list(tasks)
+        self.start_date = start_date
+        self.intensity = intensity
+        self.minimum_required_intensity = minimum_required_intensity
+        self.cap_intensity = cap_intensity
+        self.total_tasks = len(self.tasks) if total_tasks is None else total_tasks
+        self.max_intensity = max_intensity
+        self.user_intensity = user_intensity
+        self.availability = availability
+        self.version = None
+
+        self.day_start_progress = [None] * SCHEDULE_DAYS
+        self.free_time = [timedelta()] * SCHEDULE_DAYS
+        self.remaining_time = [timedelta()] * SCHEDULE_DAYS
+        self.plans = [[] for _ in range(SCHEDULE_DAYS)]
+        self.examined = [frozenset() for _ in range(SCHEDULE_DAYS)]
+        self.day_intensity = [0.0] * SCHEDULE_DAYS
+        self.built_at = None
+        self.capacity = None
+        self.day_intervals = None
+
+        self.replay_from(0, {task.id: task.completed_so_far for task in self.tasks})
+
+    def replay_from(self, first_day, progress):
+        """
+        Recompute the schedule from first_day to the last day.
+
+        Args:
+            first_day (int): Index of the first day to recompute
+            progress (dict): Task id -> completion percentage at the start of first_day
+        """
+        record_simulation()
+        if first_day == 0 or self.capacity is None:
+            # Free time of every day, including what is left of today, as of now
+            self.capacity = CapacityCalendar(
+                self.start_date, SCHEDULE_DAYS, self.intensity, availability=self.availability
+            )
+            # Free intervals the day's sessions are placed into, as of the same moment
+            self.day_intervals = (self.availability or Availability()).day_intervals(
+                self.start_date, SCHEDULE_DAYS, now=timezone.now()
+            )
+            self.built_at = time_module.time()
+        progress = dict(progress)
+        for day_index in range(first_day, SCHEDULE_DAYS):
+            self.day_start_progress[day_index] = dict(progress)
+            self._fill_day(day_index, progress)
+
+    def _fill_day(self, day_index, progress):
+        """
+        Greedily fill one day, advancing progress in place
+        """
+        current_date = self.start_date + timedelta(days=day_index)
+        self.plans[day_index] = []
+        self.examined[day_index] = frozenset()
+        self.free_time[day_index] = timedelta()
+        self.remaining_time[day_index] = timedelta()
+        self.day_intensity[day_index] = 0.0
+
+        day_tasks = [
+            task for task in self.tasks
+            if progress.get(task.id, 0.0) < 100.0 and task.due_date >= current_date
+        ]
+        if not day_tasks:
+            return
+
+        day_free_time = self.capacity.free_time[day_index]
+        remaining_time = day_free_time
+        daily_plan = []
+        examined = []
+        for task in day_tasks:
+            examined.append(task.id)
+            current_progress = progress.get(task.id, 0.0)
+            time_needed = task.T_n * (1.0 - current_progress / 100.0)
+
+            if time_needed <= remaining_time:
+                daily_plan.append(self._assignment(task, current_progress, time_needed, 100.0))
+                remaining_time -= time_needed
+                progress[task.id] = 100.0
+            elif remaining_time > MIN_PARTIAL_TIME:
+                # Partial session uses up the rest of the day
+                new_progress = min(100.0, current_progress + remaining_time / task.T_n * 100)
+                item = self._assignment(task, current_progress, remaining_time, new_progress)
+                item['partial_completion'] = True
+                daily_plan.append(item)
+                progress[task.id] = new_progress
+                remaining_time = timedelta()
+                break
+
+        self.plans[day_index] = place_day_plan(daily_plan, self.day_intervals[day_index])
+        self.examined[day_index] = frozenset(examined)
+        self.free_time[day_index] = day_free_time
+        self.remaining_time[day_index] = remaining_time
+        if daily_plan:
+            self.day_intensity[day_index] = self.intensity
+
+    @staticmethod
+    def _assignment(task, completion_before, time_allotted, completion_after):
+        return {
+            'task_id': task.id,
+            'task_title': task.title,
+            'task_description': task.description,
+            'priority': task.delta,
+            'due_date': task.due_date,
+            'due_time': task.due_time,
+            'completion_before': completion_before,
+            'time_allotted': time_allotted,
+            'time_needed_total': str(task.T_n),
+            'completion_after': completion_after,
+        }
+
+    def first_affected_day(self, task_id):
+        """
+        Get the first day whose fill looked at the task, or None if no day did
+        """
+        for day_index, examined in enumerate(self.examined):
+            if task_id in examined:
+                return day_index
+        return None
+
+    def update_progress(self, task):
+        """
+        Apply a saved progress change of one task, replaying only the
+        days from the first one that looked at the task.
+
+        Args:
+            task: The saved Task instance
+
+        Returns:
+            bool: True if the state was updated, False if it cannot be updated
+                incrementally (unknown task, other scheduling fields changed, or the
+                new minimum intensity changes the scheduling intensity)
+        """
+        position = next((index for index, known in enumerate(self.tasks) if known.id == task.id), None)
+        if position is None:
+            # A task that was already complete and stays complete changes nothing
+            return task.completed_so_far >= 100.0
+        known = self.tasks[position]
+        if any(getattr(known, field) != getattr(task, field) for field in SCHEDULING_FIELDS):
+            return False
+
+        remaining_tasks = [known for index, known in enumerate(self.tasks) if index != position]
+        if task.completed_so_far < 100.0:
+            remaining_tasks.insert(position, task)
+        if not remaining_tasks:
+            return False
+
+        # Adding progress only removes work, so the previous minimum still completes
+        # every task and the search only has to look below it (without moving the
+        # horizon, which would change what completing means)
+        same_horizon = (
+            max(other.due_date for other in remaining_tasks) == max(other.due_date for other in self.tasks)
+        )
+        known_feasible = None
+        if task.completed_so_far >= known.completed_so_far and self.minimum_required_intensity > 0 and same_horizon:
+            known_feasible = self.minimum_required_intensity
+        minimum_required_intensity = self._find_minimum_intensity(remaining_tasks, known_feasible)
+        if minimum_required_intensity is None:
+            return False
+        if max(minimum_required_intensity, self.cap_intensity) != self.intensity:
+            return False
+
+        self.tasks = remaining_tasks
+        self.total_tasks = len(remaining_tasks)
+        self.minimum_required_intensity = minimum_required_intensity
+
+        first_day = self.first_affected_day(task.id)
+        if self._today_capacity_is_stale():
+            first_day = 0
+        if first_day is None:
+            first_day = SCHEDULE_DAYS
+
+        # The task is untouched before first_day, so its progress there is the new value
+        for progress in self.day_start_progress[:first_day]:
+            if task.completed_so_far < 100.0:
+                progress[task.id] = task.completed_so_far
+            else:
+                progress.pop(task.id, None)
+        if first_day == SCHEDULE_DAYS:
+            return True
+
+        progress = dict(self.day_start_progress[first_day])
+        if task.completed_so_far < 100.0:
+            progress[task.id] = task.completed_so_far
+        else:
+            progress.pop(task.id, None)
+        self.replay_from(first_day, progress)
+        logger.debug(
+            f"Replayed {SCHEDULE_DAYS - first_day} of {SCHEDULE_DAYS} days after progress update of task {task.id}"
+        )
+        return True
+
+    def _find_minimum_intensity(self, tasks, known_feasible=None):
+        """
+        Rerun the minimum intensity search in memory for the updated task set.
+
+        Without known_feasible this costs a few simulations of the whole task
+        set; with it, one O(n) bound plus a bisection between the bound and
+        known_feasible, which usually needs no simulation at all.
+        """
+        from .task_utils import find_minimum_intensity_for_completion
+
+        result = find_minimum_intensity_for_completion(
+            user=None,  # unused when a snapshot is given
+            start_date=self.start_date,
+            end_date=max(task.due_date for task in tasks),
+            snapshot=TaskSnapshot(tasks, self.availability),
+            solver='analytic',
+            known_feasible=known_feasible,
+        )
+        return result['minimum_intensity'] if result['success'] else None
+
+    def _today_capacity_is_stale(self):
+        """
+        Today's free time shrinks as the day goes on; recompute it once the
+        first day is older than the schedule cache timeout
+        """
+        if self.start_date != get_user_today():
+            return False
+        timeout = getattr(settings, 'SCHEDULE_CACHE_TIMEOUT', 300)
+        return time_module.time() - self.built_at > timeout
+
+    def result(self):
+        """
+        Build the get_14_day_schedule result for the current state
+        """
+        schedule = [list(day_plan) for day_plan in self.plans]
+        total_tasks_scheduled = sum(len(day_plan) for day_plan in schedule)
+        days_with_tasks = sum(1 for day_plan in schedule if day_plan)
+        scheduled_tasks = len({item['task_id'] for day_plan in schedule for item in day_plan})
+        total_tasks = self.total_tasks
+
+        return {
+            'success': True,
+            'schedule': schedule,
+            'total_days': SCHEDULE_DAYS,
+            'start_date': self.start_date,
+            'end_date': self.start_date + timedelta(days=SCHEDULE_DAYS - 1),
+            'total_tasks_scheduled': total_tasks_scheduled,
+            'intensity_used': sum(self.day_intensity) / SCHEDULE_DAYS,
+            'minimum_required_intensity': self.minimum_required_intensity,
+            'intensity_used_for_scheduling': self.intensity,
+            'completion_analysis': {
+                'total_tasks': total_tasks,
+                'completed_tasks': scheduled_tasks,
+                'remaining_tasks': total_tasks - scheduled_tasks,
+                'completion_rate': scheduled_tasks / total_tasks if total_tasks > 0 else 1.0
+            },
+            'message': f"✅ 14-day schedule generated with {total_tasks_scheduled} tasks scheduled across {days_with_tasks} days"
+        }
+
+
+def apply_progress_update(task):
+    """
+    Update the user's cached schedule in place after a progress-only save.
+
+    Only applies when the cached state was built from the task set as it
+    was right before this save (its version is still current). The patched
+    state is stored only if this update is the next invalidation after that
+    version: when two progress saves of the same user race, the one that
+    loses the compare-and-set leaves the schedule invalidated instead of
+    overwriting the other's update.
+
+    Args:
+        task: The saved Task instance
+
+    Returns:
+        bool: True if the cached schedule was updated, False if the caller
+            should invalidate it instead
+    """
+    from .schedule_cache import (
+        get_schedule_state, set_schedule_state, get_task_set_version,
+        invalidate_user_schedule, get_schedule_cache_key, set_cached_schedule,
+    )
+
+    version = get_task_set_version(task.user_id)
+    state = get_schedule_state(task.user_id)
+    if state is None or state.version != version:
+        return False
+    try:
+        if not state.update_progress(task):
+            return False
+    except Exception as e:
+        logger.warning(f"Incremental schedule update failed for task {task.id}: {e}")
+        return False
+
+    new_version = invalidate_user_schedule(task.user_id)
+    if new_version != version + 1:
+        # Something else invalidated the schedule since the state was read
+        return False
+    state.version = new_version
+    set_schedule_state(task.user_id, state)
+    cache_key = get_schedule_cache_key(task.user_id, state.start_date, state.max_intensity, state.user_intensity)
+    set_cached_schedule(cache_key, state.result())
+    return True
@@ -0,0 +1,268 @@
+"""
+Materialized 14-day schedules for StudyBunny
+
+Persists the output of get_14_day_schedule into DailySchedule and
+TaskAssignment rows and serves reads from them until the user's tasks
+or the user's intensity change. A plan starting today also expires, after
+SCHEDULE_CACHE_TIMEOUT unless it was stored with a longer timeout (see
+the recompute_schedules command), since today's free time shrinks as the
+day goes on. Enabled with the SCHEDULE_MATERIALIZED setting;
+SCHEDULE_MATERIALIZE_IN_BACKGROUND additionally recomputes a user's plan
+in a worker thread after each task change.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Max, Prefetch
+from django.utils import timezone
+from study_bunny.caching import get_cache_timeout
+from .models import Task, DailySchedule, TaskAssignment
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_DAYS = 14
+
+# Single worker so recomputes for the same user never run concurrently
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='schedule-materializer')
+
+
+def is_materialized_mode():
+    """
+    Check whether schedules are served from the materialized tables
+    """
+    return getattr(settings, 'SCHEDULE_MATERIALIZED', False)
+
+
+def get_task_data_version(user):
+    """
+    Fingerprint of a user's tasks: task count and latest update time.
+    Any save (auto_now on updated_at), creation or deletion changes it.
+    """
+    stats = Task.objects.filter(user=user).aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f"{stats['count']}:{latest}"
+
+
+def materialize_14_day_schedule(user, start_date, max_intensity=0.9, tasks=None, intensity=None, availability=None,
+                                timeout=None):
+    """
+    Compute the 14-day schedule and persist it, replacing the user's
+    materialized schedules for those dates. The plan is returned but not
+    stored if a hand-made schedule or a concurrently stored plan occupies
+    one of the dates.
+
+    Args:
+        tasks (list, optional): Preloaded incomplete tasks, passed on to the generator
+        intensity (float, optional): The user's intensity (defaults to get_user_intensity(user))
+        availability (Availability, optional): The user's availability (loaded if omitted)
+        timeout (int, optional): Seconds the plan is served once its start date is today
+            (defaults to SCHEDULE_CACHE_TIMEOUT)
+
+    Returns:
+        dict: The computed schedule result (same format as get_14_day_schedule)
+    """
+    from apps.core.intensity import get_user_intensity
+    from .task_utils import _generate_14_day_schedule
+
+    if intensity is None:
+        intensity = get_user_intensity(user)
+
+    # Read the fingerprint before generating so a task written meanwhile is never
+    # stored under the newer version. Generating closes past-due tasks, which also
+    # changes it, so the plan is recomputed once from fresh tasks in that case.
+    for attempt in range(2):
+        data_version = get_task_data_version(user)
+        schedule_result = _generate_14_day_schedule(user, start_date, max_intensity, tasks, intensity, availability)
+        if not schedule_result['success']:
+            return schedule_result
+        if get_task_data_version(user) == data_version:
+            break
+        tasks = None
+    else:
+        logger.info(f"Tasks of user {user.id} changed while their plan was computed; not storing it")
+        return schedule_result
+
+    end_date = start_date + timedelta(days=SCHEDULE_DAYS - 1)
+    expires_at = timezone.now() + timedelta(seconds=get_cache_timeout() if timeout is None else timeout)
+    try:
+        with transaction.atomic():
+            if get_task_data_version(user) != data_version:
+                logger.info(f"Tasks of user {user.id} changed while their plan was computed; not storing it")
+                return schedule_result
+            # Only materialized days are replaced; hand-made schedules are kept
+            DailySchedule.objects.filter(
+                user=user, date__gte=start_date, date__lte=end_date, plan_start_date__isnull=False
+            ).delete()
+            day_schedules = DailySchedule.objects.bulk_create([
+                DailySchedule(
+                    user=user,
+                    date=start_date + timedelta(days=day_index),
+                    plan_start_date=start_date,
+                    data_version=data_version,
+                    user_intensity=intensity,
+                    max_intensity=max_intensity,
+                    # Absent when there were no tasks to schedule
+                    intensity_used=schedule_result.get('intensity_used_for_scheduling', 0.0),
+                    minimum_required_intensity=schedule_result.get('minimum_required_intensity', 0.0),
+                    total_tasks=schedule_result['completion_analysis']['total_tasks'],
+                    expires_at=expires_at,
+                )
+                for day_index in range(SCHEDULE_DAYS)
+            ])
+
+            assignments = []
+            for day_schedule, day_plan in zip(day_schedules, schedule_result['schedule']):
+                for position, item in enumerate(day_plan):
+                    assignments.append(TaskAssignment(
+                        daily_schedule=day_schedule,
+                        task_id=item['task_id'],
+                        time_allotted=item['time_allotted'],
+                        start_time=item['start_time'],
+                        end_time=item['end_time'],
+                        position=position,
+                        completion_before=item['completion_before'],
+                        completion_after=item['completion_after'],
+                        is_partial=item.get('partial_completion', False),
+                    ))
+            TaskAssignment.objects.bulk_create(assignments)
+    except IntegrityError:
+        # A concurrent request stored its plan for these dates first, or the user
+        # has a hand-made schedule on one of them; serve the plan without storing it
+        logger.info(f"Could not store the plan of user {user.id} starting {start_date}; serving it unstored")
+
+    return schedule_result
+
+
+def load_materialized_schedule(user, start_date, max_intensity=0.9, intensity=None):
+    """
+    Rebuild a get_14_day_schedule result from the materialized tables.
+
+    Returns:
+        dict: Schedule result, or None if there is no up-to-date plan
+    """
+    from apps.core.intensity import get_user_intensity
+    from .simulation import get_user_today
+
+    if intensity is None:
+        intensity = get_user_intensity(user)
+
+    end_date = start_date + timedelta(days=SCHEDULE_DAYS - 1)
+    day_schedules = DailySchedule.objects.filter(
+        user=user,
+        date__gte=start_date,
+        date__lte=end_date,
+        plan_start_date=start_date,
+        data_version=get_task_data_version(user),
+        user_intensity=intensity,
+        max_intensity=max_intensity,
+    )
+    if start_date == get_user_today():
+        # Today's free time shrinks as the day goes on; like a cached schedule,
+        # a plan starting today is only served until it expires
+        day_schedules = day_schedules.filter(expires_at__gt=timezone.now())
+    day_schedules = list(
+        day_schedules.order_by('date').prefetch_related(
+            Prefetch(
+                'task_assignments',
+                queryset=TaskAssignment.objects.select_related('task').order_by('position')
+            )
+        )
+    )
+    if len(day_schedules) != SCHEDULE_DAYS:
+        return None
+
+    schedule = []
+    scheduled_task_ids = set()
+    for day_schedule in day_schedules:
+        day_plan = []
+        for assignment in day_schedule.task_assignments.all():
+            task = assignment.task
+            item = {
+                'task_id': task.id,
+                'task_title': task.title,
+                'task_description': task.description,
+                'priority': task.delta,
+                'due_date': task.due_date,
+                'due_time': task.due_time,
+                'completion_before': assignment.completion_before,
+                'time_allotted': assignment.time_allotted,
+                'time_needed_total': str(task.T_n),
+                'completion_after': assignment.completion_after,
+                'start_time': assignment.start_time,
+                'end_time': assignment.end_time,
+            }
+            if assignment.is_partial:
+                item['partial_completion'] = True
+            day_plan.append(item)
+            scheduled_task_ids.add(task.id)
+        schedule.append(day_plan)
+
+    first_day = day_schedules[0]
+    days_with_tasks = sum(1 for day_plan in schedule if day_plan)
+    total_tasks_scheduled = sum(len(day_plan) for day_plan in schedule)
+    total_tasks = first_day.total_tasks
+    scheduled_tasks = len(scheduled_task_ids)
+
+    if total_tasks == 0:
+        message = 'No tasks to schedule - empty 14-day schedule generated'
+    else:
+        message = f"✅ 14-day schedule generated with {total_tasks_scheduled} tasks scheduled across {days_with_tasks} days"
+
+    return {
+        'success': True,
+        'schedule': schedule,
+        'total_days': SCHEDULE_DAYS,
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_tasks_scheduled': total_tasks_scheduled,
+        'intensity_used': sum(first_day.intensity_used for day_plan in schedule if day_plan) / SCHEDULE_DAYS,
+        'minimum_required_intensity': first_day.minimum_required_intensity,
+        'intensity_used_for_scheduling': first_day.intensity_used,
+        'completion_analysis': {
+            'total_tasks': total_tasks,
+            'completed_tasks': scheduled_tasks,
+            'remaining_tasks': total_tasks - scheduled_tasks,
+            'completion_rate': scheduled_tasks / total_tasks if total_tasks > 0 else 1.0
+        },
+        'message': message
+    }
+
+
+def get_materialized_schedule(user, start_date, max_intensity=0.9, intensity=None):
+    """
+    Serve the 14-day schedule from the materialized tables, computing and
+    persisting it first if the stored plan is missing or out of date.
+    """
+    schedule_result = load_materialized_schedule(user, start_date, max_intensity, intensity)
+    if schedule_result is None:
+        schedule_result = materialize_14_day_schedule(user, start_date, max_intensity, intensity=intensity)
+    return schedule_result
+
+
+def _recompute_in_background(user_id):
+    """
+    Worker-thread entry point: rematerialize the user's default plan
+    """
+    from django.contrib.auth.models import User
+    from .simulation import get_user_today
+
+    try:
+        user = User.objects.get(pk=user_id)
+        materialize_14_day_schedule(user, get_user_today())
+    except Exception as e:
+        logger.warning(f"Background schedule recompute failed for user {user_id}: {e}")
+    finally:
+        # The worker thread has its own connection; don't leave it open between jobs
+        connection.close()
+
+
+def schedule_background_recompute(user_id):
+    """
+    Queue a recompute of the user's materialized plan once the current
+    transaction commits (no-op unless background materialization is enabled)
+    """
+    if not (is_materialized_mode() and getattr(settings, 'SCHEDULE_MATERIALIZE_IN_BACKGROUND', False)):
+        return
+    transaction.on_commit(lambda: _executor.submit(_recompute_in_background, user_id))
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="data_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Fingerprint of the user's tasks when the plan was computed",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="global_intensity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="intensity_used",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="max_intensity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="minimum_required_intensity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="plan_start_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="total_tasks",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="taskassignment",
+            name="completion_after",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="taskassignment",
+            name="completion_before",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="taskassignment",
+            name="is_partial",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="taskassignment",
+            name="position",
+            field=models.PositiveSmallIntegerField(
+                default=0, help_text="Order within the day's plan"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailyschedule",
+            name="date",
+            field=models.DateField(),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyschedule",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="unique_daily_schedule_per_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:10
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("study", "0003_task_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("tasks_created", models.IntegerField(default=0)),
+                (
+                    "scheduled_time",
+                    models.DurationField(
+                        default=datetime.timedelta(0),
+                        help_text="Expected time (T_n) of the tasks created on this day",
+                    ),
+                ),
+                (
+                    "completed_time",
+                    models.DurationField(
+                        default=datetime.timedelta(0),
+                        help_text="Expected time (T_n) of the tasks created on this day that are completed",
+                    ),
+                ),
+                ("tasks_completed", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_statistics",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailystatistics",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="unique_daily_statistics_per_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0004_daily_statistics"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "due_date", "-delta", "id"],
+                name="task_user_due_list_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0005_task_list_index"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="dailyschedule",
+            old_name="global_intensity",
+            new_name="user_intensity",
+        ),
+    ]
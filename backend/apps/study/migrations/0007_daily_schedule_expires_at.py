@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0006_rename_daily_schedule_user_intensity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyschedule",
+            name="expires_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When a plan starting today stops being served",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def backfill_daily_statistics(apps, schema_editor):
+    """
+    Build the rollup for tasks created before it existed; the signals only
+    track changes from here on
+    """
+    from apps.study.stats_rollup import rebuild_daily_statistics
+
+    rebuild_daily_statistics(
+        task_model=apps.get_model("study", "Task"),
+        statistics_model=apps.get_model("study", "DailyStatistics"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0007_daily_schedule_expires_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_statistics, migrations.RunPython.noop),
+    ]
@@ -48,6 +48,26 @@ class Task(models.Model):
     
     class Meta:
         ordering = ['due_date', 'due_time', '-delta']
+        # Boolean filters compile to "NOT is_completed" / "is_completed", which an index
+        # column can't match, so the completion state is a partial index condition instead
+        indexes = [
+            # Scheduler: a user's open tasks in scheduling order
+            models.Index(
+                fields=['user', 'due_date', 'due_time', '-delta'],
+                condition=models.Q(is_completed=False),
+                name='task_user_open_due_idx',
+            ),
+            # Statistics: a user's tasks completed within a time range
+            models.Index(
+                fields=['user', 'updated_at'],
+                condition=models.Q(is_completed=True),
+                name='task_user_done_updated_idx',
+            ),
+            # Statistics: a user's tasks created within a time range
+            models.Index(fields=['user', 'created_at'], name='task_user_created_idx'),
+            # Task list: keyset pages of a user's tasks
+            models.Index(fields=['user', 'due_date', '-delta', 'id'], name='task_user_due_list_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.completed_so_far}%)"
@@ -88,16 +108,73 @@ class Task(models.Model):
         return (self.due_date - today).days
 
 
+class DailyStatistics(models.Model):
+    """
+    Per-user, per-day rollup of task statistics, kept up to date from the Task
+    save/delete signals (see stats_rollup.py). Days are local dates in the
+    current timezone.
+    """
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_statistics')
+    date = models.DateField()
+    
+    # Tasks created on this day
+    tasks_created = models.IntegerField(default=0)
+    scheduled_time = models.DurationField(
+        default=timedelta(0),
+        help_text="Expected time (T_n) of the tasks created on this day"
+    )
+    completed_time = models.DurationField(
+        default=timedelta(0),
+        help_text="Expected time (T_n) of the tasks created on this day that are completed"
+    )
+    # Completed tasks whose last update fell on this day
+    tasks_completed = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_daily_statistics_per_user'),
+        ]
+    
+    def __str__(self):
+        return f"Statistics for {self.date}"
+
+
 class DailySchedule(models.Model):
     """Model to store daily task scheduling"""
     
-    date = models.DateField(unique=True)
+    date = models.DateField()
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_schedules')
+    
+    # Materialized 14-day plan this day belongs to (empty for manually created schedules)
+    plan_start_date = models.DateField(null=True, blank=True)
+    data_version = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="Fingerprint of the user's tasks when the plan was computed"
+    )
+    # The user's intensity (get_user_intensity) the plan was computed with
+    user_intensity = models.FloatField(null=True, blank=True)
+    max_intensity = models.FloatField(null=True, blank=True)
+    intensity_used = models.FloatField(null=True, blank=True)
+    minimum_required_intensity = models.FloatField(null=True, blank=True)
+    total_tasks = models.IntegerField(default=0)
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a plan starting today stops being served"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_daily_schedule_per_user'),
+        ]
     
     def __str__(self):
         return f"Schedule for {self.date}"
@@ -123,6 +200,12 @@ class TaskAssignment(models.Model):
     )
     is_completed = models.BooleanField(default=False)
     
+    # Planned progress, as computed by the scheduler
+    position = models.PositiveSmallIntegerField(default=0, help_text="Order within the day's plan")
+    completion_before = models.FloatField(default=0.0)
+    completion_after = models.FloatField(default=0.0)
+    is_partial = models.BooleanField(default=False)
+    
     class Meta:
         ordering = ['start_time']
     
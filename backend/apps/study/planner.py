@@ -0,0 +1,173 @@
+"""
+Greedy daily planning core for StudyBunny
+
+generate_daily_plan, generate_daily_plan_for_tasks,
+generate_daily_plan_for_tasks_with_progress and
+can_complete_tasks_with_intensity all fill days the same way: walk the
+tasks in priority order, give each one the time it still needs if it
+fits, otherwise start a partial session with what is left of the day
+(or skip it if too little is left). plan_days is that loop, run over a
+whole horizon.
+
+The tasks are ordered by their key once. A TaskQueue, an array-backed
+tournament tree (heap-shaped) over the time each task still needs in key
+order, finds the next task at or after a position that fits in the time
+left in O(log n). Completed tasks are invalidated lazily by setting
+their leaf to infinity instead of being removed. Every step of a day
+either completes a task or ends the day, so planning n tasks over d days
+costs O((n + d) log n) instead of resorting and rescanning the tasks
+every day.
+"""
+from datetime import timedelta
+
+# Minimum free time left in a day to start a partial session
+PARTIAL_SESSION_THRESHOLD = timedelta(minutes=30)
+
+MICROSECOND = timedelta(microseconds=1)
+INACTIVE = float('inf')
+
+
+def scheduling_key(task):
+    """Default task order: due date, due time, then priority high to low"""
+    return (task.due_date, task.due_time, -task.delta)
+
+
+class TaskQueue:
+    """
+    Tournament tree over the microseconds each task still needs, in key order.
+    """
+
+    def __init__(self, needs):
+        """
+        Args:
+            needs (list): Microseconds each task still needs (INACTIVE for finished tasks)
+        """
+        self.count = len(needs)
+        self.size = 1
+        while self.size < self.count:
+            self.size *= 2
+        self.tree = [INACTIVE] * (2 * self.size)
+        self.tree[self.size:self.size + self.count] = needs
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def set(self, index, need):
+        """Update the time a task still needs (INACTIVE once it is finished)"""
+        node = self.size + index
+        self.tree[node] = need
+        node //= 2
+        while node:
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def find_first(self, position, limit):
+        """
+        Get the first task at or after position needing at most limit, or None
+        """
+        if position >= self.count:
+            return None
+        node = self.size + position
+        while True:
+            if self.tree[node] <= limit:
+                while node < self.size:
+                    node = 2 * node if self.tree[2 * node] <= limit else 2 * node + 1
+                return node - self.size
+            # Move on to the next subtree to the right
+            while node & 1:
+                node //= 2
+            if node == 0:
+                return None
+            node += 1
+
+
+def plan_days(tasks, day_free_time, task_progress=None, key=scheduling_key, min_tasks=None,
+              partial_threshold=PARTIAL_SESSION_THRESHOLD):
+    """
+    Greedily fill consecutive days with tasks.
+
+    On each day the tasks are taken in key order. A task that fits in the
+    time left gets all the time it still needs. One that does not fit gets
+    a partial session with the rest of the day, which ends the day, if more
+    than partial_threshold is left and fewer than min_tasks tasks were
+    planned that day; otherwise it is skipped. Once min_tasks tasks are
+    planned, the day also ends when less than partial_threshold is left.
+
+    Args:
+        tasks (list): Tasks to plan
+        day_free_time (list): Free time (timedelta) of each day, in order
+        task_progress (dict, optional): Task id -> completion percentage to start from
+            (defaults to each task's completed_so_far); tasks at 100% are left out
+        key (callable, optional): Task ordering key (defaults to scheduling_key)
+        min_tasks (int, optional): Tasks a day should get before it may stop early and
+            before partial sessions are refused; None fills every day as far as it goes
+        partial_threshold (timedelta, optional): Minimum time left to start a partial session
+
+    Returns:
+        tuple: (plans, progress) where plans has one list of allocations per day, each
+            a dict with task, time_allotted, completion_before, completion_after and
+            partial_completion, and progress maps task id -> completion after the last day
+    """
+    tasks = sorted(tasks, key=key)
+    if task_progress is None:
+        progress = {task.id: task.completed_so_far for task in tasks}
+    else:
+        progress = {task.id: task_progress.get(task.id, task.completed_so_far) for task in tasks}
+
+    queue = TaskQueue([
+        _need(task, progress[task.id]) // MICROSECOND if progress[task.id] < 100.0 else INACTIVE
+        for task in tasks
+    ])
+    # Any active task can be picked when a partial session is allowed
+    anything = float(2 ** 63)
+
+    plans = []
+    for free_time in day_free_time:
+        plan = []
+        remaining_time = free_time
+        position = 0
+        while True:
+            allow_partial = remaining_time > partial_threshold and (min_tasks is None or len(plan) < min_tasks)
+            index = queue.find_first(position, anything if allow_partial else remaining_time // MICROSECOND)
+            if index is None:
+                break
+
+            task = tasks[index]
+            completion_before = progress[task.id]
+            time_needed = _need(task, completion_before)
+            if time_needed <= remaining_time:
+                completion_after = _advance(task, completion_before, time_needed)
+                plan.append(_allocation(task, time_needed, completion_before, completion_after, False))
+                progress[task.id] = completion_after
+                queue.set(index, INACTIVE)
+                remaining_time -= time_needed
+                position = index + 1
+                if min_tasks is not None and len(plan) >= min_tasks and remaining_time < partial_threshold:
+                    break
+            else:
+                completion_after = _advance(task, completion_before, remaining_time)
+                plan.append(_allocation(task, remaining_time, completion_before, completion_after, True))
+                progress[task.id] = completion_after
+                queue.set(index, _need(task, completion_after) // MICROSECOND if completion_after < 100.0 else INACTIVE)
+                break
+        plans.append(plan)
+    return plans, progress
+
+
+def _need(task, completion):
+    return task.T_n * (1.0 - completion / 100.0)
+
+
+def _advance(task, completion, time_allotted):
+    if not task.T_n:
+        return 100.0
+    return min(100.0, completion + time_allotted / task.T_n * 100)
+
+
+def _allocation(task, time_allotted, completion_before, completion_after, partial):
+    return {
+        'task': task,
+        'time_allotted': time_allotted,
+        'completion_before': completion_before,
+        'completion_after': completion_after,
+        'partial_completion': partial,
+    }
@@ -0,0 +1,145 @@
+"""
+Per-user cache for generated 14-day schedules
+
+Schedules are cached under a key built from the user, start date, max
+intensity, the user's intensity and a per-user task-set version. The version
+is replaced whenever one of the user's tasks is saved or deleted (see
+signals.py), so stale entries are never read again and simply expire.
+A change of the user's intensity (or of the global intensity, for users
+without their own) produces a different key the same way.
+
+Next to the result, the replayable state of the user's most recently
+generated schedule is cached (see incremental.py). Progress-only task
+saves update that state and store the refreshed result under the new
+version instead of leaving the next request to rebuild everything.
+
+The version token only reaches other processes (e.g. the other gunicorn
+workers) through a shared cache backend. With a per-process cache such as
+LocMemCache, a task saved in one worker leaves the others serving their
+cached schedule until it expires. Production configures a shared cache and
+sets SCHEDULE_CACHE_REQUIRE_SHARED, which turns the schedule cache off
+rather than serve stale schedules if the cache is per-process anyway.
+"""
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from study_bunny.caching import DEFAULT_CACHE_TIMEOUT, get_cache_timeout, is_process_local_cache
+
+# Seconds a schedule stays cached; today's free time shrinks as the day goes on
+DEFAULT_SCHEDULE_CACHE_TIMEOUT = DEFAULT_CACHE_TIMEOUT
+
+
+def _version_key(user_id):
+    return f'study:task_version:{user_id}'
+
+
+def _new_version():
+    # A random starting point, so a counter recreated after eviction never
+    # comes back to a version an old cached state was stamped with
+    return uuid.uuid4().int >> 72
+
+
+def get_task_set_version(user_id):
+    """
+    Get the current task-set version for a user, creating one if needed
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if not isinstance(version, int):
+        if version is None:
+            cache.add(key, _new_version(), None)
+        else:
+            # Left over from the earlier token format
+            cache.set(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user_schedule(user_id):
+    """
+    Invalidate every cached schedule for a user by advancing the task-set version.
+
+    The version is a counter advanced with cache.incr, which is atomic on Redis
+    and the local memory cache, so every invalidation gets a version of its own
+    and apply_progress_update can tell whether another one happened meanwhile.
+
+    Returns:
+        int: The new version
+    """
+    key = _version_key(user_id)
+    try:
+        return cache.incr(key)
+    except (ValueError, TypeError):
+        # No counter yet (or one in the earlier token format)
+        version = _new_version()
+        cache.set(key, version, None)
+        return version
+
+
+def is_schedule_cache_enabled():
+    """
+    Check whether schedules may be cached: always, unless SCHEDULE_CACHE_REQUIRE_SHARED
+    is set and the cache is private to this process
+    """
+    if getattr(settings, 'SCHEDULE_CACHE_REQUIRE_SHARED', False):
+        return not is_process_local_cache()
+    return True
+
+
+def get_schedule_cache_key(user_id, start_date, max_intensity, intensity):
+    """
+    Build the cache key for a user's schedule
+    """
+    version = get_task_set_version(user_id)
+    return f'study:schedule:{user_id}:{start_date.isoformat()}:{max_intensity}:{intensity}:{version}'
+
+
+def get_cached_schedule(key):
+    """
+    Get a cached schedule result, or None on a miss
+    """
+    if not is_schedule_cache_enabled():
+        return None
+    return cache.get(key)
+
+
+def set_cached_schedule(key, schedule_result, timeout=None):
+    """
+    Store a schedule result in the cache
+
+    Args:
+        timeout (int, optional): Seconds to keep it (defaults to SCHEDULE_CACHE_TIMEOUT)
+    """
+    if not is_schedule_cache_enabled():
+        return
+    cache.set(key, schedule_result, _get_timeout(timeout))
+
+
+def get_schedule_state(user_id):
+    """
+    Get the cached IncrementalSchedule of the user's latest schedule, or None
+    """
+    if not is_schedule_cache_enabled():
+        return None
+    return cache.get(_state_key(user_id))
+
+
+def set_schedule_state(user_id, state, timeout=None):
+    """
+    Store the IncrementalSchedule of the user's latest schedule
+
+    Args:
+        timeout (int, optional): Seconds to keep it (defaults to SCHEDULE_CACHE_TIMEOUT)
+    """
+    if not is_schedule_cache_enabled():
+        return
+    cache.set(_state_key(user_id), state, _get_timeout(timeout))
+
+
+def _state_key(user_id):
+    return f'study:schedule_state:{user_id}'
+
+
+def _get_timeout(timeout=None):
+    # None would make Django cache the entry forever
+    return get_cache_timeout() if timeout is None else timeout
@@ -0,0 +1,89 @@
+"""
+Django signals for keeping cached schedules and the statistics rollup in
+sync with tasks
+
+Inside task_signals_deferred() the receivers do nothing; the bulk writes in
+bulk.py use it and update the schedule cache and the rollup once for the
+whole batch instead.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Task
+from .schedule_cache import invalidate_user_schedule
+from .incremental import apply_progress_update
+from .materialize import schedule_background_recompute
+from .stats_rollup import CONTRIBUTION_FIELDS, apply_task_change, task_contribution_values
+
+_deferred = threading.local()
+
+
+@contextmanager
+def task_signals_deferred():
+    """
+    Skip the Task receivers in this thread; the caller takes over their work
+    """
+    _deferred.depth = getattr(_deferred, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+
+
+def _is_deferred():
+    return getattr(_deferred, 'depth', 0) > 0
+
+
+@receiver(post_save, sender=Task)
+def update_schedule_on_task_save(sender, instance, created, **kwargs):
+    """
+    Patch the owner's cached schedule for progress-only updates, otherwise
+    invalidate it
+    """
+    if _is_deferred():
+        return
+    if created or not apply_progress_update(instance):
+        invalidate_user_schedule(instance.user_id)
+    schedule_background_recompute(instance.user_id)
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_schedule_on_task_delete(sender, instance, **kwargs):
+    """Invalidate the owner's cached schedules when a task is deleted"""
+    if _is_deferred():
+        return
+    invalidate_user_schedule(instance.user_id)
+    schedule_background_recompute(instance.user_id)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_statistics(sender, instance, **kwargs):
+    """Load the stored state of a task about to be saved for the statistics rollup"""
+    if _is_deferred():
+        return
+    instance._statistics_before = None
+    if instance.pk is not None:
+        instance._statistics_before = Task.objects.filter(pk=instance.pk).values(*CONTRIBUTION_FIELDS).first()
+
+
+@receiver(post_save, sender=Task)
+def update_statistics_on_task_save(sender, instance, **kwargs):
+    """Move a saved task's contribution in the owner's statistics rollup"""
+    if _is_deferred():
+        return
+    apply_task_change(
+        instance.user_id,
+        old_values=getattr(instance, '_statistics_before', None),
+        new_values=task_contribution_values(instance),
+    )
+
+
+@receiver(post_delete, sender=Task)
+def update_statistics_on_task_delete(sender, instance, **kwargs):
+    """Remove a deleted task from the owner's statistics rollup"""
+    if _is_deferred():
+        return
+    apply_task_change(instance.user_id, old_values=task_contribution_values(instance))
@@ -0,0 +1,211 @@
+"""
+In-memory schedule simulation for StudyBunny
+
+The intensity search probes the same task set many times. Loading the
+tasks once into a TaskSnapshot lets every probe run without touching
+the database.
+"""
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from django.utils import timezone
+from apps.core.capacity import CapacityCalendar
+from apps.core.models import TimeCalculation
+from .models import Task
+from study_bunny.instrumentation import record_simulation
+
+logger = logging.getLogger(__name__)
+
+# Tasks are worked on when they are due within this many days
+WORK_WINDOW_DAYS = 7
+
+# Minimum free time (in seconds) needed to start a partial work session
+MIN_PARTIAL_SECONDS = 30 * 60
+
+
+def get_user_today():
+    """
+    Get today's date in the user's timezone (CDT)
+    """
+    import pytz
+    user_tz = pytz.timezone('America/Chicago')  # CDT timezone
+    return timezone.now().astimezone(user_tz).date()
+
+
+class TaskSnapshot:
+    """
+    Compact, read-only view of a user's incomplete tasks.
+
+    Tasks are kept in scheduling order (due date, due time, priority high
+    to low) as parallel lists, so a day's candidate tasks are a
+    contiguous slice found with bisect. The owner's availability, if
+    given, sizes every simulated day.
+    """
+
+    def __init__(self, tasks, availability=None):
+        self.availability = availability
+        tasks = sorted(tasks, key=lambda t: (t.due_date, t.due_time, -t.delta))
+        self.task_ids = [task.id for task in tasks]
+        self.due_ordinals = [task.due_date.toordinal() for task in tasks]
+        self.durations = [task.T_n.total_seconds() for task in tasks]
+        self.progress = [task.completed_so_far for task in tasks]
+
+    @classmethod
+    def for_user(cls, user, availability=None):
+        """
+        Load a snapshot of the user's incomplete tasks with a single query
+
+        Args:
+            availability (Availability, optional): The user's availability (defaults to
+                08:00-24:00 every day)
+        """
+        tasks = Task.objects.filter(
+            user=user,
+            is_completed=False
+        ).only('id', 'T_n', 'completed_so_far', 'delta', 'due_date', 'due_time')
+        return cls(tasks, availability)
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    def window(self, current_date):
+        """
+        Get the index range of tasks due between current_date and
+        current_date + WORK_WINDOW_DAYS (inclusive)
+        """
+        ordinal = current_date.toordinal()
+        low = bisect_left(self.due_ordinals, ordinal)
+        high = bisect_right(self.due_ordinals, ordinal + WORK_WINDOW_DAYS, lo=low)
+        return low, high
+
+    def simulate(self, intensity, start_date, end_date, user_today=None, use_free_today=True):
+        """
+        Simulate greedy daily scheduling from start_date to end_date.
+
+        Args:
+            intensity (float): Intensity value between 0.0 and 1.0
+            start_date (date): First day of the simulation
+            end_date (date): Last day of the simulation (inclusive)
+            user_today (date, optional): The user's current date (defaults to today in CDT)
+            use_free_today (bool, optional): Size the user's current day with the time left
+                today (defaults to True); when False every day uses get_free_d
+
+        Returns:
+            list: Final progress percentage for each task, in snapshot order
+
+        Raises:
+            ValueError: If the intensity value is out of range
+        """
+        record_simulation()
+        capacity = CapacityCalendar.for_period(
+            start_date, end_date, intensity,
+            user_today=user_today, use_free_today=use_free_today, availability=self.availability
+        )
+
+        progress = list(self.progress)
+        durations = self.durations
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        current_date = start_date
+        for day_index in range(len(capacity)):
+            low, high = self.window(current_date)
+            if debug:
+                logger.debug(f"Simulating {current_date} at intensity {intensity:.3f}: {high - low} tasks in window")
+
+            if low < high:
+                remaining_time = capacity.free_seconds[day_index]
+
+                for index in range(low, high):
+                    if progress[index] >= 100.0:
+                        continue
+
+                    time_needed = durations[index] * (1.0 - progress[index] / 100.0)
+                    if time_needed <= remaining_time:
+                        # Complete the task
+                        progress[index] = 100.0
+                        remaining_time -= time_needed
+                    elif remaining_time > MIN_PARTIAL_SECONDS:
+                        # Partial completion uses up the rest of the day
+                        partial_completion = remaining_time / durations[index] * 100
+                        progress[index] = min(100.0, progress[index] + partial_completion)
+                        break
+
+            current_date += timedelta(days=1)
+
+        return progress
+
+    def can_complete(self, intensity, start_date, end_date, user_today=None):
+        """
+        Check whether every task reaches 100% in the simulated period
+        """
+        progress = self.simulate(intensity, start_date, end_date, user_today=user_today)
+        return all(value >= 100.0 for value in progress)
+
+    def minimum_intensity_bound(self, start_date, end_date, user_today=None):
+        """
+        Lower bound on the intensity needed to finish every task.
+
+        For every due date D, the remaining work of tasks due on or before D
+        must fit into the free time of the days from start_date to D. This
+        is computed in one pass over the tasks with running sums, and the
+        tightest ratio is inverted through TimeCalculation's free factor.
+        Today's capacity does not scale the same way, so it is counted at
+        its maximum (intensity 1.0) to keep the bound valid.
+
+        Returns:
+            float: Intensity between 0.0 and 1.0, or None if even intensity
+                1.0 cannot provide enough free time
+        """
+        if user_today is None:
+            user_today = get_user_today()
+
+        # Time available on each day before intensity, from the availability if there is one
+        available_seconds = None
+        if self.availability is not None and not self.availability.is_default:
+            available_seconds = self.availability.available_seconds(
+                start_date, max(0, (end_date - start_date).days + 1), now=timezone.now()
+            )
+
+        today_capacity = 0.0
+        if start_date <= user_today <= end_date:
+            if available_seconds is not None:
+                today_capacity = TimeCalculation.get_free_today(
+                    intensity_value=1.0,
+                    available_time=timedelta(seconds=available_seconds[(user_today - start_date).days])
+                ).total_seconds()
+            else:
+                today_capacity = TimeCalculation.get_free_today(intensity_value=1.0).total_seconds()
+
+        required_factor = 0.0
+        cumulative_work = 0.0
+        available_time = 0.0  # Total time (before intensity) of future days counted so far
+        counted_until = start_date - timedelta(days=1)
+        count = len(self.task_ids)
+
+        for index in range(count):
+            cumulative_work += self.durations[index] * (1.0 - self.progress[index] / 100.0)
+
+            # Only check once all tasks sharing this due date are included
+            if index + 1 < count and self.due_ordinals[index + 1] == self.due_ordinals[index]:
+                continue
+
+            last_day = min(date.fromordinal(self.due_ordinals[index]), end_date)
+            while counted_until < last_day:
+                counted_until += timedelta(days=1)
+                if counted_until == user_today:
+                    continue
+                if available_seconds is not None:
+                    available_time += available_seconds[(counted_until - start_date).days]
+                else:
+                    available_time += TimeCalculation.get_time_d(counted_until).total_seconds()
+
+            work_left = cumulative_work
+            if counted_until >= user_today:
+                work_left -= today_capacity
+            if work_left <= 0:
+                continue
+            if available_time <= 0:
+                return None
+            required_factor = max(required_factor, work_left / available_time)
+
+        return TimeCalculation.get_intensity_for_free_factor(required_factor)
@@ -0,0 +1,177 @@
+"""
+Per-user, per-day statistics rollup for StudyBunny
+
+The statistics and dashboard endpoints read DailyStatistics rows instead of
+scanning every task, so their cost grows with the number of days a user has
+been active rather than with the number of tasks.
+
+Every task contributes to at most two days:
+- the day it was created: tasks_created, scheduled_time and, once it is
+  completed, completed_time
+- the day it was last updated, if it is completed: tasks_completed
+
+The Task signals (see signals.py) subtract a task's old contribution and add
+its new one on every save and delete; bulk.py applies the changes of a
+whole batch at once with apply_task_changes. Other writes that bypass the
+signals (bulk_create, queryset update) are not tracked; rebuild_daily_statistics,
+also run by the backfill_statistics management command and once by the
+0008_backfill_daily_statistics migration, recomputes the rows from the tasks.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyStatistics, Task
+
+# Fields of a task its rollup contribution depends on
+CONTRIBUTION_FIELDS = ('created_at', 'updated_at', 'is_completed', 'T_n')
+
+COUNT_FIELDS = ('tasks_created', 'tasks_completed')
+DURATION_FIELDS = ('scheduled_time', 'completed_time')
+
+
+def get_task_contribution(values):
+    """
+    Get what one task adds to the rollup
+
+    Args:
+        values (dict): The task's CONTRIBUTION_FIELDS
+
+    Returns:
+        dict: date -> {field: amount}
+    """
+    contribution = defaultdict(dict)
+    created_day = timezone.localtime(values['created_at']).date()
+    contribution[created_day].update({
+        'tasks_created': 1,
+        'scheduled_time': values['T_n'],
+    })
+    if values['is_completed']:
+        contribution[created_day]['completed_time'] = values['T_n']
+        completed_day = timezone.localtime(values['updated_at']).date()
+        contribution[completed_day]['tasks_completed'] = 1
+    return contribution
+
+
+def task_contribution_values(task):
+    """Get the CONTRIBUTION_FIELDS of a Task instance"""
+    return {field: getattr(task, field) for field in CONTRIBUTION_FIELDS}
+
+
+def _add_contribution(deltas, contribution, sign):
+    for day, amounts in contribution.items():
+        for field, amount in amounts.items():
+            deltas[day][field] = deltas[day].get(field, 0 if field in COUNT_FIELDS else timedelta(0)) + sign * amount
+
+
+def apply_task_change(user_id, old_values=None, new_values=None):
+    """
+    Move a task's contribution in the user's rollup from its old to its new state
+
+    Args:
+        user_id (int): Owner of the task
+        old_values (dict, optional): CONTRIBUTION_FIELDS before the change (None for a new task)
+        new_values (dict, optional): CONTRIBUTION_FIELDS after the change (None for a deleted task)
+    """
+    apply_task_changes(user_id, [(old_values, new_values)])
+
+
+def apply_task_changes(user_id, changes):
+    """
+    Apply the changes of several tasks to the user's rollup, with one update
+    per affected day
+
+    Args:
+        user_id (int): Owner of the tasks
+        changes (list): (old_values, new_values) pairs as in apply_task_change
+    """
+    deltas = defaultdict(dict)
+    creates_rows = False
+    for old_values, new_values in changes:
+        if old_values is not None:
+            _add_contribution(deltas, get_task_contribution(old_values), -1)
+        if new_values is not None:
+            _add_contribution(deltas, get_task_contribution(new_values), 1)
+            creates_rows = True
+
+    with transaction.atomic():
+        for day, amounts in sorted(deltas.items()):
+            amounts = {field: amount for field, amount in amounts.items() if amount}
+            if not amounts:
+                continue
+            updated = DailyStatistics.objects.filter(user_id=user_id, date=day).update(
+                **{field: F(field) + amount for field, amount in amounts.items()}
+            )
+            # A deletion only subtracts from existing rows: during a cascading user
+            # delete the rows may already be gone and must not be recreated
+            if not updated and creates_rows:
+                DailyStatistics.objects.create(user_id=user_id, date=day, **amounts)
+
+
+def rebuild_daily_statistics(user_ids=None, task_model=Task, statistics_model=DailyStatistics):
+    """
+    Recompute the rollup from the tasks
+
+    Args:
+        user_ids (list, optional): Users to rebuild (defaults to every user with tasks or rollup rows)
+        task_model, statistics_model (optional): The Task and DailyStatistics models to use;
+            the backfill migration passes its historical models
+
+    Returns:
+        int: Number of DailyStatistics rows written
+    """
+    tasks = task_model.objects.all()
+    existing = statistics_model.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(user_id__in=user_ids)
+        existing = existing.filter(user_id__in=user_ids)
+
+    rows = defaultdict(dict)
+    created = (
+        tasks.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('user_id', 'day')
+        .annotate(
+            tasks_created=Count('id'),
+            scheduled_time=Sum('T_n'),
+            completed_time=Sum('T_n', filter=Q(is_completed=True)),
+        )
+    )
+    for row in created:
+        rows[(row['user_id'], row['day'])].update({
+            'tasks_created': row['tasks_created'],
+            'scheduled_time': row['scheduled_time'],
+            'completed_time': row['completed_time'] or timedelta(0),
+        })
+
+    completed = (
+        tasks.filter(is_completed=True)
+        .order_by()
+        .annotate(day=TruncDate('updated_at'))
+        .values('user_id', 'day')
+        .annotate(tasks_completed=Count('id'))
+    )
+    for row in completed:
+        rows[(row['user_id'], row['day'])]['tasks_completed'] = row['tasks_completed']
+
+    with transaction.atomic():
+        existing.delete()
+        statistics_model.objects.bulk_create(
+            [statistics_model(user_id=user_id, date=day, **amounts) for (user_id, day), amounts in rows.items()],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def get_user_daily_statistics(user):
+    """
+    Get a user's rollup rows in one query
+
+    Returns:
+        dict: date -> DailyStatistics
+    """
+    return {row.date: row for row in DailyStatistics.objects.filter(user=user)}
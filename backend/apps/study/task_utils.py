@@ -5,9 +5,26 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import datetime, timedelta, date
 from .models import Task
+from apps.core.availability import get_user_availabilities, get_user_availability
+from apps.core.capacity import CapacityCalendar
 from apps.core.models import TimeCalculation
-from apps.core.intensity import get_intensity_info
+from apps.core.intensity import get_intensity_info, get_user_intensities, get_user_intensity
+from apps.core.slots import place_day_plan
+from .simulation import TaskSnapshot, get_user_today
+from .schedule_cache import (
+    get_schedule_cache_key, get_cached_schedule, set_cached_schedule,
+    get_task_set_version, set_schedule_state,
+)
+from .incremental import IncrementalSchedule
+from .planner import plan_days
+from .whatif import RemovalWhatIf
+from study_bunny.instrumentation import record_simulation, scheduler_timed
+from .materialize import is_materialized_mode, get_materialized_schedule, materialize_14_day_schedule
 import math
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 def round_to_5_min_blocks(timedelta_obj, round_up=True):
@@ -286,10 +303,21 @@ def get_task_by_name(user, task_name):
         }
 
 
-def can_complete_tasks_with_intensity_simulation(user, intensity_value, start_date=None, end_date=None):
+@scheduler_timed
+def can_complete_tasks_with_intensity_simulation(user, intensity_value, start_date=None, end_date=None, snapshot=None):
     """
     Simulate the 14-day schedule to determine if all tasks can be completed.
     This function uses the same logic as the actual 14-day schedule.
+    
+    The tasks are loaded once into a due-date-sorted TaskSnapshot; each day's
+    candidates (due within the next 7 days) are found with bisect.
+    
+    Args:
+        user: User instance (owner of the tasks)
+        intensity_value (float): Intensity value between 0.0 and 1.0
+        start_date (date, optional): First day of the simulation (defaults to today)
+        end_date (date, optional): Unused; the simulation always covers 14 days
+        snapshot (TaskSnapshot, optional): Preloaded incomplete tasks (loaded with one query if omitted)
     """
     try:
         # Set default dates if not provided
@@ -299,12 +327,10 @@ def can_complete_tasks_with_intensity_simulation(user, intensity_value, start_da
             end_date = start_date + timedelta(days=14)
         
         # Get all incomplete tasks for the user
-        tasks = Task.objects.filter(
-            user=user,
-            is_completed=False
-        ).order_by('due_date', 'due_time', '-delta')
+        if snapshot is None:
+            snapshot = TaskSnapshot.for_user(user)
         
-        if not tasks.exists():
+        if not len(snapshot):
             return {
                 'success': True,
                 'can_complete': True,
@@ -320,77 +346,28 @@ def can_complete_tasks_with_intensity_simulation(user, intensity_value, start_da
             }
         
         # Calculate total time needed for all tasks
-        total_time_needed = timedelta()
-        for task in tasks:
-            completion_percentage = task.completed_so_far / 100.0
-            remaining_percentage = 1.0 - completion_percentage
-            remaining_time = task.T_n * remaining_percentage
-            total_time_needed += remaining_time
-        
-        # Simulate the 14-day schedule
-        task_progress = {}
-        for task in tasks:
-            task_progress[task.id] = task.completed_so_far
+        total_time_needed = timedelta(seconds=sum(
+            duration * (1.0 - progress / 100.0)
+            for duration, progress in zip(snapshot.durations, snapshot.progress)
+        ))
         
-        total_time_available = timedelta()
-        completed_tasks_count = 0
+        # Free time of every day in the 14-day period
+        last_date = start_date + timedelta(days=13)
+        total_time_available = CapacityCalendar(
+            start_date, 14, intensity_value, use_free_today=False, availability=snapshot.availability
+        ).total_free_time()
         
-        # Process each day for 14 days
-        for day_index in range(14):
-            current_date = start_date + timedelta(days=day_index)
-            
-            # Get free time for this day
-            day_free_time = TimeCalculation.get_free_d(current_date, intensity_value=intensity_value)
-            total_time_available += day_free_time
-            
-            # Get tasks that should be worked on this date (due on or after current date, within next 7 days)
-            tasks_due_today = tasks.filter(
-                due_date__gte=current_date,
-                due_date__lte=current_date + timedelta(days=7)
-            )
-            
-            print(f"   🔍 Tasks due on {current_date}: {tasks_due_today.count()}")
-            for task in tasks_due_today:
-                print(f"      • {task.title} (due: {task.due_date}, completed: {task.completed_so_far}%)")
-            
-            if not tasks_due_today.exists():
-                print(f"   ⚠️  No tasks due on {current_date}, skipping...")
-                current_date += timedelta(days=1)
-                continue
-            
-            # Filter out tasks that are already complete
-            incomplete_tasks = []
-            for task in tasks_due_today:
-                if task_progress.get(task.id, 0.0) < 100.0:
-                    incomplete_tasks.append(task)
-            
-            if not incomplete_tasks:
-                continue
-            
-            # Simulate daily scheduling
-            remaining_time = day_free_time
-            for task in incomplete_tasks:
-                completion_percentage = task_progress.get(task.id, 0.0) / 100.0
-                remaining_percentage = 1.0 - completion_percentage
-                time_needed = task.T_n * remaining_percentage
-                
-                if time_needed <= remaining_time:
-                    # Complete the task
-                    task_progress[task.id] = 100.0
-                    completed_tasks_count += 1
-                    remaining_time -= time_needed
-                else:
-                    # Partial completion
-                    if remaining_time > timedelta(minutes=30):
-                        partial_completion = remaining_time / task.T_n * 100
-                        task_progress[task.id] = min(100.0, task_progress.get(task.id, 0.0) + partial_completion)
-                        remaining_time = timedelta()
-                        break
+        # Simulate the 14-day schedule
+        final_progress = snapshot.simulate(intensity_value, start_date, last_date, use_free_today=False)
         
         # Count completed tasks
-        total_tasks = len(tasks)
-        completed_tasks = sum(1 for task in tasks if task_progress.get(task.id, 0.0) >= 100.0)
+        total_tasks = len(snapshot)
+        completed_tasks = sum(1 for progress in final_progress if progress >= 100.0)
         remaining_tasks = total_tasks - completed_tasks
+        logger.debug(
+            f"Simulation from {start_date} at intensity {intensity_value:.3f}: "
+            f"{completed_tasks}/{total_tasks} tasks completed"
+        )
         
         # Calculate efficiency
         efficiency = 0.0
@@ -421,7 +398,8 @@ def can_complete_tasks_with_intensity_simulation(user, intensity_value, start_da
         }
 
 
-def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, end_date=None):
+@scheduler_timed
+def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, end_date=None, availability=None):
     """
     Determine if all remaining tasks can be completed within the given time frame
     using a greedy task scheduling algorithm based on the provided intensity value.
@@ -431,6 +409,7 @@ def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, en
         intensity_value (float): Intensity value between 0.0 and 1.0
         start_date (date, optional): Start date for scheduling (defaults to today)
         end_date (date, optional): End date for scheduling (defaults to 30 days from start)
+        availability (Availability, optional): The user's availability (loaded if omitted)
     
     Returns:
         dict: Result containing completion status, schedule details, and analysis
@@ -461,12 +440,9 @@ def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, en
             end_date = start_date + timedelta(days=30)
         
         # Get all incomplete tasks for the user
-        tasks = Task.objects.filter(
-            user=user,
-            is_completed=False
-        ).order_by('due_date', 'due_time', '-delta')  # Sort by due date/time, then by priority (high to low)
+        tasks = list(Task.objects.filter(user=user, is_completed=False))
         
-        if not tasks.exists():
+        if not tasks:
             return {
                 'success': True,
                 'can_complete': True,
@@ -482,118 +458,74 @@ def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, en
             }
         
         # Calculate total time needed for all tasks
-        total_time_needed = timedelta()
-        task_details = []
-        
-        for task in tasks:
-            # Calculate remaining time needed for this task
-            completion_percentage = task.completed_so_far / 100.0
-            remaining_percentage = 1.0 - completion_percentage
-            remaining_time = task.T_n * remaining_percentage
-            
-            total_time_needed += remaining_time
-            task_details.append({
-                'task': task,
-                'remaining_time': remaining_time,
-                'priority': task.delta,
-                'due_datetime': datetime.combine(task.due_date, task.due_time),
-                'completion_percentage': completion_percentage
-            })
+        total_time_needed = sum(
+            (task.T_n * (1.0 - task.completed_so_far / 100.0) for task in tasks), timedelta()
+        )
+        
+        # Free time of every day from start_date to end_date with the given intensity
+        # (what is left of today for the user's current day)
+        try:
+            if availability is None:
+                availability = get_user_availability(user)
+            capacity = CapacityCalendar.for_period(start_date, end_date, intensity_value, availability=availability)
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': f'Invalid intensity value: {str(e)}'
+            }
+        
+        # Greedy scheduling over the whole period: highest priority first, then earliest due,
+        # filling every day as far as it goes
+        record_simulation()
+        plans, _ = plan_days(
+            tasks,
+            capacity.free_time,
+            key=lambda task: (-task.delta, datetime.combine(task.due_date, task.due_time)),
+            min_tasks=None,
+        )
         
-        # Greedy scheduling algorithm
         schedule = []
-        current_date = start_date
         total_time_available = timedelta()
         completed_tasks_count = 0
-        remaining_tasks_count = 0
         
-        # Process each day from start_date to end_date
-        while current_date <= end_date:
-            # Calculate available free time for this day with the given intensity
-            try:
-                # Get free time for this day using the provided intensity value
-                # Use user's timezone for today comparison
-                user_today = timezone.now().astimezone(timezone.get_current_timezone()).date()
-                if current_date == user_today:
-                    # For today, use get_free_today with intensity parameter
-                    day_free_time = TimeCalculation.get_free_today(intensity_value=intensity_value)
-                    print(f"   📅 Today ({current_date}): {day_free_time:.2f} hours free time")
-                else:
-                    # For future days, use get_free_d with intensity parameter
-                    day_free_time = TimeCalculation.get_free_d(current_date, intensity_value=intensity_value)
-                    print(f"   📅 {current_date}: {day_free_time:.2f} hours free time")
-            except ValueError as e:
-                return {
-                    'success': False,
-                    'error': f'Invalid intensity value: {str(e)}'
-                }
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for day_index, (day_free_time, allocations) in enumerate(zip(capacity.free_time, plans)):
+            current_date = start_date + timedelta(days=day_index)
+            if debug:
+                label = f"Today ({current_date})" if current_date == capacity.user_today else str(current_date)
+                logger.debug(f"{label}: {day_free_time.total_seconds() / 3600:.2f} hours free time")
             
             total_time_available += day_free_time
-            
-            # Sort tasks by priority (high delta = high priority) and due date
-            available_tasks = [td for td in task_details if not td.get('scheduled', False)]
-            available_tasks.sort(key=lambda x: (-x['priority'], x['due_datetime']))
-            
-            # Greedily assign tasks to this day
+            time_used = sum((allocation['time_allotted'] for allocation in allocations), timedelta())
             day_schedule = {
                 'date': current_date,
                 'free_time': day_free_time,
                 'assigned_tasks': [],
-                'time_used': timedelta(),
-                'time_remaining': day_free_time
+                'time_used': time_used,
+                'time_remaining': day_free_time - time_used
             }
             
-            for task_detail in available_tasks:
-                task = task_detail['task']
-                remaining_time = task_detail['remaining_time']
-                
-                # Check if we can fit this task in today's free time
-                if remaining_time <= day_schedule['time_remaining']:
-                    # Assign the task to this day
-                    day_schedule['assigned_tasks'].append({
-                        'task_id': task.id,
-                        'task_title': task.title,
-                        'time_assigned': remaining_time,
-                        'priority': task.delta,
-                        'due_date': task.due_date,
-                        'completion_before': task_detail['completion_percentage']
-                    })
-                    
-                    day_schedule['time_used'] += remaining_time
-                    day_schedule['time_remaining'] -= remaining_time
-                    task_detail['scheduled'] = True
-                    completed_tasks_count += 1
-                    
-                    # Mark task as completed in our simulation
-                    task_detail['completion_percentage'] = 1.0
+            for allocation in allocations:
+                task = allocation['task']
+                assigned = {
+                    'task_id': task.id,
+                    'task_title': task.title,
+                    'time_assigned': allocation['time_allotted'],
+                    'priority': task.delta,
+                    'due_date': task.due_date,
+                    'completion_before': allocation['completion_before'] / 100.0
+                }
+                if allocation['partial_completion']:
+                    assigned['partial_completion'] = True
+                    assigned['new_completion'] = allocation['completion_after'] / 100.0
                 else:
-                    # Check if we can partially complete this task today
-                    if day_schedule['time_remaining'] > timedelta(minutes=30):  # Minimum 30 minutes
-                        partial_time = day_schedule['time_remaining']
-                        partial_completion = partial_time / task.T_n
-                        
-                        day_schedule['assigned_tasks'].append({
-                            'task_id': task.id,
-                            'task_title': task.title,
-                            'time_assigned': partial_time,
-                            'priority': task.delta,
-                            'due_date': task.due_date,
-                            'completion_before': task_detail['completion_percentage'],
-                            'partial_completion': True,
-                            'new_completion': min(1.0, task_detail['completion_percentage'] + partial_completion)
-                        })
-                        
-                        day_schedule['time_used'] += partial_time
-                        day_schedule['time_remaining'] = timedelta()
-                        task_detail['remaining_time'] -= partial_time
-                        task_detail['completion_percentage'] += partial_completion
-                        break  # No more time for this day
+                    completed_tasks_count += 1
+                day_schedule['assigned_tasks'].append(assigned)
             
             schedule.append(day_schedule)
-            current_date += timedelta(days=1)
         
         # Count remaining unscheduled tasks
-        remaining_tasks_count = len([td for td in task_details if not td.get('scheduled', False)])
+        remaining_tasks_count = len(tasks) - completed_tasks_count
         
         # Calculate efficiency
         efficiency = 0.0
@@ -630,19 +562,29 @@ def can_complete_tasks_with_intensity(user, intensity_value, start_date=None, en
         }
 
 
-def find_minimum_intensity_for_completion(user, start_date=None, end_date=None, precision=0.01, max_iterations=50):
+@scheduler_timed
+def find_minimum_intensity_for_completion(user, start_date=None, end_date=None, precision=0.01, max_iterations=50, snapshot=None, solver='bisection', known_feasible=None):
     """
     Find the minimum intensity value needed to complete all tasks using get_optimal_daily_plan.
     
     This function uses binary search to efficiently find the lowest intensity value
     (between 0.0 and 1.0) that allows all tasks to be completed within the given time frame.
     
+    With solver='analytic' the search starts from a lower bound computed from the
+    cumulative remaining work per due date, and only simulates the few grid points
+    above it. It returns the same minimum intensity as the binary search.
+    
     Args:
         user: User instance (owner of the tasks)
         start_date (date, optional): Start date for scheduling (defaults to today)
         end_date (date, optional): End date for scheduling (defaults to 30 days from start)
         precision (float, optional): Search precision (defaults to 0.01)
         max_iterations (int, optional): Maximum number of binary search iterations (defaults to 50)
+        snapshot (TaskSnapshot, optional): Preloaded incomplete tasks (loaded with one query if omitted)
+        solver (str, optional): 'bisection' (default) or 'analytic'
+        known_feasible (float, optional): A minimum intensity found earlier for the same
+            tasks with less progress, which still completes them; the analytic solver only
+            searches below it
     
     Returns:
         dict: Result containing minimum intensity and analysis
@@ -657,15 +599,24 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
             - message (str): Human-readable result message
     """
     try:
+        if solver not in ('bisection', 'analytic'):
+            return {
+                'success': False,
+                'error': f"Unknown solver '{solver}'. Use 'bisection' or 'analytic'"
+            }
+        
         # Set default dates if not provided
         if start_date is None:
             start_date = timezone.now().date()
         if end_date is None:
             end_date = start_date + timedelta(days=30)
         
+        # Load the tasks once; every probe below runs against this snapshot
+        if snapshot is None:
+            snapshot = TaskSnapshot.for_user(user)
+        
         # Check if there are any tasks to complete
-        tasks = Task.objects.filter(user=user, is_completed=False)
-        if not tasks.exists():
+        if not len(snapshot):
             return {
                 'success': True,
                 'minimum_intensity': 0.0,
@@ -684,14 +635,20 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
         minimum_intensity = -1.0
         iterations_used = 0
         
+        # A known feasible intensity already shows completion is possible
+        if solver == 'analytic' and known_feasible is not None:
+            return _find_minimum_intensity_analytic(
+                user, snapshot, start_date, end_date, precision, max_iterations, known_feasible
+            )
+        
         # First, check if completion is possible at all (with intensity 1.0)
-        can_complete_with_max = _test_completion_across_period(user, 1.0, start_date, end_date)
+        can_complete_with_max = _test_completion_across_period(user, 1.0, start_date, end_date, snapshot)
         if not can_complete_with_max:
             return {
                 'success': True,
                 'minimum_intensity': -1.0,
                 'can_complete_all': False,
-                'total_tasks': len(tasks),
+                'total_tasks': len(snapshot),
                 'iterations_used': 0,
                 'precision_achieved': 0.0,
                 'search_range': {'low': 0.0, 'high': 1.0},
@@ -699,13 +656,18 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
                 'message': '❌ Impossible to complete all tasks even with maximum intensity (1.0)'
             }
         
+        if solver == 'analytic':
+            return _find_minimum_intensity_analytic(
+                user, snapshot, start_date, end_date, precision, max_iterations, known_feasible
+            )
+        
         # Binary search for minimum intensity
         while high_intensity - low_intensity > precision and iterations_used < max_iterations:
             iterations_used += 1
             mid_intensity = (low_intensity + high_intensity) / 2.0
             
             # Test if we can complete all tasks with this intensity
-            can_complete = _test_completion_across_period(user, mid_intensity, start_date, end_date)
+            can_complete = _test_completion_across_period(user, mid_intensity, start_date, end_date, snapshot)
             
             if can_complete:
                 # We can complete all tasks with this intensity
@@ -717,7 +679,7 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
         
         # Final verification with the found minimum intensity
         if minimum_intensity >= 0:
-            can_complete_all = _test_completion_across_period(user, minimum_intensity, start_date, end_date)
+            can_complete_all = _test_completion_across_period(user, minimum_intensity, start_date, end_date, snapshot)
             schedule_analysis = None  # We don't need detailed analysis for binary search
         else:
             # This shouldn't happen if we found that intensity 1.0 works
@@ -740,7 +702,7 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
             'success': True,
             'minimum_intensity': minimum_intensity,
             'can_complete_all': can_complete_all,
-            'total_tasks': len(tasks),
+            'total_tasks': len(snapshot),
             'iterations_used': iterations_used,
             'precision_achieved': precision_achieved,
             'search_range': {'low': low_intensity, 'high': high_intensity},
@@ -755,86 +717,113 @@ def find_minimum_intensity_for_completion(user, start_date=None, end_date=None,
         }
 
 
-def _test_completion_across_period(user, intensity, start_date, end_date):
+def _find_minimum_intensity_analytic(user, snapshot, start_date, end_date, precision, max_iterations,
+                                     known_feasible=None):
+    """
+    Analytic counterpart of the binary search in find_minimum_intensity_for_completion.
+    
+    The binary search can only return intensities on a grid of 1/2^n, where n is the
+    number of iterations it runs. This computes the same grid, starts at the lower
+    bound from TaskSnapshot.minimum_intensity_bound, and finds the first feasible grid
+    point with an exponential search followed by bisection. Feasibility is assumed to
+    be monotone in intensity, as the binary search does. Given a grid intensity known
+    to be feasible, the search stops there and the check at 1.0 is skipped.
+    """
+    # Reproduce the grid the binary search would end on
+    iterations = 0
+    width = 1.0
+    while width > precision and iterations < max_iterations:
+        iterations += 1
+        width /= 2.0
+    grid = 2 ** iterations
+    
+    probes_used = 0
+    
+    def feasible(step):
+        nonlocal probes_used
+        probes_used += 1
+        return _test_completion_across_period(user, step / grid, start_date, end_date, snapshot)
+    
+    bound = snapshot.minimum_intensity_bound(start_date, end_date)
+    if bound is None:
+        first_step = grid
+    else:
+        first_step = max(1, math.ceil(bound * grid - 1e-9))
+    
+    # Exponential search up from the bound for the first feasible grid point,
+    # up to a known feasible one if there is one
+    known_step = grid if known_feasible is None else max(first_step, round(known_feasible * grid))
+    last_infeasible = first_step - 1
+    first_feasible = None
+    offset = 0
+    while first_step + offset < known_step:
+        step = first_step + offset
+        if feasible(step):
+            first_feasible = step
+            break
+        last_infeasible = step
+        offset = offset * 2 + 1
+    else:
+        if known_feasible is not None:
+            first_feasible = known_step
+        elif last_infeasible < grid - 1 and feasible(grid - 1):
+            first_feasible = grid - 1
+    
+    if first_feasible is not None:
+        # Narrow down between the last infeasible and first feasible points
+        while first_feasible - last_infeasible > 1:
+            step = (last_infeasible + first_feasible) // 2
+            if feasible(step):
+                first_feasible = step
+            else:
+                last_infeasible = step
+        
+        minimum_intensity = first_feasible / grid
+        return {
+            'success': True,
+            'minimum_intensity': minimum_intensity,
+            'can_complete_all': True,
+            'total_tasks': len(snapshot),
+            'iterations_used': probes_used,
+            'precision_achieved': width,
+            'search_range': {'low': minimum_intensity - width, 'high': minimum_intensity},
+            'schedule_analysis': None,
+            'message': f"✅ Minimum intensity needed: {minimum_intensity:.3f} (found in {probes_used} iterations)"
+        }
+    
+    # Only intensity 1.0 works, which the binary search never probes
+    return {
+        'success': True,
+        'minimum_intensity': -1.0,
+        'can_complete_all': False,
+        'total_tasks': len(snapshot),
+        'iterations_used': probes_used,
+        'precision_achieved': width,
+        'search_range': {'low': 1.0 - width, 'high': 1.0},
+        'schedule_analysis': None,
+        'message': "❌ Could not find a valid minimum intensity"
+    }
+
+
+def _test_completion_across_period(user, intensity, start_date, end_date, snapshot=None):
     """
     Test if all tasks can be completed across the given period using the specified intensity.
-    Uses get_optimal_daily_plan to simulate daily scheduling.
+    Runs the greedy daily scheduling simulation against an in-memory task snapshot.
     """
     try:
-        # Get all incomplete tasks
-        tasks = Task.objects.filter(user=user, is_completed=False)
-        if not tasks.exists():
+        if snapshot is None:
+            snapshot = TaskSnapshot.for_user(user)
+        if not len(snapshot):
             return True
         
-        # Track task progress across the period
-        task_progress = {}
-        for task in tasks:
-            task_progress[task.id] = task.completed_so_far
-        
-        # Test each day in the period
-        current_date = start_date
-        while current_date <= end_date:
-            # Get tasks that should be worked on this date (due on or after current date, within next 7 days)
-            tasks_due_today = tasks.filter(
-                due_date__gte=current_date,
-                due_date__lte=current_date + timedelta(days=7)
-            )
-            
-            if tasks_due_today.exists():
-                # Filter out tasks that are already complete
-                incomplete_tasks = []
-                for task in tasks_due_today:
-                    if task_progress.get(task.id, 0.0) < 100.0:
-                        incomplete_tasks.append(task)
-                
-                if incomplete_tasks:
-                    # Test if we can schedule these tasks on this day
-                    # We'll simulate by checking if there's enough free time
-                    try:
-                        # Use get_free_today for today (realistic remaining time) and get_free_d for future days
-                        # Convert to user's timezone for accurate date comparison
-                        import pytz
-                        user_tz = pytz.timezone('America/Chicago')  # CDT timezone
-                        user_now = timezone.now().astimezone(user_tz)
-                        user_today = user_now.date()
-                        
-                        if current_date == user_today:
-                            day_free_time = TimeCalculation.get_free_today(intensity_value=intensity)
-                        else:
-                            day_free_time = TimeCalculation.get_free_d(current_date, intensity_value=intensity)
-                        
-                        # Simulate task scheduling
-                        remaining_time = day_free_time
-                        for task in incomplete_tasks:
-                            completion_percentage = task_progress.get(task.id, 0.0) / 100.0
-                            remaining_percentage = 1.0 - completion_percentage
-                            time_needed = task.T_n * remaining_percentage
-                            
-                            if time_needed <= remaining_time:
-                                # Complete the task
-                                task_progress[task.id] = 100.0
-                                remaining_time -= time_needed
-                            else:
-                                # Partial completion
-                                if remaining_time > timedelta(minutes=30):
-                                    partial_completion = remaining_time / task.T_n * 100
-                                    task_progress[task.id] = min(100.0, task_progress.get(task.id, 0.0) + partial_completion)
-                                    remaining_time = timedelta()
-                                    break
-                    except Exception:
-                        # If we can't calculate free time, assume we can't complete
-                        return False
-            
-            current_date += timedelta(days=1)
-        
-        # Check if all tasks are completed
-        all_completed = all(task_progress.get(task.id, 0.0) >= 100.0 for task in tasks)
-        return all_completed
+        return snapshot.can_complete(intensity, start_date, end_date)
         
     except Exception:
+        # If we can't calculate free time, assume we can't complete
         return False
 
 
+@scheduler_timed
 def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
     """
     Get optimal daily plan with intelligent task management.
@@ -867,12 +856,15 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
         if target_date is None:
             target_date = timezone.now().date()
         
+        availability = get_user_availability(user)
+        
         # Step 1: Find minimum intensity needed to complete all tasks
         print(f"🔍 Finding minimum intensity for all tasks...")
         min_intensity_result = find_minimum_intensity_for_completion(
             user=user,
             start_date=target_date,
-            end_date=target_date + timedelta(days=30)  # 30-day window
+            end_date=target_date + timedelta(days=30),  # 30-day window
+            snapshot=TaskSnapshot.for_user(user, availability)
         )
         
         if not min_intensity_result['success']:
@@ -890,7 +882,7 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
             print(f"   Minimum intensity needed: {minimum_intensity:.3f}")
             
             # Find tasks to recommend for removal
-            recommended_removals = _find_tasks_to_remove(user, max_intensity, target_date)
+            recommended_removals = _find_tasks_to_remove(user, max_intensity, target_date, availability)
             
             return {
                 'success': True,
@@ -910,7 +902,7 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
         
         # Try to find a plan with at least 2 tasks using the minimum intensity
         daily_plan = generate_daily_plan(
-            user, target_date, minimum_intensity, min_tasks=2
+            user, target_date, minimum_intensity, min_tasks=2, availability=availability
         )
         
         # If we can't get 2 tasks with minimum intensity, try with a higher intensity
@@ -919,20 +911,19 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
             print(f"   Trying with higher intensity to get 2+ tasks...")
             
             # Try with progressively higher intensities to get at least 2 tasks
-            from apps.core.intensity import get_intensity
-            global_intensity = get_intensity()
+            user_intensity = get_user_intensity(user)
             
-            # Create intensity range from global intensity to max_intensity
+            # Create intensity range from the user's intensity to max_intensity
             intensity_steps = 10
             intensity_range = []
             for i in range(intensity_steps + 1):
-                test_intensity = global_intensity + (max_intensity - global_intensity) * i / intensity_steps
+                test_intensity = user_intensity + (max_intensity - user_intensity) * i / intensity_steps
                 intensity_range.append(round(test_intensity, 2))
             
             for test_intensity in intensity_range:
                 if test_intensity >= minimum_intensity and test_intensity <= max_intensity:
                     daily_plan = generate_daily_plan(
-                        user, target_date, test_intensity, min_tasks=2
+                        user, target_date, test_intensity, min_tasks=2, availability=availability
                     )
                     if daily_plan:
                         print(f"   ✅ Found plan with {len(daily_plan)} tasks using intensity {test_intensity:.3f}")
@@ -943,7 +934,7 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
         if not daily_plan:
             print(f"   Fallback: trying with any number of tasks...")
             daily_plan = generate_daily_plan(
-                user, target_date, minimum_intensity, min_tasks=1
+                user, target_date, minimum_intensity, min_tasks=1, availability=availability
             )
         
         # Calculate total time allocated
@@ -972,312 +963,166 @@ def get_optimal_daily_plan(user, target_date=None, max_intensity=0.9):
         }
 
 
-def _find_tasks_to_remove(user, max_intensity, target_date):
+def _find_tasks_to_remove(user, max_intensity, target_date, availability=None):
     """
     Find tasks to recommend for removal to achieve intensity <= max_intensity.
     
     Uses a greedy approach to remove tasks with lowest priority and highest time requirements.
+    Candidate removals are evaluated in memory with RemovalWhatIf, binary-searching the
+    number of tasks to remove; the database is only read once. Without an availability
+    the default windows are used.
     """
     try:
-        # Get all incomplete tasks
-        tasks = Task.objects.filter(user=user, is_completed=False).order_by('delta', '-T_n')
+        # Get all incomplete tasks, in removal order
+        tasks_list = list(Task.objects.filter(user=user, is_completed=False).order_by('delta', '-T_n'))
         
-        if not tasks.exists():
+        if not tasks_list:
             return []
         
-        # Try removing tasks one by one until we can complete with acceptable intensity
-        tasks_list = list(tasks)
-        recommended_removals = []
-        
-        for i in range(len(tasks_list)):
-            # Test if we can complete remaining tasks with max_intensity
-            remaining_tasks = tasks_list[i:]
-            
-            # Temporarily mark removed tasks as completed for testing
-            removed_task_ids = [task.id for task in tasks_list[:i]]
-            Task.objects.filter(id__in=removed_task_ids).update(is_completed=True)
-            
-            try:
-                # Test completion with remaining tasks
-                result = can_complete_tasks_with_intensity(
-                    user, max_intensity, target_date, target_date + timedelta(days=30)
-                )
-                
-                if result['success'] and result['can_complete']:
-                    # We can complete with this set of removals
-                    recommended_removals = [
-                        {
-                            'task_id': task.id,
-                            'title': task.title,
-                            'priority': task.delta,
-                            'time_needed': str(task.T_n),
-                            'due_date': task.due_date,
-                            'reason': f'Low priority ({task.delta}) and high time requirement ({task.T_n})'
-                        }
-                        for task in tasks_list[:i]
-                    ]
-                    break
-                    
-            finally:
-                # Restore removed tasks
-                Task.objects.filter(id__in=removed_task_ids).update(is_completed=False)
+        what_if = RemovalWhatIf(
+            tasks_list, max_intensity, target_date, target_date + timedelta(days=30), availability=availability
+        )
+        removal_count = what_if.minimum_removals()
+        if removal_count is None:
+            return []
         
-        return recommended_removals
+        return [
+            {
+                'task_id': task.id,
+                'title': task.title,
+                'priority': task.delta,
+                'time_needed': str(task.T_n),
+                'due_date': task.due_date,
+                'reason': f'Low priority ({task.delta}) and high time requirement ({task.T_n})'
+            }
+            for task in tasks_list[:removal_count]
+        ]
         
     except Exception as e:
         print(f"Error finding tasks to remove: {e}")
         return []
 
 
-def generate_daily_plan_for_tasks_with_progress(user, target_date, intensity, tasks_to_schedule, task_progress, min_tasks=2):
+@scheduler_timed
+def generate_daily_plans(user, start_date, intensity, tasks_to_schedule, days=1, task_progress=None,
+                         min_tasks=2, availability=None):
+    """
+    Generate daily plans for consecutive days with a specific intensity.
+    
+    This is the single entry point behind the generate_daily_plan variants. Every
+    day gets a full day's free time (TimeCalculation.get_free_d, or the user's
+    availability windows), the tasks are filled in with planner.plan_days in one
+    pass over the horizon, and each day's allocations are placed into its free
+    intervals.
+    
+    Args:
+        user: User instance (owner of the tasks)
+        start_date (date): First day to plan
+        intensity (float): Intensity value between 0.0 and 1.0
+        tasks_to_schedule (list): Tasks to plan, in any order
+        days (int, optional): Number of days to plan (defaults to 1)
+        task_progress (dict, optional): Task id -> completion percentage to start from
+            (defaults to each task's completed_so_far); updated in place with the
+            progress after the last day
+        min_tasks (int, optional): Preferred minimum number of tasks per day (defaults to 2)
+        availability (Availability, optional): The user's availability (loaded if omitted)
+    
+    Returns:
+        list: One daily plan (list of task assignments) per day
+    """
+    if availability is None:
+        availability = get_user_availability(user)
+    capacity = CapacityCalendar(start_date, days, intensity, use_free_today=False, availability=availability)
+    day_intervals = availability.day_intervals(start_date, days)
+    
+    plans, progress = plan_days(
+        tasks_to_schedule, capacity.free_time, task_progress=task_progress, min_tasks=min_tasks
+    )
+    if task_progress is not None:
+        task_progress.update(progress)
+    
+    daily_plans = []
+    for allocations, intervals in zip(plans, day_intervals):
+        daily_plan = []
+        for allocation in allocations:
+            task = allocation['task']
+            item = {
+                'task_id': task.id,
+                'task_title': task.title,
+                'task_description': task.description,
+                'priority': task.delta,
+                'due_date': task.due_date,
+                'due_time': task.due_time,
+                'completion_before': allocation['completion_before'],
+                'time_allotted': allocation['time_allotted'],
+                'time_needed_total': str(task.T_n),
+                'completion_after': allocation['completion_after'],
+            }
+            if allocation['partial_completion']:
+                item['partial_completion'] = True
+            daily_plan.append(item)
+        daily_plans.append(place_day_plan(daily_plan, intervals))
+    return daily_plans
+
+
+@scheduler_timed
+def generate_daily_plan_for_tasks_with_progress(user, target_date, intensity, tasks_to_schedule, task_progress, min_tasks=2,
+                                                availability=None):
     """
     Generate daily plan with specific intensity for specific tasks, tracking progress across days.
+    task_progress is updated in place for the next day.
     """
     try:
-        # Get free time for the day with the given intensity
-        from apps.core.models import TimeCalculation
-        
-        # Use get_free_d for all dates to ensure consistent behavior
-        free_time = TimeCalculation.get_free_d(target_date, intensity_value=intensity)
-        
         if not tasks_to_schedule:
             return []
-        
-        daily_plan = []
-        remaining_time = free_time
-        tasks_scheduled = 0
-        
-        for task in tasks_to_schedule:
-            # Calculate remaining time needed for this task based on current progress
-            completion_percentage = task_progress.get(task.id, 0.0) / 100.0
-            remaining_percentage = 1.0 - completion_percentage
-            time_needed = task.T_n * remaining_percentage
-            
-            # Check if we can fit this task in today's free time
-            if time_needed <= remaining_time:
-                # Allocate full time needed to complete this task
-                new_progress = min(100.0, task_progress.get(task.id, 0.0) + (time_needed / task.T_n * 100))
-                
-                daily_plan.append({
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'task_description': task.description,
-                    'priority': task.delta,
-                    'due_date': task.due_date,
-                    'due_time': task.due_time,
-                    'completion_before': task_progress.get(task.id, 0.0),
-                    'time_allotted': time_needed,
-                    'time_needed_total': str(task.T_n),
-                    'completion_after': new_progress,
-                    'start_time': timezone.now().time(),
-                })
-                
-                remaining_time -= time_needed
-                tasks_scheduled += 1
-                
-                # Update task progress for next day
-                task_progress[task.id] = new_progress
-                
-                # If we have enough tasks and time is running low, we can stop
-                if tasks_scheduled >= min_tasks and remaining_time < timedelta(minutes=30):
-                    break
-            else:
-                # Check if we can partially complete this task
-                if remaining_time > timedelta(minutes=30) and tasks_scheduled < min_tasks:
-                    # Allocate remaining time to this task
-                    partial_completion = remaining_time / task.T_n * 100
-                    new_progress = min(100.0, task_progress.get(task.id, 0.0) + partial_completion)
-                    
-                    daily_plan.append({
-                        'task_id': task.id,
-                        'task_title': task.title,
-                        'task_description': task.description,
-                        'priority': task.delta,
-                        'due_date': task.due_date,
-                        'due_time': task.due_time,
-                        'completion_before': task_progress.get(task.id, 0.0),
-                        'time_allotted': remaining_time,
-                        'time_needed_total': str(task.T_n),
-                        'completion_after': new_progress,
-                        'start_time': timezone.now().time(),
-                        'partial_completion': True,
-                    })
-                    
-                    # Update task progress for next day
-                    task_progress[task.id] = new_progress
-                    
-                    remaining_time = timedelta()
-                    tasks_scheduled += 1
-                    break
-        
-        return daily_plan
+        return generate_daily_plans(
+            user, target_date, intensity, tasks_to_schedule,
+            task_progress=task_progress, min_tasks=min_tasks, availability=availability
+        )[0]
         
     except Exception as e:
         print(f"Error generating daily plan: {e}")
         return []
 
 
-def generate_daily_plan_for_tasks(user, target_date, intensity, tasks_to_schedule, min_tasks=2):
+@scheduler_timed
+def generate_daily_plan_for_tasks(user, target_date, intensity, tasks_to_schedule, min_tasks=2, availability=None):
     """
     Generate daily plan with specific intensity for specific tasks.
     """
     try:
-        # Get free time for the day with the given intensity
-        from apps.core.models import TimeCalculation
-        
-        # Use get_free_d for all dates to ensure consistent behavior
-        free_time = TimeCalculation.get_free_d(target_date, intensity_value=intensity)
-        
         if not tasks_to_schedule:
             return []
-        
-        daily_plan = []
-        remaining_time = free_time
-        tasks_scheduled = 0
-        
-        for task in tasks_to_schedule:
-            # Calculate remaining time needed for this task
-            completion_percentage = task.completed_so_far / 100.0
-            remaining_percentage = 1.0 - completion_percentage
-            time_needed = task.T_n * remaining_percentage
-            
-            # Check if we can fit this task in today's free time
-            if time_needed <= remaining_time:
-                # Allocate full time needed to complete this task
-                daily_plan.append({
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'task_description': task.description,
-                    'priority': task.delta,
-                    'due_date': task.due_date,
-                    'due_time': task.due_time,
-                    'completion_before': task.completed_so_far,
-                    'time_allotted': time_needed,
-                    'time_needed_total': str(task.T_n),
-                    'completion_after': min(100.0, task.completed_so_far + (time_needed / task.T_n * 100)),
-                    'start_time': timezone.now().time(),  # Could be improved with actual scheduling
-                })
-                
-                remaining_time -= time_needed
-                tasks_scheduled += 1
-                
-                # If we have enough tasks and time is running low, we can stop
-                if tasks_scheduled >= min_tasks and remaining_time < timedelta(minutes=30):
-                    break
-            else:
-                # Check if we can partially complete this task
-                if remaining_time > timedelta(minutes=30) and tasks_scheduled < min_tasks:
-                    # Allocate remaining time to this task
-                    daily_plan.append({
-                        'task_id': task.id,
-                        'task_title': task.title,
-                        'task_description': task.description,
-                        'priority': task.delta,
-                        'due_date': task.due_date,
-                        'due_time': task.due_time,
-                        'completion_before': task.completed_so_far,
-                        'time_allotted': remaining_time,
-                        'time_needed_total': str(task.T_n),
-                        'completion_after': min(100.0, task.completed_so_far + (remaining_time / task.T_n * 100)),
-                        'start_time': timezone.now().time(),
-                        'partial_completion': True,
-                    })
-                    
-                    remaining_time = timedelta()
-                    tasks_scheduled += 1
-                    break
-        
-        return daily_plan
+        return generate_daily_plans(
+            user, target_date, intensity, tasks_to_schedule, min_tasks=min_tasks, availability=availability
+        )[0]
         
     except Exception as e:
         print(f"Error generating daily plan: {e}")
         return []
 
 
-def generate_daily_plan(user, target_date, intensity, min_tasks=2):
+@scheduler_timed
+def generate_daily_plan(user, target_date, intensity, min_tasks=2, availability=None):
     """
     Generate daily plan with specific intensity, preferring plans with at least min_tasks.
     """
     try:
-        # Get free time for the day with the given intensity
-        from apps.core.models import TimeCalculation
-        
-        # Use get_free_d for all dates to ensure consistent behavior
-        free_time = TimeCalculation.get_free_d(target_date, intensity_value=intensity)
-        
-        # Get incomplete tasks sorted by priority and due date
-        tasks = Task.objects.filter(
-            user=user,
-            is_completed=False
-        ).order_by('due_date', 'due_time', '-delta')
-        
-        if not tasks.exists():
+        # Get incomplete tasks (ordered by due date, due time and priority by the planner)
+        tasks = list(Task.objects.filter(user=user, is_completed=False))
+        if not tasks:
             return []
-        
-        daily_plan = []
-        remaining_time = free_time
-        tasks_scheduled = 0
-        
-        for task in tasks:
-            # Calculate remaining time needed for this task
-            completion_percentage = task.completed_so_far / 100.0
-            remaining_percentage = 1.0 - completion_percentage
-            time_needed = task.T_n * remaining_percentage
-            
-            # Check if we can fit this task in today's free time
-            if time_needed <= remaining_time:
-                # Allocate full time needed to complete this task
-                daily_plan.append({
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'task_description': task.description,
-                    'priority': task.delta,
-                    'due_date': task.due_date,
-                    'due_time': task.due_time,
-                    'completion_before': task.completed_so_far,
-                    'time_allotted': time_needed,
-                    'time_needed_total': str(task.T_n),
-                    'completion_after': min(100.0, task.completed_so_far + (time_needed / task.T_n * 100)),
-                    'start_time': timezone.now().time(),  # Could be improved with actual scheduling
-                })
-                
-                remaining_time -= time_needed
-                tasks_scheduled += 1
-                
-                # If we have enough tasks and time is running low, we can stop
-                if tasks_scheduled >= min_tasks and remaining_time < timedelta(minutes=30):
-                    break
-            else:
-                # Check if we can partially complete this task
-                if remaining_time > timedelta(minutes=30) and tasks_scheduled < min_tasks:
-                    # Allocate remaining time to this task
-                    daily_plan.append({
-                        'task_id': task.id,
-                        'task_title': task.title,
-                        'task_description': task.description,
-                        'priority': task.delta,
-                        'due_date': task.due_date,
-                        'due_time': task.due_time,
-                        'completion_before': task.completed_so_far,
-                        'time_allotted': remaining_time,
-                        'time_needed_total': str(task.T_n),
-                        'completion_after': min(100.0, task.completed_so_far + (remaining_time / task.T_n * 100)),
-                        'start_time': timezone.now().time(),
-                        'partial_completion': True,
-                    })
-                    
-                    remaining_time = timedelta()
-                    tasks_scheduled += 1
-                    break
-        
-        return daily_plan
+        return generate_daily_plans(
+            user, target_date, intensity, tasks, min_tasks=min_tasks, availability=availability
+        )[0]
         
     except Exception as e:
         print(f"Error generating daily plan: {e}")
         return []
 
 
-def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
+@scheduler_timed
+def get_14_day_schedule(user, start_date=None, max_intensity=0.9, use_cache=True, intensity=None):
     """
     Generate a 14-day task schedule using get_optimal_daily_plan for each day.
     
@@ -1291,6 +1136,10 @@ def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
         user: User instance (owner of the tasks)
         start_date (date, optional): Start date for scheduling (defaults to today)
         max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+        use_cache (bool, optional): Serve and store the result in the per-user schedule
+            cache (defaults to True). Ignored when SCHEDULE_MATERIALIZED is enabled, in
+            which case the plan is read from the DailySchedule/TaskAssignment tables.
+        intensity (float, optional): The user's intensity (defaults to get_user_intensity(user))
     
     Returns:
         dict: Result containing:
@@ -1304,26 +1153,169 @@ def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
             - completion_analysis (dict): Analysis of task completion across the schedule
             - message (str): Human-readable result message
     """
+    # Set default start date to user's timezone
+    if start_date is None:
+        start_date = get_user_today()
+    if intensity is None:
+        intensity = get_user_intensity(user)
+    
+    if is_materialized_mode():
+        return get_materialized_schedule(user, start_date, max_intensity, intensity)
+    
+    if not use_cache:
+        return _generate_14_day_schedule(user, start_date, max_intensity, intensity=intensity)
+    
+    cache_key = get_schedule_cache_key(user.id, start_date, max_intensity, intensity)
+    schedule_result = get_cached_schedule(cache_key)
+    if schedule_result is not None:
+        return schedule_result
+    
+    return recompute_14_day_schedule(user, start_date, max_intensity, intensity=intensity)
+
+
+@scheduler_timed
+def recompute_14_day_schedule(user, start_date=None, max_intensity=0.9, tasks=None, intensity=None, availability=None,
+                              timeout=None):
+    """
+    Regenerate a user's 14-day schedule and store it where get_14_day_schedule
+    reads it: the materialized tables when SCHEDULE_MATERIALIZED is enabled,
+    otherwise the schedule cache.
+    
+    Args:
+        user: User instance (owner of the tasks)
+        start_date (date, optional): Start date for scheduling (defaults to today)
+        max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+        tasks (list, optional): The user's incomplete tasks ordered by due date, due time
+            and priority (loaded with one query if omitted)
+        intensity (float, optional): The user's intensity (defaults to get_user_intensity(user))
+        availability (Availability, optional): The user's availability (loaded if omitted)
+        timeout (int, optional): Seconds the stored schedule is served (defaults to
+            SCHEDULE_CACHE_TIMEOUT); see materialize_14_day_schedule for materialized plans
+    
+    Returns:
+        dict: The schedule result (see get_14_day_schedule)
+    """
+    if start_date is None:
+        start_date = get_user_today()
+    if intensity is None:
+        intensity = get_user_intensity(user)
+    
+    if is_materialized_mode():
+        return materialize_14_day_schedule(
+            user, start_date, max_intensity, tasks=tasks, intensity=intensity, availability=availability,
+            timeout=timeout
+        )
+    
+    # Read the version before generating so changes made meanwhile are not masked
+    version = get_task_set_version(user.id)
+    cache_key = get_schedule_cache_key(user.id, start_date, max_intensity, intensity)
+    schedule_result, state = _generate_14_day_schedule_state(
+        user, start_date, max_intensity, tasks, intensity, availability
+    )
+    if schedule_result['success']:
+        set_cached_schedule(cache_key, schedule_result, timeout)
+    if state is not None:
+        # Keep the replayable state so progress updates can patch the cached schedule
+        state.version = version
+        set_schedule_state(user.id, state, timeout)
+    return schedule_result
+
+
+def recompute_14_day_schedules(user_ids, start_date=None, max_intensity=0.9, timeout=None):
+    """
+    Recompute the 14-day schedules of several users, loading all of their
+    incomplete tasks, their intensities and their availabilities with a single
+    query each.
+    
+    Args:
+        user_ids (list): Ids of the users to recompute
+        start_date (date, optional): Start date for scheduling (defaults to today)
+        max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+        timeout (int, optional): Seconds the stored schedules are served (defaults to
+            SCHEDULE_CACHE_TIMEOUT)
+    
+    Returns:
+        list: One dict per user with user_id, success (bool) and seconds (float)
+    """
+    if start_date is None:
+        start_date = get_user_today()
+    
+    users = User.objects.in_bulk(user_ids)
+    intensities = get_user_intensities(list(users))
+    availabilities = get_user_availabilities(list(users))
+    tasks_by_user = {user_id: [] for user_id in users}
+    for task in Task.objects.filter(
+        user_id__in=list(users),
+        is_completed=False
+    ).order_by('due_date', 'due_time', '-delta'):
+        tasks_by_user[task.user_id].append(task)
+    
+    results = []
+    for user_id, user in users.items():
+        started = time.perf_counter()
+        try:
+            schedule_result = recompute_14_day_schedule(
+                user, start_date, max_intensity, tasks=tasks_by_user[user_id],
+                intensity=intensities[user_id], availability=availabilities[user_id], timeout=timeout
+            )
+            success = schedule_result['success']
+        except Exception as e:
+            logger.warning(f"Schedule recompute failed for user {user_id}: {e}")
+            success = False
+        results.append({
+            'user_id': user_id,
+            'success': success,
+            'seconds': time.perf_counter() - started,
+        })
+    return results
+
+
+def _generate_14_day_schedule(user, start_date, max_intensity=0.9, tasks=None, intensity=None, availability=None):
+    """
+    Generate the 14-day schedule from scratch, bypassing the cache.
+    See get_14_day_schedule for the result format.
+    """
+    return _generate_14_day_schedule_state(user, start_date, max_intensity, tasks, intensity, availability)[0]
+
+
+def _generate_14_day_schedule_state(user, start_date, max_intensity=0.9, tasks=None, intensity=None,
+                                    availability=None):
+    """
+    Generate the 14-day schedule from scratch.
+    
+    Args:
+        user: User instance (owner of the tasks)
+        start_date (date): First day of the schedule
+        max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+        tasks (list, optional): The user's incomplete tasks ordered by due date, due time
+            and priority (loaded with one query if omitted)
+        intensity (float, optional): The user's intensity (defaults to get_user_intensity(user))
+        availability (Availability, optional): The user's availability windows and blackouts
+            (loaded with one query if omitted)
+    
+    Returns:
+        tuple: (schedule result, IncrementalSchedule or None when there was nothing to
+            schedule or the generation failed)
+    """
     try:
-        # Set default start date to user's timezone
-        if start_date is None:
-            import pytz
-            user_tz = pytz.timezone('America/Chicago')  # CDT timezone
-            user_now = timezone.now().astimezone(user_tz)
-            start_date = user_now.date()
-        
         end_date = start_date + timedelta(days=13)  # 14 days total (0-13)
+        if intensity is None:
+            intensity = get_user_intensity(user)
+        if availability is None:
+            availability = get_user_availability(user)
         
         print(f"🗓️ Generating 14-day schedule from {start_date} to {end_date}")
         
-        # Get all incomplete tasks
-        all_tasks = Task.objects.filter(
-            user=user,
-            is_completed=False
-        ).order_by('due_date', 'due_time', '-delta')
+        # Get all incomplete tasks (single query; everything below works on this list)
+        if tasks is None:
+            tasks = Task.objects.filter(
+                user=user,
+                is_completed=False
+            ).order_by('due_date', 'due_time', '-delta')
+        tasks_list = list(tasks)
         
-        if not all_tasks.exists():
-            return {
+        if not tasks_list:
+            return ({
                 'success': True,
                 'schedule': [[] for _ in range(14)],
                 'total_days': 14,
@@ -1338,10 +1330,7 @@ def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
                     'completion_rate': 1.0
                 },
                 'message': 'No tasks to schedule - empty 14-day schedule generated'
-            }
-        
-        # Convert tasks to a list for processing
-        tasks_list = list(all_tasks)
+            }, None)
         
         # Mark tasks past due date as completed (100% progress)
         today = timezone.now().date()
@@ -1370,7 +1359,8 @@ def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
             min_intensity_result = find_minimum_intensity_for_completion(
                 user=user,
                 start_date=start_date,
-                end_date=latest_due_date  # Use actual task deadlines, not fixed 14 days
+                end_date=latest_due_date,  # Use actual task deadlines, not fixed 14 days
+                snapshot=TaskSnapshot(incomplete_tasks, availability)
             )
         else:
             print(f"✅ All tasks are completed, no minimum intensity needed")
@@ -1388,183 +1378,58 @@ def get_14_day_schedule(user, start_date=None, max_intensity=0.9):
         
         if not min_intensity_result['success']:
             print(f"❌ Error finding minimum intensity: {min_intensity_result.get('error', 'Unknown')}")
-            return {
+            return ({
                 'success': False,
                 'error': f"Error finding minimum intensity: {min_intensity_result.get('error', 'Unknown')}"
-            }
+            }, None)
         
         minimum_intensity = min_intensity_result['minimum_intensity']
         true_minimum_required_intensity = minimum_intensity  # Store the true minimum required intensity before any modifications
         print(f"✅ Minimum intensity found: {minimum_intensity:.3f}")
 
-        # Use current global intensity if it's higher than minimum required
-        intensity_info = get_intensity_info()
+        # Use the user's intensity if it's higher than minimum required
+        intensity_info = get_intensity_info(intensity)
         current_intensity = intensity_info['intensityXcap']  # Use the calculated intensity cap
         minimum_intensity = max(minimum_intensity, current_intensity)
         
-        # Track task progress across the 14-day schedule
-        task_progress = {}
-        for task in tasks_list:
-            task_progress[task.id] = task.completed_so_far
+        # Fill the 14 days with the same greedy algorithm the intensity search simulates
+        state = IncrementalSchedule(
+            incomplete_tasks,
+            start_date,
+            intensity=minimum_intensity,
+            minimum_required_intensity=true_minimum_required_intensity,
+            cap_intensity=current_intensity,
+            total_tasks=len(tasks_list),
+            max_intensity=max_intensity,
+            user_intensity=intensity,
+            availability=availability,
+        )
+        schedule_result = state.result()
         
-        # Process each day using the exact same algorithm as binary search
-        for day_index in range(14):
+        for day_index, daily_plan in enumerate(schedule_result['schedule']):
             current_date = start_date + timedelta(days=day_index)
-            print(f"📅 Processing day {day_index + 1}: {current_date}")
-            
-            # For 14-day schedule, we want to distribute tasks across all 14 days
-            # Get all incomplete tasks that are due on or after this date
-            day_incomplete_tasks = []
-            for task in incomplete_tasks:
-                if task_progress.get(task.id, 0.0) < 100.0 and task.due_date >= current_date:
-                    day_incomplete_tasks.append(task)
-            
-            print(f"   🔍 Incomplete tasks: {len(day_incomplete_tasks)}")
-            for task in day_incomplete_tasks:
-                print(f"      • {task.title} (due: {task.due_date}, progress: {task_progress.get(task.id, 0.0):.1f}%)")
-            
-            if not day_incomplete_tasks:
-                print(f"   ⚠️ No incomplete tasks to schedule for {current_date}")
-                intensity_values.append(0.0)
-                continue
-            
-            try:
-                # Use get_free_today for today (realistic remaining time) and get_free_d for future days
-                # Convert to user's timezone for accurate date comparison
-                import pytz
-                user_tz = pytz.timezone('America/Chicago')  # CDT timezone
-                user_now = timezone.now().astimezone(user_tz)
-                user_today = user_now.date()
-                
-                if current_date == user_today:
-                    day_free_time = TimeCalculation.get_free_today(intensity_value=minimum_intensity)
-                else:
-                    day_free_time = TimeCalculation.get_free_d(current_date, intensity_value=minimum_intensity)
-                
-                # Simulate task scheduling using the same logic as binary search
-                remaining_time = day_free_time
-                daily_plan = []
-                
-                for task in day_incomplete_tasks:
-                    completion_percentage = task_progress.get(task.id, 0.0) / 100.0
-                    remaining_percentage = 1.0 - completion_percentage
-                    time_needed = task.T_n * remaining_percentage
-                    
-                    if time_needed <= remaining_time:
-                        # Complete the task
-                        new_progress = 100.0
-                        daily_plan.append({
-                            'task_id': task.id,
-                            'task_title': task.title,
-                            'task_description': task.description,
-                            'priority': task.delta,
-                            'due_date': task.due_date,
-                            'due_time': task.due_time,
-                            'completion_before': task_progress.get(task.id, 0.0),
-                            'time_allotted': time_needed,
-                            'time_needed_total': str(task.T_n),
-                            'completion_after': new_progress,
-                            'start_time': timezone.now().time(),
-                        })
-                        
-                        remaining_time -= time_needed
-                        task_progress[task.id] = new_progress
-                        
-                    else:
-                        # Partial completion - schedule work if there's any meaningful time left
-                        if remaining_time > timedelta(minutes=15):
-                            current_progress = task_progress.get(task.id, 0.0)
-                            partial_completion = remaining_time / task.T_n * 100
-                            new_progress = min(100.0, current_progress + partial_completion)
-                            
-                            daily_plan.append({
-                                'task_id': task.id,
-                                'task_title': task.title,
-                                'task_description': task.description,
-                                'priority': task.delta,
-                                'due_date': task.due_date,
-                                'due_time': task.due_time,
-                                'completion_before': current_progress,
-                                'time_allotted': remaining_time,
-                                'time_needed_total': str(task.T_n),
-                                'completion_after': new_progress,
-                                'start_time': timezone.now().time(),
-                                'partial_completion': True,
-                            })
-                            
-                            task_progress[task.id] = new_progress
-                            remaining_time = timedelta()
-                            break
-                
-                if daily_plan:
-                    schedule[day_index] = daily_plan
-                    total_tasks_scheduled += len(daily_plan)
-                    intensity_values.append(minimum_intensity)
-                    
-                    print(f"   ✅ Scheduled {len(daily_plan)} tasks with intensity {minimum_intensity:.3f}")
-                    
-                    # Show what was scheduled
-                    for task in daily_plan:
-                        print(f"      • {task['task_title']} ({task['time_allotted']}) - Progress: {task['completion_after']:.1f}%")
-                    
-                else:
-                    print(f"   ⚠️ No tasks scheduled for {current_date}")
-                    intensity_values.append(0.0)
-                    
-            except Exception as e:
-                print(f"   ❌ Error processing day {current_date}: {e}")
-                intensity_values.append(0.0)
-        
-        
-        # No need to restore task progress since we're not modifying task completion status
-        
-        # Calculate completion analysis
-        scheduled_task_ids = set()
-        for day_schedule in schedule:
-            for task in day_schedule:
-                scheduled_task_ids.add(task['task_id'])
-
-        total_tasks = len(tasks_list)
-        scheduled_tasks = len(scheduled_task_ids)
-        remaining_tasks = total_tasks - scheduled_tasks
-        completion_rate = scheduled_tasks / total_tasks if total_tasks > 0 else 1.0
-        
-        # Tasks remain in their original completion status
-        
-        # Calculate average intensity
-        avg_intensity = sum(intensity_values) / len(intensity_values) if intensity_values else 0.0
+            if daily_plan:
+                print(f"📅 Day {day_index + 1} ({current_date}): scheduled {len(daily_plan)} tasks with intensity {minimum_intensity:.3f}")
+                for task in daily_plan:
+                    print(f"      • {task['task_title']} ({task['time_allotted']}) - Progress: {task['completion_after']:.1f}%")
+            else:
+                print(f"📅 Day {day_index + 1} ({current_date}): no tasks scheduled")
         
         # Generate summary
+        analysis = schedule_result['completion_analysis']
         print(f"\n📊 14-DAY SCHEDULE SUMMARY:")
-        print(f"   Total tasks scheduled: {total_tasks_scheduled}")
-        print(f"   Tasks scheduled: {scheduled_tasks}/{total_tasks} ({completion_rate:.1%})")
-        print(f"   Average intensity: {avg_intensity:.3f}")
-        print(f"   Days with tasks: {sum(1 for day in schedule if day)}/14")
+        print(f"   Total tasks scheduled: {schedule_result['total_tasks_scheduled']}")
+        print(f"   Tasks scheduled: {analysis['completed_tasks']}/{analysis['total_tasks']} ({analysis['completion_rate']:.1%})")
+        print(f"   Average intensity: {schedule_result['intensity_used']:.3f}")
+        print(f"   Days with tasks: {sum(1 for day in schedule_result['schedule'] if day)}/14")
         
-        return {
-            'success': True,
-            'schedule': schedule,
-            'total_days': 14,
-            'start_date': start_date,
-            'end_date': end_date,
-            'total_tasks_scheduled': total_tasks_scheduled,
-            'intensity_used': avg_intensity,
-            'minimum_required_intensity': true_minimum_required_intensity,  # Use the true minimum required intensity
-            'intensity_used_for_scheduling': minimum_intensity,  # The intensity actually used for scheduling
-            'completion_analysis': {
-                'total_tasks': total_tasks,
-                'completed_tasks': scheduled_tasks,
-                'remaining_tasks': remaining_tasks,
-                'completion_rate': completion_rate
-            },
-            'message': f"✅ 14-day schedule generated with {total_tasks_scheduled} tasks scheduled across {sum(1 for day in schedule if day)} days"
-        }
+        return schedule_result, state
         
     except Exception as e:
-        return {
+        return ({
             'success': False,
             'error': f'An error occurred while generating 14-day schedule: {str(e)}'
-        }
+        }, None)
 
 
 def create_task(user, name, priority, due_date, expected_time, progress_so_far=0.0, description=""):
@@ -1634,31 +1499,73 @@ def create_task(user, name, priority, due_date, expected_time, progress_so_far=0
         }
 
 
-def get_tasks_for_date(user, target_date, max_intensity=0.9):
+# Longest range get_tasks_for_date_range accepts
+MAX_RANGE_DAYS = 62
+
+
+def _round_day_tasks(day_tasks):
     """
-    Get tasks scheduled for a specific date by generating a 14-day schedule.
+    Round every task's time_allotted up to 5-minute blocks, keeping the
+    original as time_allotted_original
+    """
+    rounded_tasks = []
+    for task in day_tasks:
+        rounded_task = task.copy()
+        if isinstance(task.get('time_allotted'), timedelta):
+            rounded_task['time_allotted'] = round_to_5_min_blocks(task['time_allotted'], round_up=True)
+            rounded_task['time_allotted_original'] = task['time_allotted']  # Keep original for reference
+        rounded_tasks.append(rounded_task)
+    return rounded_tasks
+
+
+def _total_time(day_tasks):
+    total_time = timedelta()
+    for task in day_tasks:
+        if isinstance(task.get('time_allotted'), timedelta):
+            total_time += task['time_allotted']
+    return total_time
+
+
+@scheduler_timed
+def get_tasks_for_date_range(user, start_date, end_date, max_intensity=0.9, round_to_5min=True):
+    """
+    Get the tasks scheduled for every date of a range from one 14-day schedule.
     
-    This function generates a 14-day schedule starting from today and returns
-    the tasks scheduled for the target date within that schedule.
+    The 14-day schedule starting today is computed (or read from the cache) once
+    and sliced for each date, so a week view costs one scheduler run instead of
+    seven. Dates outside the schedule get no tasks.
     
     Args:
         user: User instance (owner of the tasks)
-        target_date (date): The date to get tasks for
+        start_date (date): First date of the range
+        end_date (date): Last date of the range (inclusive)
         max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+        round_to_5min (bool, optional): Whether to round times to 5-minute blocks (defaults to True)
     
     Returns:
         dict: Result containing:
             - success (bool): Whether the operation completed successfully
-            - target_date (date): The date requested
-            - tasks (list): List of tasks scheduled for the target date
-            - total_tasks (int): Number of tasks scheduled for the date
-            - total_time (str): Total time allocated for the date
-            - intensity_used (float): Intensity used for the date
+            - start_date (date): First date of the range
+            - end_date (date): Last date of the range
+            - days (list): One entry per date with date, tasks, total_tasks, total_time
+              and, when rounding, total_time_original
+            - total_tasks (int): Number of tasks scheduled across the range
+            - intensity_used (float): Average intensity of the 14-day schedule
             - schedule_info (dict): Information about the full 14-day schedule
             - message (str): Human-readable result message
     """
     try:
-        print(f"📅 Getting tasks for {target_date}")
+        if end_date < start_date:
+            return {
+                'success': False,
+                'error': 'end_date must not be before start_date'
+            }
+        range_days = (end_date - start_date).days + 1
+        if range_days > MAX_RANGE_DAYS:
+            return {
+                'success': False,
+                'error': f'Date ranges are limited to {MAX_RANGE_DAYS} days'
+            }
         
         # Generate 14-day schedule starting from today
         today = timezone.now().date()
@@ -1670,68 +1577,81 @@ def get_tasks_for_date(user, target_date, max_intensity=0.9):
                 'error': f"Error generating 14-day schedule: {schedule_result.get('error', 'Unknown error')}"
             }
         
-        # Calculate the day index for the target date
-        days_difference = (target_date - today).days
-        
-        # Check if target date is within the 14-day schedule
-        if days_difference < 0 or days_difference >= 14:
-            return {
-                'success': True,
-                'target_date': target_date,
-                'tasks': [],
-                'total_tasks': 0,
-                'total_time': '0:00:00',
-                'intensity_used': 0.0,
-                'schedule_info': {
-                    'start_date': schedule_result['start_date'],
-                    'end_date': schedule_result['end_date'],
-                    'total_tasks_scheduled': schedule_result['total_tasks_scheduled'],
-                    'completion_rate': schedule_result['completion_analysis']['completion_rate']
-                },
-                'message': f"📅 Target date {target_date} is outside the 14-day schedule range ({today} to {today + timedelta(days=13)})"
-            }
-        
-        # Get tasks for the target date (using the calculated day index)
-        day_tasks = schedule_result['schedule'][days_difference] if schedule_result['schedule'] else []
-        
-        # Calculate total time for the day
-        total_time = timedelta()
-        for task in day_tasks:
-            if isinstance(task.get('time_allotted'), timedelta):
-                total_time += task['time_allotted']
-        
-        # Get intensity used for the day (we'll use the average from the schedule)
-        intensity_used = schedule_result['intensity_used']
-        
-        # Format the response
-        if day_tasks:
-            message = f"✅ Found {len(day_tasks)} tasks scheduled for {target_date}"
-        else:
-            message = f"📅 No tasks scheduled for {target_date} - it's a free day!"
+        schedule = schedule_result['schedule']
+        days = []
+        for day_offset in range(range_days):
+            current_date = start_date + timedelta(days=day_offset)
+            day_index = (current_date - today).days
+            day_tasks = schedule[day_index] if 0 <= day_index < len(schedule) else []
+            
+            day = {'date': current_date}
+            if round_to_5min:
+                day['total_time_original'] = str(_total_time(day_tasks))
+                day_tasks = _round_day_tasks(day_tasks)
+            day.update({
+                'tasks': day_tasks,
+                'total_tasks': len(day_tasks),
+                'total_time': str(_total_time(day_tasks)),
+            })
+            days.append(day)
         
+        total_tasks = sum(day['total_tasks'] for day in days)
         return {
             'success': True,
-            'target_date': target_date,
-            'tasks': day_tasks,
-            'total_tasks': len(day_tasks),
-            'total_time': str(total_time),
-            'intensity_used': intensity_used,
+            'start_date': start_date,
+            'end_date': end_date,
+            'days': days,
+            'total_tasks': total_tasks,
+            'intensity_used': schedule_result['intensity_used'],
             'schedule_info': {
                 'start_date': schedule_result['start_date'],
                 'end_date': schedule_result['end_date'],
                 'total_tasks_scheduled': schedule_result['total_tasks_scheduled'],
                 'completion_rate': schedule_result['completion_analysis']['completion_rate']
             },
-            'message': message
+            'message': f"✅ Found {total_tasks} tasks scheduled from {start_date} to {end_date}"
         }
         
     except Exception as e:
         return {
             'success': False,
-            'error': f'An error occurred while getting tasks for date: {str(e)}'
+            'error': f'An error occurred while getting tasks for date range: {str(e)}'
         }
 
 
+@scheduler_timed
+def get_tasks_for_date(user, target_date, max_intensity=0.9):
+    """
+    Get tasks scheduled for a specific date by generating a 14-day schedule.
+    
+    This function generates a 14-day schedule starting from today and returns
+    the tasks scheduled for the target date within that schedule. Use
+    get_tasks_for_date_range to fetch several dates at once.
+    
+    Args:
+        user: User instance (owner of the tasks)
+        target_date (date): The date to get tasks for
+        max_intensity (float, optional): Maximum acceptable intensity (defaults to 0.9)
+    
+    Returns:
+        dict: Result containing:
+            - success (bool): Whether the operation completed successfully
+            - target_date (date): The date requested
+            - tasks (list): List of tasks scheduled for the target date
+            - total_tasks (int): Number of tasks scheduled for the date
+            - total_time (str): Total time allocated for the date
+            - intensity_used (float): Intensity used for the date
+            - schedule_info (dict): Information about the full 14-day schedule
+            - message (str): Human-readable result message
+    """
+    print(f"📅 Getting tasks for {target_date}")
+    return _single_date_result(
+        get_tasks_for_date_range(user, target_date, target_date, max_intensity=max_intensity, round_to_5min=False),
+        target_date
+    )
+
+
+@scheduler_timed
 def get_tasks_for_date_with_rounding(user, target_date, max_intensity=0.9, round_to_5min=True):
     """
     Get tasks scheduled for a specific date with optional 5-minute rounding.
@@ -1758,100 +1678,47 @@ def get_tasks_for_date_with_rounding(user, target_date, max_intensity=0.9, round
             - schedule_info (dict): Information about the full 14-day schedule
             - message (str): Human-readable result message
     """
-    try:
-        print(f"📅 Getting tasks for {target_date} (rounding: {'enabled' if round_to_5min else 'disabled'})")
-        
-        # Generate 14-day schedule starting from today
-        today = timezone.now().date()
-        schedule_result = get_14_day_schedule(user, start_date=today, max_intensity=max_intensity)
-        
-        if not schedule_result['success']:
-            return {
-                'success': False,
-                'error': f"Error generating 14-day schedule: {schedule_result.get('error', 'Unknown error')}"
-            }
-        
-        # Calculate the day index for the target date
-        days_difference = (target_date - today).days
-        
-        # Check if target date is within the 14-day schedule
-        if days_difference < 0 or days_difference >= 14:
-            return {
-                'success': True,
-                'target_date': target_date,
-                'tasks': [],
-                'total_tasks': 0,
-                'total_time': '0:00:00',
-                'intensity_used': 0.0,
-                'schedule_info': {
-                    'start_date': schedule_result['start_date'],
-                    'end_date': schedule_result['end_date'],
-                    'total_tasks_scheduled': schedule_result['total_tasks_scheduled'],
-                    'completion_rate': schedule_result['completion_analysis']['completion_rate']
-                },
-                'message': f"📅 Target date {target_date} is outside the 14-day schedule range ({today} to {today + timedelta(days=13)})"
-            }
-        
-        # Get tasks for the target date (using the calculated day index)
-        day_tasks = schedule_result['schedule'][days_difference] if schedule_result['schedule'] else []
-        
-        # Calculate original total time
-        original_total_time = timedelta()
-        for task in day_tasks:
-            if isinstance(task.get('time_allotted'), timedelta):
-                original_total_time += task['time_allotted']
-        
-        # Apply 5-minute rounding if requested
-        if round_to_5min and day_tasks:
-            rounded_tasks = []
-            for task in day_tasks:
-                rounded_task = task.copy()
-                if isinstance(task.get('time_allotted'), timedelta):
-                    rounded_task['time_allotted'] = round_to_5_min_blocks(task['time_allotted'], round_up=True)
-                    rounded_task['time_allotted_original'] = task['time_allotted']  # Keep original for reference
-                rounded_tasks.append(rounded_task)
-            day_tasks = rounded_tasks
-        
-        # Calculate total time (rounded if applicable)
-        total_time = timedelta()
-        for task in day_tasks:
-            if isinstance(task.get('time_allotted'), timedelta):
-                total_time += task['time_allotted']
-        
-        # Get intensity used for the day
-        intensity_used = schedule_result['intensity_used']
-        
-        # Format the response
-        if day_tasks:
-            rounding_note = " (times rounded to 5-minute blocks)" if round_to_5min else ""
-            message = f"✅ Found {len(day_tasks)} tasks scheduled for {target_date}{rounding_note}"
-        else:
-            message = f"📅 No tasks scheduled for {target_date} - it's a free day!"
-        
-        result = {
-            'success': True,
-            'target_date': target_date,
-            'tasks': day_tasks,
-            'total_tasks': len(day_tasks),
-            'total_time': str(total_time),
-            'intensity_used': intensity_used,
-            'schedule_info': {
-                'start_date': schedule_result['start_date'],
-                'end_date': schedule_result['end_date'],
-                'total_tasks_scheduled': schedule_result['total_tasks_scheduled'],
-                'completion_rate': schedule_result['completion_analysis']['completion_rate']
-            },
-            'message': message
-        }
-        
-        # Add original time if rounding was applied
-        if round_to_5min:
-            result['total_time_original'] = str(original_total_time)
-        
-        return result
-        
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'An error occurred while getting tasks for date: {str(e)}'
-        }
+    print(f"📅 Getting tasks for {target_date} (rounding: {'enabled' if round_to_5min else 'disabled'})")
+    result = _single_date_result(
+        get_tasks_for_date_range(
+            user, target_date, target_date, max_intensity=max_intensity, round_to_5min=round_to_5min
+        ),
+        target_date
+    )
+    if result['success'] and result['tasks'] and round_to_5min:
+        result['message'] += " (times rounded to 5-minute blocks)"
+    return result
+
+
+def _single_date_result(range_result, target_date):
+    """
+    Shape a one-day get_tasks_for_date_range result like get_tasks_for_date's
+    """
+    if not range_result['success']:
+        return range_result
+    
+    day = range_result['days'][0]
+    schedule_info = range_result['schedule_info']
+    result = {
+        'success': True,
+        'target_date': target_date,
+        'tasks': day['tasks'],
+        'total_tasks': day['total_tasks'],
+        'total_time': day['total_time'],
+        'intensity_used': range_result['intensity_used'],
+        'schedule_info': schedule_info,
+    }
+    if 'total_time_original' in day:
+        result['total_time_original'] = day['total_time_original']
+    
+    if not schedule_info['start_date'] <= target_date <= schedule_info['end_date']:
+        result['intensity_used'] = 0.0
+        result['message'] = (
+            f"📅 Target date {target_date} is outside the 14-day schedule range "
+            f"({schedule_info['start_date']} to {schedule_info['end_date']})"
+        )
+    elif day['tasks']:
+        result['message'] = f"✅ Found {len(day['tasks'])} tasks scheduled for {target_date}"
+    else:
+        result['message'] = f"📅 No tasks scheduled for {target_date} - it's a free day!"
+    return result
@@ -1,3 +1,1163 @@
-from django.test import TestCase
+import io
+import json
+import random
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, time, timedelta
+from importlib import import_module
+from unittest import mock
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-# Create your tests here.
+from apps.core.availability import set_user_availability
+from apps.core.intensity import set_intensity, set_user_intensity
+from apps.core.time_utils import TimeManager
+from .batch import evaluate_schedule_batch, sweep_intensities
+from .incremental import IncrementalSchedule, apply_progress_update
+from .materialize import load_materialized_schedule, materialize_14_day_schedule
+from .planner import plan_days
+from .schedule_cache import get_schedule_state, get_task_set_version, invalidate_user_schedule
+from .models import DailySchedule, DailyStatistics, Task, TaskAssignment
+from .simulation import TaskSnapshot, get_user_today
+from .stats_rollup import rebuild_daily_statistics
+from .whatif import RemovalWhatIf
+from .task_utils import (
+    _find_tasks_to_remove,
+    _generate_14_day_schedule,
+    _generate_14_day_schedule_state,
+    _test_completion_across_period,
+    can_complete_tasks_with_intensity,
+    can_complete_tasks_with_intensity_simulation,
+    find_minimum_intensity_for_completion,
+    generate_daily_plan,
+    generate_daily_plan_for_tasks_with_progress,
+    get_14_day_schedule,
+    get_tasks_for_date_range,
+    get_tasks_for_date_with_rounding,
+    recompute_14_day_schedules,
+)
+
+
+class SchedulerTestMixin:
+    """Helpers for building task sets relative to a future start date"""
+
+    def setUp(self):
+        # Also drops cached intensity values from earlier tests' rolled back rows
+        cache.clear()
+        self.user = User.objects.create_user(username='scheduler_test')
+        # Start tomorrow so the time-of-day dependent "today" capacity is never used
+        self.start_date = timezone.now().date() + timedelta(days=2)
+
+    def make_task(self, title, hours, due_in_days, delta=3, progress=0.0):
+        return Task.objects.create(
+            user=self.user,
+            title=title,
+            T_n=timedelta(hours=hours),
+            completed_so_far=progress,
+            delta=delta,
+            due_date=self.start_date + timedelta(days=due_in_days),
+            due_time=time(17, 0),
+        )
+
+
+class TaskIndexTests(SchedulerTestMixin, TestCase):
+
+    def explain(self, queryset):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan assertions are written for SQLite')
+        return queryset.explain()
+
+    def test_scheduler_query_uses_open_task_index(self):
+        plan = self.explain(Task.objects.filter(user=self.user, is_completed=False))
+
+        self.assertIn('task_user_open_due_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_completed_by_day_query_is_an_index_range_scan(self):
+        day_start, day_end = TimeManager.get_day_bounds(self.start_date)
+        plan = self.explain(Task.objects.filter(
+            user=self.user, is_completed=True, updated_at__gte=day_start, updated_at__lt=day_end
+        ).order_by())
+
+        self.assertIn('task_user_done_updated_idx', plan)
+        self.assertIn('updated_at>? AND updated_at<?', plan.replace('"', ''))
+
+    def test_created_by_day_query_uses_index(self):
+        day_start, day_end = TimeManager.get_day_bounds(self.start_date)
+        plan = self.explain(Task.objects.filter(
+            user=self.user, created_at__gte=day_start, created_at__lt=day_end
+        ).order_by())
+
+        self.assertIn('task_user_created_idx', plan)
+
+    def test_day_bounds_match_date_lookup(self):
+        task = self.make_task('Essay', 2, 1)
+        day = timezone.localdate(task.created_at)
+        day_start, day_end = TimeManager.get_day_bounds(day)
+
+        self.assertEqual(
+            list(Task.objects.filter(created_at__date=day)),
+            list(Task.objects.filter(created_at__gte=day_start, created_at__lt=day_end)),
+        )
+
+
+class TaskListTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='demo_user')
+        today = timezone.now().date()
+        for index in range(7):
+            Task.objects.create(
+                user=self.user, title=f'Task {index}', T_n=timedelta(hours=1), delta=index % 3 + 1,
+                due_date=today + timedelta(days=index % 3), due_time=time(17, 0),
+            )
+
+    def test_cursor_pages_cover_the_list_in_order(self):
+        everything = self.client.get('/api/study/tasks/').json()['tasks']
+
+        pages, cursor = [], None
+        while True:
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.client.get('/api/study/tasks/', params).json()
+            pages.extend(page['tasks'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, everything)
+        self.assertEqual(
+            [(task['due_date'], -task['delta'], task['id']) for task in pages],
+            sorted((task['due_date'], -task['delta'], task['id']) for task in pages)
+        )
+
+    def test_streamed_response_matches_regular_response(self):
+        regular = self.client.get('/api/study/tasks/', {'limit': 4}).json()
+
+        response = self.client.get('/api/study/tasks/', {'limit': 4, 'stream': 'true'})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), regular)
+
+    def test_daily_schedules_are_paged_by_date(self):
+        today = timezone.now().date()
+        for offset in range(5):
+            DailySchedule.objects.create(user=self.user, date=today + timedelta(days=offset))
+
+        first = self.client.get('/api/study/daily-schedules/', {'limit': 3}).json()
+        second = self.client.get('/api/study/daily-schedules/', {'limit': 3, 'cursor': first['next_cursor']}).json()
+
+        dates = [schedule['date'] for schedule in first['schedules'] + second['schedules']]
+        self.assertEqual(dates, [(today + timedelta(days=offset)).isoformat() for offset in range(4, -1, -1)])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/study/tasks/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskBulkTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='demo_user')
+        today = timezone.now().date()
+        self.tasks = [
+            Task.objects.create(
+                user=self.user, title=f'Task {index}', T_n=timedelta(hours=2), delta=3,
+                due_date=today + timedelta(days=index + 1), due_time=time(17, 0),
+            )
+            for index in range(3)
+        ]
+        self.due_date = (today + timedelta(days=5)).isoformat()
+
+    def post(self, batch):
+        return self.client.post('/api/study/tasks/bulk/', batch, content_type='application/json')
+
+    def statistics(self):
+        return list(
+            DailyStatistics.objects.filter(user=self.user).order_by('date')
+            .values('date', 'tasks_created', 'tasks_completed', 'scheduled_time', 'completed_time')
+        )
+
+    def test_batch_is_applied_with_per_item_results(self):
+        response = self.post({
+            'creates': [
+                {'title': 'Essay', 'T_n': '01:30:00', 'delta': 4, 'due_date': self.due_date, 'due_time': '09:00:00'},
+                {'title': 'Quiz', 'T_n': '1:30', 'delta': 2, 'due_date': self.due_date, 'due_time': '09:00:00'},
+                {'title': 'Done', 'T_n': '00:30:00', 'delta': 1, 'due_date': self.due_date,
+                 'due_time': '09:00:00', 'completed_so_far': 100},
+            ],
+            'updates': [
+                {'id': self.tasks[0].id, 'completed_so_far': 100},
+                {'id': self.tasks[1].id, 'completed_so_far': 40},
+                {'id': 999999, 'completed_so_far': 10},
+            ],
+            'deletes': [self.tasks[2].id, 999999],
+        })
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item['success'] for item in data['created']], [True, False, True])
+        self.assertEqual([item['success'] for item in data['updated']], [True, True, False])
+        self.assertEqual([item['success'] for item in data['deleted']], [True, False])
+        self.assertEqual(data['failed'], 3)
+
+        self.assertTrue(Task.objects.get(id=data['created'][2]['task']['id']).is_completed)
+        self.assertTrue(Task.objects.get(id=self.tasks[0].id).is_completed)
+        self.assertEqual(Task.objects.get(id=self.tasks[1].id).completed_so_far, 40)
+        self.assertFalse(Task.objects.filter(id=self.tasks[2].id).exists())
+
+        # The rollup matches one rebuilt from the tasks
+        applied = self.statistics()
+        rebuild_daily_statistics([self.user.id])
+        self.assertEqual(applied, self.statistics())
+
+    def test_schedule_is_invalidated_once_per_batch(self):
+        with mock.patch('apps.study.bulk.invalidate_user_schedule') as invalidate, \
+                mock.patch('apps.study.signals.invalidate_user_schedule') as signal_invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post({
+                    'updates': [{'id': task.id, 'completed_so_far': 50} for task in self.tasks[:2]],
+                    'deletes': [self.tasks[2].id],
+                })
+                invalidate.assert_not_called()
+
+        invalidate.assert_called_once_with(self.user.id)
+        signal_invalidate.assert_not_called()
+
+    def test_oversized_or_malformed_batch_is_rejected(self):
+        self.assertEqual(self.post({'deletes': list(range(501))}).status_code, 400)
+        self.assertEqual(self.post({'updates': {'id': self.tasks[0].id}}).status_code, 400)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+
+
+class ConditionalRequestTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='demo_user')
+        self.task = Task.objects.create(
+            user=self.user, title='Essay', T_n=timedelta(hours=2), delta=3,
+            due_date=timezone.now().date() + timedelta(days=4), due_time=time(17, 0),
+        )
+
+    def get(self, url, **headers):
+        with redirect_stdout(io.StringIO()):
+            return self.client.get(url, **headers)
+
+    def test_unchanged_schedule_is_not_recomputed(self):
+        first = self.get('/api/study/get-14-day-schedule/')
+        self.assertEqual(first.status_code, 200)
+
+        with mock.patch('apps.study.views.generate_14_day_schedule') as generate:
+            second = self.get('/api/study/get-14-day-schedule/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, 304)
+        generate.assert_not_called()
+
+    def test_task_change_changes_etags(self):
+        for url in ('/api/study/tasks/', '/api/study/dashboard-stats/'):
+            etag = self.get(url)['ETag']
+            self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        before = self.get('/api/study/tasks/')['ETag']
+        self.task.completed_so_far = 50.0
+        self.task.save()
+
+        response = self.get('/api/study/tasks/', HTTP_IF_NONE_MATCH=before)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], before)
+
+    def test_etag_depends_on_query_and_intensity(self):
+        etag = self.get('/api/study/tasks/')['ETag']
+
+        self.assertNotEqual(self.get('/api/study/tasks/?limit=1')['ETag'], etag)
+        set_user_intensity(self.user, 0.2)
+        self.assertNotEqual(self.get('/api/study/tasks/')['ETag'], etag)
+
+
+class TaskSnapshotTests(SchedulerTestMixin, TestCase):
+
+    def test_snapshot_orders_tasks_for_scheduling(self):
+        late = self.make_task('Late', 2, 5)
+        urgent = self.make_task('Urgent', 1, 1, delta=2)
+        important = self.make_task('Important', 1, 1, delta=5)
+
+        snapshot = TaskSnapshot.for_user(self.user)
+
+        self.assertEqual(snapshot.task_ids, [important.id, urgent.id, late.id])
+        self.assertEqual(snapshot.window(self.start_date), (0, 3))
+        self.assertEqual(snapshot.window(self.start_date + timedelta(days=2)), (2, 3))
+
+    def test_simulation_does_not_mutate_snapshot(self):
+        self.make_task('Essay', 3, 2, progress=50.0)
+        snapshot = TaskSnapshot.for_user(self.user)
+
+        progress = snapshot.simulate(1.0, self.start_date, self.start_date + timedelta(days=2))
+
+        self.assertEqual(progress, [100.0])
+        self.assertEqual(snapshot.progress, [50.0])
+
+    def test_infeasible_load_is_reported(self):
+        self.make_task('Thesis', 40, 0)
+        snapshot = TaskSnapshot.for_user(self.user)
+
+        self.assertFalse(snapshot.can_complete(1.0, self.start_date, self.start_date))
+
+
+class MinimumIntensityTests(SchedulerTestMixin, TestCase):
+
+    def test_search_runs_with_a_single_query(self):
+        for index in range(20):
+            self.make_task(f'Task {index}', 1 + index % 4, index % 10, delta=1 + index % 5)
+
+        with self.assertNumQueries(1):
+            result = find_minimum_intensity_for_completion(
+                self.user, self.start_date, self.start_date + timedelta(days=13)
+            )
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['can_complete_all'])
+        self.assertEqual(result['total_tasks'], 20)
+        snapshot = TaskSnapshot.for_user(self.user)
+        self.assertTrue(snapshot.can_complete(
+            result['minimum_intensity'], self.start_date, self.start_date + timedelta(days=13)
+        ))
+
+    def test_analytic_solver_matches_bisection(self):
+        rng = random.Random(2024)
+        for round_index in range(12):
+            Task.objects.filter(user=self.user).delete()
+            for index in range(rng.randint(1, 25)):
+                self.make_task(
+                    f'Task {round_index}-{index}',
+                    rng.choice([0.5, 1, 2, 3, 5, 8]),
+                    rng.randint(0, 12),
+                    delta=rng.randint(1, 5),
+                    progress=rng.choice([0.0, 0.0, 25.0, 60.0]),
+                )
+            for start_date in (self.start_date, timezone.now().date()):
+                end_date = start_date + timedelta(days=13)
+                bisection = find_minimum_intensity_for_completion(self.user, start_date, end_date)
+                analytic = find_minimum_intensity_for_completion(
+                    self.user, start_date, end_date, solver='analytic'
+                )
+
+                self.assertTrue(analytic['success'])
+                self.assertEqual(analytic['minimum_intensity'], bisection['minimum_intensity'])
+                self.assertEqual(analytic['can_complete_all'], bisection['can_complete_all'])
+
+    def test_unknown_solver_is_rejected(self):
+        self.make_task('Essay', 2, 3)
+
+        result = find_minimum_intensity_for_completion(self.user, solver='newton')
+
+        self.assertFalse(result['success'])
+
+
+class IntensitySimulationTests(SchedulerTestMixin, TestCase):
+
+    def test_simulation_runs_with_a_single_query(self):
+        for index in range(12):
+            self.make_task(f'Task {index}', 1 + index % 3, index, delta=1 + index % 5)
+
+        with self.assertNumQueries(1):
+            result = can_complete_tasks_with_intensity_simulation(self.user, 0.6, self.start_date)
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['can_complete'])
+        self.assertEqual(result['completed_tasks'], 12)
+        self.assertEqual(result['total_time_needed'], str(timedelta(hours=24)))
+
+    def test_tasks_outside_the_work_window_are_not_started(self):
+        self.make_task('Essay', 2, 1)
+        far_off = self.make_task('Capstone', 2, 25, progress=50.0)
+
+        result = can_complete_tasks_with_intensity_simulation(self.user, 0.6, self.start_date)
+
+        self.assertFalse(result['can_complete'])
+        self.assertEqual(result['completed_tasks'], 1)
+        self.assertEqual(result['remaining_tasks'], 1)
+        self.assertEqual(Task.objects.get(pk=far_off.pk).completed_so_far, 50.0)
+
+    def test_feasibility_probe_logs_instead_of_printing(self):
+        for index in range(3):
+            self.make_task(f'Task {index}', 2, index + 1)
+
+        output = io.StringIO()
+        with redirect_stdout(output), self.assertLogs('apps.study.task_utils', level='DEBUG') as logs:
+            result = can_complete_tasks_with_intensity(self.user, 0.6, self.start_date)
+
+        self.assertTrue(result['can_complete'])
+        self.assertEqual(output.getvalue(), '')
+        self.assertTrue(any('hours free time' in line for line in logs.output))
+
+
+class RemovalWhatIfTests(SchedulerTestMixin, TestCase):
+
+    def removal_order(self):
+        return list(Task.objects.filter(user=self.user, is_completed=False).order_by('delta', '-T_n'))
+
+    def test_what_if_matches_database_simulation(self):
+        rng = random.Random(11)
+        for index in range(8):
+            self.make_task(
+                f'Task {index}', rng.choice([1, 2, 4, 8]), rng.randint(0, 20),
+                delta=rng.randint(1, 5), progress=rng.choice([0.0, 30.0]),
+            )
+        tasks = self.removal_order()
+        end_date = self.start_date + timedelta(days=30)
+        what_if = RemovalWhatIf(tasks, 0.03, self.start_date, end_date)
+
+        for removal_count in range(len(tasks)):
+            removed_ids = [task.id for task in tasks[:removal_count]]
+            Task.objects.filter(id__in=removed_ids).update(is_completed=True)
+            with redirect_stdout(io.StringIO()):
+                result = can_complete_tasks_with_intensity(self.user, 0.03, self.start_date, end_date)
+            Task.objects.filter(id__in=removed_ids).update(is_completed=False)
+
+            self.assertEqual(what_if.completes_without(removal_count), result['can_complete'])
+
+    def test_binary_search_matches_linear_scan(self):
+        rng = random.Random(5)
+        for round_index in range(10):
+            Task.objects.filter(user=self.user).delete()
+            for index in range(rng.randint(2, 20)):
+                self.make_task(
+                    f'Task {round_index}-{index}', rng.choice([1, 3, 6, 10]), rng.randint(0, 25),
+                    delta=rng.randint(1, 5),
+                )
+            what_if = RemovalWhatIf(
+                self.removal_order(), rng.choice([0.02, 0.03, 0.05]),
+                self.start_date, self.start_date + timedelta(days=30),
+            )
+            linear = next(
+                (count for count in range(len(what_if.tasks)) if what_if.completes_without(count)), None
+            )
+
+            self.assertEqual(what_if.minimum_removals(), linear)
+
+    def test_removal_search_does_not_write(self):
+        for index in range(10):
+            self.make_task(f'Task {index}', 6, 5, delta=1 + index % 5)
+
+        with self.assertNumQueries(1):
+            removals = _find_tasks_to_remove(self.user, 0.05, self.start_date)
+
+        self.assertTrue(removals)
+        self.assertEqual([removal['priority'] for removal in removals], sorted(r['priority'] for r in removals))
+        self.assertFalse(Task.objects.filter(user=self.user, is_completed=True).exists())
+
+
+class ScheduleBatchTests(SchedulerTestMixin, TestCase):
+
+    def test_batch_rows_match_14_day_schedule(self):
+        rng = random.Random(7)
+        for index in range(15):
+            self.make_task(
+                f'Task {index}', rng.choice([1, 2, 4, 6]), rng.randint(0, 13),
+                delta=rng.randint(1, 5), progress=rng.choice([0.0, 40.0]),
+            )
+        tasks = list(Task.objects.filter(user=self.user, is_completed=False))
+
+        with redirect_stdout(io.StringIO()):
+            schedule = get_14_day_schedule(self.user, start_date=self.start_date)
+        intensity = schedule['intensity_used_for_scheduling']
+        batch = evaluate_schedule_batch(tasks, [0.2, intensity, 0.95], self.start_date)
+
+        for day_index, day_plan in enumerate(schedule['schedule']):
+            allotted = sum(item['time_allotted'].total_seconds() for item in day_plan)
+            self.assertAlmostEqual(batch['time_scheduled'][1, day_index], allotted, delta=1.0)
+        self.assertEqual(batch['time_scheduled'].shape, (3, 14))
+
+    def test_sweep_finds_lowest_complete_intensity(self):
+        self.make_task('Essay', 6, 1)
+        self.make_task('Lab report', 4, 3)
+
+        result = sweep_intensities(self.user, count=101, start_date=self.start_date)
+
+        lowest = result['lowest_complete_intensity']
+        self.assertIsNotNone(lowest)
+        row = int(round(lowest * 100))
+        self.assertTrue(result['all_completed'][row])
+        self.assertFalse(result['all_completed'][:row].any())
+        self.assertTrue(result['deadlines_met'][row, -1])
+
+
+class DailyPlannerTests(SchedulerTestMixin, TestCase):
+
+    def linear_plan(self, tasks, day_free_time, min_tasks):
+        """The per-day scan the planner replaced"""
+        tasks = sorted(tasks, key=lambda t: (t.due_date, t.due_time, -t.delta))
+        progress = {task.id: task.completed_so_far for task in tasks}
+        plans = []
+        for free_time in day_free_time:
+            plan, remaining_time = [], free_time
+            for task in tasks:
+                if progress[task.id] >= 100.0:
+                    continue
+                time_needed = task.T_n * (1.0 - progress[task.id] / 100.0)
+                if time_needed <= remaining_time:
+                    plan.append((task.id, time_needed))
+                    progress[task.id] = 100.0
+                    remaining_time -= time_needed
+                    if len(plan) >= min_tasks and remaining_time < timedelta(minutes=30):
+                        break
+                elif remaining_time > timedelta(minutes=30) and len(plan) < min_tasks:
+                    plan.append((task.id, remaining_time))
+                    progress[task.id] = min(100.0, progress[task.id] + remaining_time / task.T_n * 100)
+                    break
+            plans.append(plan)
+        return plans
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(11)
+        for index in range(40):
+            self.make_task(
+                f'Task {index}', rng.choice([0.25, 0.5, 1, 2, 5]), rng.randint(0, 20),
+                delta=rng.randint(1, 5), progress=rng.choice([0.0, 50.0]),
+            )
+        tasks = list(Task.objects.filter(user=self.user))
+        day_free_time = [timedelta(hours=rng.choice([2, 3.5, 6])) for _ in range(20)]
+
+        for min_tasks in (1, 2, 3):
+            plans, _ = plan_days(tasks, day_free_time, min_tasks=min_tasks)
+            self.assertEqual(
+                [[(item['task'].id, item['time_allotted']) for item in plan] for plan in plans],
+                self.linear_plan(tasks, day_free_time, min_tasks)
+            )
+
+    def test_variants_share_the_core(self):
+        self.make_task('Essay', 20, 3)
+        self.make_task('Reading', 1, 1)
+        tasks = list(Task.objects.filter(user=self.user))
+
+        plan = generate_daily_plan(self.user, self.start_date, 0.5)
+        progress = {}
+        first_day = generate_daily_plan_for_tasks_with_progress(self.user, self.start_date, 0.5, tasks, progress)
+
+        self.assertEqual(plan, first_day)
+        self.assertEqual([item['task_title'] for item in plan], ['Reading', 'Essay'])
+        self.assertTrue(plan[1]['partial_completion'])
+        self.assertEqual(progress[plan[1]['task_id']], plan[1]['completion_after'])
+        self.assertEqual(plan[0]['end_time'], plan[1]['start_time'])
+
+
+class TasksForRangeTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+        self.start_date = self.today
+        for index in range(5):
+            self.make_task(f'Task {index}', 3.1, 2 + index)
+
+    def test_range_matches_single_dates_with_one_schedule_run(self):
+        end_date = self.today + timedelta(days=6)
+        with mock.patch(
+            'apps.study.task_utils.get_14_day_schedule', wraps=get_14_day_schedule
+        ) as schedule, redirect_stdout(io.StringIO()):
+            result = get_tasks_for_date_range(self.user, self.today, end_date)
+        self.assertEqual(schedule.call_count, 1)
+
+        self.assertTrue(result['success'])
+        self.assertEqual([day['date'] for day in result['days']],
+                         [self.today + timedelta(days=offset) for offset in range(7)])
+        with redirect_stdout(io.StringIO()):
+            for day in result['days']:
+                single = get_tasks_for_date_with_rounding(self.user, day['date'])
+                self.assertEqual(day['tasks'], single['tasks'])
+                self.assertEqual(day['total_time'], single['total_time'])
+        for day in result['days']:
+            for item in day['tasks']:
+                self.assertEqual(item['time_allotted'].total_seconds() % 300, 0)
+
+    def test_endpoint_validates_range(self):
+        with redirect_stdout(io.StringIO()):
+            response = self.client.get('/api/study/tasks-for-range/', {
+                'start': self.today.isoformat(), 'end': (self.today + timedelta(days=2)).isoformat(),
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['days']), 3)
+
+        response = self.client.get('/api/study/tasks-for-range/', {
+            'start': self.today.isoformat(), 'end': (self.today - timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class ScheduleCacheTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.make_task('Essay', 3, 2)
+
+    def get_schedule(self):
+        with redirect_stdout(io.StringIO()):
+            return get_14_day_schedule(self.user, start_date=self.start_date)
+
+    def test_repeated_requests_are_served_from_cache(self):
+        first = self.get_schedule()
+
+        # The global intensity is cached as well, so a hit runs no queries
+        with self.assertNumQueries(0):
+            second = self.get_schedule()
+
+        self.assertEqual(first, second)
+
+    def test_task_changes_invalidate_cached_schedule(self):
+        first = self.get_schedule()
+        self.make_task('Lab report', 2, 4)
+
+        second = self.get_schedule()
+
+        self.assertEqual(first['completion_analysis']['total_tasks'], 1)
+        self.assertEqual(second['completion_analysis']['total_tasks'], 2)
+
+    def test_user_intensity_change_only_affects_that_user(self):
+        other = User.objects.create_user(username='other_student')
+        Task.objects.create(
+            user=other, title='Reading', T_n=timedelta(hours=2), delta=3,
+            due_date=self.start_date + timedelta(days=3), due_time=time(17, 0),
+        )
+        with redirect_stdout(io.StringIO()):
+            get_14_day_schedule(other, start_date=self.start_date)
+        first = self.get_schedule()
+
+        set_user_intensity(self.user, 0.3)
+        with mock.patch(
+            'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+        ) as generate:
+            second = self.get_schedule()
+            with redirect_stdout(io.StringIO()):
+                get_14_day_schedule(other, start_date=self.start_date)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(generate.call_args.args[0], self.user)
+        self.assertLess(second['intensity_used_for_scheduling'], first['intensity_used_for_scheduling'])
+
+    def test_global_intensity_change_misses_cache(self):
+        self.get_schedule()
+        set_intensity(0.3)
+
+        with mock.patch(
+            'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+        ) as generate:
+            self.get_schedule()
+            self.get_schedule()
+
+        self.assertEqual(generate.call_count, 1)
+
+    @override_settings(SCHEDULE_CACHE_REQUIRE_SHARED=True)
+    def test_per_process_cache_is_not_used_when_a_shared_one_is_required(self):
+        with mock.patch(
+            'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+        ) as generate:
+            self.get_schedule()
+            self.get_schedule()
+
+        self.assertEqual(generate.call_count, 2)
+
+    def test_invalidation_from_another_process_reaches_a_shared_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            shared = {'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir,
+            }}
+            with override_settings(CACHES=shared, SCHEDULE_CACHE_REQUIRE_SHARED=True):
+                self.get_schedule()
+                # Another worker saves a task: it replaces the version in the same cache directory
+                other_worker = FileBasedCache(cache_dir, {})
+                other_worker.incr(f'study:task_version:{self.user.id}')
+
+                with mock.patch(
+                    'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+                ) as generate:
+                    self.get_schedule()
+                    self.get_schedule()
+
+        self.assertEqual(generate.call_count, 1)
+
+
+class AvailabilityScheduleTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        for index in range(4):
+            self.make_task(f'Task {index}', 5, 6 + index)
+
+    def get_schedule(self):
+        with redirect_stdout(io.StringIO()):
+            return get_14_day_schedule(self.user, start_date=self.start_date)
+
+    def test_blackout_day_gets_no_work(self):
+        first = self.get_schedule()
+        self.assertTrue(first['schedule'][1])
+
+        blackout_day = self.start_date + timedelta(days=1)
+        set_user_availability(self.user, blackouts=[[
+            timezone.make_aware(datetime.combine(blackout_day, time(0, 0))),
+            timezone.make_aware(datetime.combine(blackout_day + timedelta(days=1), time(0, 0))),
+        ]])
+        second = self.get_schedule()
+
+        self.assertEqual(second['schedule'][1], [])
+        self.assertEqual(second['completion_analysis']['total_tasks'], 4)
+
+    def test_sessions_are_placed_inside_the_windows(self):
+        set_user_availability(self.user, weekly_windows=[[[9 * 60, 12 * 60], [13 * 60, 17 * 60]] for _ in range(7)])
+
+        schedule = self.get_schedule()
+
+        windows = [(time(9, 0), time(12, 0)), (time(13, 0), time(17, 0))]
+        for day_plan in schedule['schedule']:
+            sessions = sorted((item['start_time'], item['end_time']) for item in day_plan)
+            for start, end in sessions:
+                self.assertTrue(any(low <= start < end <= high for low, high in windows), (start, end))
+            for (_, previous_end), (next_start, _) in zip(sessions, sessions[1:]):
+                self.assertLessEqual(previous_end, next_start)
+
+    def test_weekly_windows_cap_each_day(self):
+        set_user_availability(self.user, weekly_windows=[[[18 * 60, 20 * 60]] for _ in range(7)])
+
+        schedule = self.get_schedule()
+
+        for day_plan in schedule['schedule']:
+            allotted = sum(item['time_allotted'].total_seconds() for item in day_plan)
+            self.assertLessEqual(allotted, 2 * 3600 + 1)
+
+
+class IncrementalScheduleTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.essay = self.make_task('Essay', 10, 1, delta=5)
+        self.problem_set = self.make_task('Problem set', 8, 3)
+        self.lab_report = self.make_task('Lab report', 12, 9)
+
+    def get_schedule(self, use_cache=True):
+        with redirect_stdout(io.StringIO()):
+            return get_14_day_schedule(self.user, start_date=self.start_date, use_cache=use_cache)
+
+    def without_start_times(self, schedule_result):
+        schedule_result = dict(schedule_result)
+        schedule_result['schedule'] = [
+            [{key: value for key, value in item.items() if key != 'start_time'} for item in day_plan]
+            for day_plan in schedule_result['schedule']
+        ]
+        return schedule_result
+
+    def test_progress_update_patches_cached_schedule(self):
+        self.get_schedule()
+        self.problem_set.completed_so_far = 60.0
+        self.problem_set.save()
+
+        with mock.patch(
+            'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+        ) as generate:
+            patched = self.get_schedule()
+        rebuilt = self.get_schedule(use_cache=False)
+
+        generate.assert_not_called()
+        self.assertEqual(self.without_start_times(patched), self.without_start_times(rebuilt))
+
+    def test_completing_a_task_matches_full_rebuild(self):
+        self.get_schedule()
+        self.essay.completed_so_far = 100.0
+        self.essay.save()
+
+        patched = self.get_schedule()
+        rebuilt = self.get_schedule(use_cache=False)
+
+        self.assertEqual(patched['completion_analysis']['total_tasks'], 2)
+        self.assertEqual(self.without_start_times(patched), self.without_start_times(rebuilt))
+
+    def test_concurrent_progress_update_is_not_lost(self):
+        self.get_schedule()
+
+        def update_racing_with_another_save(state, task):
+            # Another worker's save invalidates the schedule while this one replays
+            invalidate_user_schedule(self.user.id)
+            return original_update(state, task)
+
+        original_update = IncrementalSchedule.update_progress
+        self.problem_set.completed_so_far = 60.0
+        with mock.patch.object(IncrementalSchedule, 'update_progress', update_racing_with_another_save):
+            self.assertFalse(apply_progress_update(self.problem_set))
+
+        self.assertNotEqual(get_schedule_state(self.user.id).version, get_task_set_version(self.user.id))
+
+    def test_progress_update_searches_below_the_previous_minimum(self):
+        rng = random.Random(3)
+        Task.objects.filter(user=self.user).delete()
+        for index in range(30):
+            self.make_task(f'Task {index}', rng.choice([2, 4, 6, 8]), rng.randint(1, 12), delta=rng.randint(1, 5))
+
+        for round_index in range(5):
+            with redirect_stdout(io.StringIO()):
+                _, state = _generate_14_day_schedule_state(self.user, self.start_date)
+            task = rng.choice(state.tasks)
+            task.completed_so_far = min(100.0, task.completed_so_far + rng.choice([20.0, 50.0, 100.0]))
+
+            with mock.patch(
+                'apps.study.task_utils._test_completion_across_period', wraps=_test_completion_across_period
+            ) as probe:
+                updated = state.update_progress(task)
+            task.save()
+
+            # A full search checks intensity 1.0 and then probes at least once more
+            self.assertLessEqual(probe.call_count, 1)
+            if updated:
+                search = find_minimum_intensity_for_completion(
+                    self.user, self.start_date, max(other.due_date for other in state.tasks),
+                )
+                self.assertEqual(state.minimum_required_intensity, search['minimum_intensity'])
+
+    def test_only_days_from_first_affected_day_are_replayed(self):
+        with redirect_stdout(io.StringIO()):
+            _, state = _generate_14_day_schedule_state(self.user, self.start_date)
+        first_day = state.first_affected_day(self.lab_report.id)
+        self.assertGreater(first_day, 0)
+        earlier_plans = state.plans[:first_day]
+
+        self.lab_report.completed_so_far = 25.0
+        with mock.patch.object(IncrementalSchedule, '_fill_day', wraps=state._fill_day) as fill_day:
+            self.assertTrue(state.update_progress(self.lab_report))
+
+        self.assertEqual(fill_day.call_count, 14 - first_day)
+        for old_plan, new_plan in zip(earlier_plans, state.plans):
+            self.assertIs(old_plan, new_plan)
+
+    def test_other_field_changes_rebuild_schedule(self):
+        self.get_schedule()
+        self.problem_set.due_date += timedelta(days=2)
+        self.problem_set.save()
+
+        with mock.patch(
+            'apps.study.task_utils._generate_14_day_schedule_state', wraps=_generate_14_day_schedule_state
+        ) as generate:
+            self.get_schedule()
+
+        self.assertEqual(generate.call_count, 1)
+
+
+class RecomputeSchedulesTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.other_user = User.objects.create_user(username='scheduler_test_2')
+        self.make_task('Essay', 3, 2)
+        Task.objects.create(
+            user=self.other_user, title='Reading', T_n=timedelta(hours=2), delta=2,
+            due_date=self.start_date + timedelta(days=4), due_time=time(9, 0),
+        )
+
+    def test_tasks_for_a_chunk_are_loaded_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries, redirect_stdout(io.StringIO()):
+            results = recompute_14_day_schedules([self.user.id, self.other_user.id], self.start_date)
+
+        task_queries = [query for query in queries if 'FROM "study_task"' in query['sql']]
+        self.assertEqual(len(task_queries), 1)
+        self.assertEqual(sorted(result['user_id'] for result in results), [self.user.id, self.other_user.id])
+        self.assertTrue(all(result['success'] for result in results))
+
+    def test_command_fills_the_schedule_cache(self):
+        output = io.StringIO()
+        call_command(
+            'recompute_schedules', workers=0, start_date=self.start_date.isoformat(), stdout=output
+        )
+
+        self.assertIn('Recomputed 2/2 schedules', output.getvalue())
+        self.assertIn('p95', output.getvalue())
+        with mock.patch('apps.study.task_utils._generate_14_day_schedule_state') as generate:
+            schedule = get_14_day_schedule(self.other_user, start_date=self.start_date)
+        generate.assert_not_called()
+        self.assertEqual(schedule['schedule'][0][0]['task_title'], 'Reading')
+
+    def test_command_timeout_outlasts_the_cache_timeout(self):
+        call_command(
+            'recompute_schedules', workers=0, start_date=self.start_date.isoformat(), timeout=3600,
+            stdout=io.StringIO()
+        )
+
+        # The local memory cache expires entries by the time.time clock
+        later = timezone.now().timestamp() + 301
+        with mock.patch('time.time', return_value=later), \
+                mock.patch('apps.study.task_utils._generate_14_day_schedule_state') as generate:
+            get_14_day_schedule(self.other_user, start_date=self.start_date)
+        generate.assert_not_called()
+
+    @override_settings(SCHEDULE_MATERIALIZED=True)
+    def test_command_timeout_keeps_todays_materialized_plan(self):
+        today = get_user_today()
+        call_command(
+            'recompute_schedules', workers=0, start_date=today.isoformat(), timeout=3600, stdout=io.StringIO()
+        )
+
+        with mock.patch('apps.study.materialize.timezone.now', return_value=timezone.now() + timedelta(seconds=301)):
+            self.assertIsNotNone(load_materialized_schedule(self.other_user, today))
+        with mock.patch('apps.study.materialize.timezone.now', return_value=timezone.now() + timedelta(hours=2)):
+            self.assertIsNone(load_materialized_schedule(self.other_user, today))
+
+
+@override_settings(SCHEDULE_MATERIALIZED=True)
+class MaterializedScheduleTests(SchedulerTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.make_task('Essay', 6, 1, delta=5)
+        self.make_task('Problem set', 3, 2, progress=50.0)
+        self.make_task('Lab report', 9, 4)
+
+    def get_schedule(self):
+        with redirect_stdout(io.StringIO()):
+            return get_14_day_schedule(self.user, start_date=self.start_date)
+
+    def test_materialized_reads_match_computed_schedule(self):
+        computed = self.get_schedule()
+
+        self.assertEqual(DailySchedule.objects.filter(user=self.user).count(), 14)
+        with mock.patch('apps.study.materialize.materialize_14_day_schedule') as materialize:
+            stored = self.get_schedule()
+
+        materialize.assert_not_called()
+        self.assertEqual(stored, computed)
+
+    def test_task_change_triggers_rematerialization(self):
+        self.get_schedule()
+        Task.objects.filter(user=self.user, title='Essay').first().delete()
+
+        schedule = self.get_schedule()
+
+        self.assertEqual(schedule['completion_analysis']['total_tasks'], 2)
+        self.assertEqual(DailySchedule.objects.filter(user=self.user).count(), 14)
+        self.assertFalse(TaskAssignment.objects.filter(task__title='Essay').exists())
+
+    def generate_while_tasks_change(self, writes):
+        """Run materialization with a task written during the first `writes` generations"""
+        calls = []
+
+        def generate(*args, **kwargs):
+            calls.append(1)
+            if len(calls) <= writes:
+                self.make_task(f'Added {len(calls)}', 1, 3)
+            return _generate_14_day_schedule(*args, **kwargs)
+
+        with mock.patch('apps.study.task_utils._generate_14_day_schedule', side_effect=generate), \
+                redirect_stdout(io.StringIO()):
+            materialize_14_day_schedule(self.user, self.start_date)
+        return len(calls)
+
+    def test_plan_is_recomputed_when_tasks_change_during_generation(self):
+        self.assertEqual(self.generate_while_tasks_change(writes=1), 2)
+
+        stored = load_materialized_schedule(self.user, self.start_date)
+        self.assertEqual(stored['completion_analysis']['total_tasks'], 4)
+
+    def test_plan_is_not_stored_while_tasks_keep_changing(self):
+        self.generate_while_tasks_change(writes=2)
+
+        self.assertFalse(DailySchedule.objects.filter(user=self.user).exists())
+        self.assertIsNone(load_materialized_schedule(self.user, self.start_date))
+
+    def test_plan_starting_today_expires_with_the_cache_timeout(self):
+        today = get_user_today()
+        with redirect_stdout(io.StringIO()):
+            materialize_14_day_schedule(self.user, today)
+        self.assertIsNotNone(load_materialized_schedule(self.user, today))
+
+        with mock.patch('apps.study.materialize.timezone.now', return_value=timezone.now() + timedelta(seconds=301)):
+            self.assertIsNone(load_materialized_schedule(self.user, today))
+
+    def test_hand_made_schedule_is_kept(self):
+        hand_made = DailySchedule.objects.create(user=self.user, date=self.start_date + timedelta(days=3))
+
+        schedule = self.get_schedule()
+
+        self.assertTrue(schedule['success'])
+        self.assertEqual(schedule['completion_analysis']['total_tasks'], 3)
+        self.assertEqual(list(DailySchedule.objects.filter(user=self.user)), [hand_made])
+        self.assertIsNone(load_materialized_schedule(self.user, self.start_date))
+
+    def test_plan_stored_concurrently_is_served_without_error(self):
+        delete = QuerySet.delete
+
+        def delete_then_store_concurrently(queryset):
+            result = delete(queryset)
+            if queryset.model is DailySchedule:
+                # Another worker's plan lands between this one's delete and insert
+                DailySchedule.objects.create(user=self.user, date=self.start_date, plan_start_date=self.start_date)
+            return result
+
+        with mock.patch.object(QuerySet, 'delete', autospec=True, side_effect=delete_then_store_concurrently), \
+                self.assertLogs('apps.study.materialize', 'INFO') as logs:
+            schedule = self.get_schedule()
+
+        self.assertTrue(schedule['success'])
+        self.assertEqual(schedule['completion_analysis']['total_tasks'], 3)
+        self.assertTrue(any('serving it unstored' in line for line in logs.output))
+
+
+class StatisticsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='demo_user')
+        self.today = timezone.now().date()
+
+    def make_task(self, title, hours, created_days_ago, completed_days_ago=None):
+        task = Task.objects.create(
+            user=self.user,
+            title=title,
+            T_n=timedelta(hours=hours),
+            completed_so_far=100.0 if completed_days_ago is not None else 0.0,
+            due_date=self.today + timedelta(days=5),
+            due_time=time(17, 0),
+        )
+        # Noon local time, so the day never depends on when the test runs
+        created_at = TimeManager.get_day_bounds(self.today - timedelta(days=created_days_ago))[0] + timedelta(hours=12)
+        updated_at = created_at
+        if completed_days_ago is not None:
+            updated_at = TimeManager.get_day_bounds(self.today - timedelta(days=completed_days_ago))[0] + timedelta(hours=12)
+        # auto_now fields can only be backdated with a queryset update, which the
+        # statistics rollup doesn't see
+        Task.objects.filter(pk=task.pk).update(created_at=created_at, updated_at=updated_at)
+        rebuild_daily_statistics([self.user.id])
+        return task
+
+    def get_statistics(self):
+        with redirect_stdout(io.StringIO()):
+            return self.client.get('/api/study/statistics/').json()['statistics']
+
+    def test_statistics_response(self):
+        self.make_task('Essay', 2, 0, completed_days_ago=0)
+        self.make_task('Problem set', 1.5, 1, completed_days_ago=1)
+        self.make_task('Lab report', 3, 0)
+        self.make_task('Reading', 1, 10, completed_days_ago=3)
+
+        statistics = self.get_statistics()
+
+        self.assertEqual(statistics['total_tasks'], 4)
+        self.assertEqual(statistics['completed_tasks'], 3)
+        self.assertEqual(statistics['completion_rate'], 75.0)
+        self.assertEqual(statistics['total_study_hours'], 7.5)
+        self.assertEqual(statistics['assignments_done_today'], 1)
+        self.assertEqual(statistics['streak_days'], 2)
+
+        weekly = {day['date']: day for day in statistics['weekly_stats']}
+        self.assertEqual(len(weekly), 7)
+        expected = {0: (1, 2.0), 1: (1, 1.5), 2: (0, 0), 3: (1, 0)}
+        for days_ago, (completed, hours) in expected.items():
+            day = weekly[(self.today - timedelta(days=days_ago)).strftime('%Y-%m-%d')]
+            self.assertEqual(day['completed_tasks'], completed)
+            self.assertEqual(day['study_hours'], hours)
+
+    def test_statistics_without_tasks(self):
+        statistics = self.get_statistics()
+
+        self.assertEqual(statistics['total_tasks'], 0)
+        self.assertEqual(statistics['completion_rate'], 0)
+        self.assertEqual(statistics['total_study_hours'], 0)
+        self.assertEqual(statistics['streak_days'], 0)
+        self.assertTrue(all(day['completed_tasks'] == 0 for day in statistics['weekly_stats']))
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self.make_task('Essay', 2, 0, completed_days_ago=0)
+        self.get_statistics()
+        with CaptureQueriesContext(connection) as few:
+            self.get_statistics()
+
+        for index in range(30):
+            self.make_task(f'Task {index}', 1, index % 7, completed_days_ago=index % 5)
+        with CaptureQueriesContext(connection) as many:
+            self.get_statistics()
+
+        self.assertEqual(len(few), len(many))
+
+    def test_migration_backfills_tasks_created_before_the_rollup(self):
+        self.make_task('Essay', 2, 0, completed_days_ago=0)
+        self.make_task('Reading', 1, 3)
+        DailyStatistics.objects.all().delete()
+        migration = import_module('apps.study.migrations.0008_backfill_daily_statistics')
+
+        migration.backfill_daily_statistics(django_apps, None)
+
+        statistics = self.get_statistics()
+        self.assertEqual(statistics['total_tasks'], 2)
+        self.assertEqual(statistics['completed_tasks'], 1)
+        self.assertEqual(statistics['total_study_hours'], 3.0)
+
+
+class DailyStatisticsTests(SchedulerTestMixin, TestCase):
+
+    def rollup(self):
+        return {
+            row.date: (row.tasks_created, row.tasks_completed, row.scheduled_time, row.completed_time)
+            for row in DailyStatistics.objects.filter(user=self.user)
+            if row.tasks_created or row.tasks_completed
+        }
+
+    def rebuilt_rollup(self):
+        maintained = self.rollup()
+        rebuild_daily_statistics([self.user.id])
+        return maintained, self.rollup()
+
+    def test_signals_maintain_rollup(self):
+        essay = self.make_task('Essay', 3, 2)
+        self.make_task('Lab report', 2, 4)
+        today = timezone.localdate()
+
+        self.assertEqual(self.rollup(), {today: (2, 0, timedelta(hours=5), timedelta(0))})
+
+        essay.completed_so_far = 100.0
+        essay.save()
+        self.assertEqual(self.rollup(), {today: (2, 1, timedelta(hours=5), timedelta(hours=3))})
+
+        essay.T_n = timedelta(hours=4)
+        essay.save()
+        essay.delete()
+        self.assertEqual(self.rollup(), {today: (1, 0, timedelta(hours=2), timedelta(0))})
+
+    def test_rollup_matches_rebuild_after_backdated_changes(self):
+        tasks = [self.make_task(f'Task {index}', 1 + index % 3, index) for index in range(6)]
+        for index, task in enumerate(tasks):
+            created_at = timezone.now() - timedelta(days=index)
+            Task.objects.filter(pk=task.pk).update(created_at=created_at, updated_at=created_at)
+        rebuild_daily_statistics([self.user.id])
+
+        # Completing a task moves its completion to today; the creation day stays
+        for task in Task.objects.filter(user=self.user)[:3]:
+            task.completed_so_far = 100.0
+            task.save()
+        Task.objects.filter(user=self.user).last().delete()
+
+        maintained, rebuilt = self.rebuilt_rollup()
+        self.assertEqual(maintained, rebuilt)
+
+    def test_user_delete_cascades(self):
+        self.make_task('Essay', 3, 2)
+
+        self.user.delete()
+
+        self.assertFalse(DailyStatistics.objects.exists())
+
+    def test_backfill_command(self):
+        self.make_task('Essay', 3, 2, progress=100.0)
+        expected = self.rollup()
+        DailyStatistics.objects.all().delete()
+
+        with redirect_stdout(io.StringIO()):
+            call_command('backfill_statistics', '--user-id', str(self.user.id))
+
+        self.assertEqual(self.rollup(), expected)
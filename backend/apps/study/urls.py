@@ -5,6 +5,7 @@ urlpatterns = [
     # Task management endpoints
     path('tasks/', views.list_user_tasks, name='list-user-tasks'),
     path('tasks/create/', views.create_task, name='create-task'),
+    path('tasks/bulk/', views.bulk_update_tasks, name='bulk-update-tasks'),
     path('tasks/update-by-name/', views.update_task_by_name_api, name='update-task-by-name'),
     path('tasks/get-by-name/', views.get_task_by_name_api, name='get-task-by-name'),
     path('tasks/<int:task_id>/progress/', views.update_task_progress_api, name='update-task-progress'),
@@ -18,6 +19,7 @@ urlpatterns = [
     # Planning endpoints
     path('generate-daily-plan/', views.generate_daily_plan, name='generate-daily-plan'),
     path('get-14-day-schedule/', views.get_14_day_schedule, name='get-14-day-schedule'),
+    path('tasks-for-range/', views.get_tasks_for_range, name='get-tasks-for-range'),
     
     # Statistics endpoints
     path('statistics/', views.get_statistics, name='get-statistics'),
@@ -1,17 +1,36 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import etag
 from django.utils import timezone
 from django.db import models
 from datetime import date, timedelta
 from .models import Task, DailySchedule, TaskAssignment
-from .task_utils import update_task_by_name, get_task_by_name, generate_daily_plan, get_14_day_schedule as generate_14_day_schedule
+from .bulk import apply_bulk_task_changes
+from .conditional import dashboard_etag, schedule_etag, task_list_etag
+from .stats_rollup import get_user_daily_statistics
+from .task_utils import (
+    update_task_by_name, get_task_by_name, generate_daily_plan, get_14_day_schedule as generate_14_day_schedule,
+    get_tasks_for_date_range,
+)
 from django.contrib.auth import get_user_model
-from apps.core.intensity import get_intensity, set_intensity
+from apps.core.intensity import get_user_intensity, set_intensity
 from django.conf import settings
+from study_bunny.pagination import (
+    encode_cursor, keyset_queryset, paginate_keyset, parse_limit, stream_json_list,
+)
 
 User = get_user_model()
 
+# Fields returned by list_user_tasks, and its keyset ordering (unique thanks to id)
+TASK_LIST_FIELDS = (
+    'id', 'title', 'description', 'T_n', 'completed_so_far', 'delta',
+    'due_date', 'due_time', 'is_completed', 'created_at', 'updated_at',
+)
+TASK_LIST_ORDERING = ('due_date', '-delta', 'id')
+TASK_STREAM_CHUNK_SIZE = 500
+
 
 @api_view(['PATCH'])
 @permission_classes([permissions.AllowAny])
@@ -154,11 +173,18 @@ def get_task_by_name_api(request):
         return Response(result, status=status.HTTP_404_NOT_FOUND)
 
 
+@etag(task_list_etag)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def list_user_tasks(request):
     """
     List all tasks for the authenticated user with optional filtering
+    
+    Query parameters:
+        is_completed, priority, due_after, due_before: Filters
+        limit: Page size (all tasks when omitted); the response then has a next_cursor
+        cursor: next_cursor of the previous page
+        stream: 'true' to stream the JSON response as the rows are read
     """
     user, created = User.objects.get_or_create(
         username='demo_user',
@@ -207,31 +233,106 @@ def list_user_tasks(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    # Order by due date and priority
-    queryset = queryset.order_by('due_date', '-delta')
-    
-    # Convert to list of dictionaries
-    tasks = []
-    for task in queryset:
-        tasks.append({
-            'id': task.id,
-            'title': task.title,
-            'description': task.description,
-            'T_n': str(task.T_n),
-            'completed_so_far': task.completed_so_far,
-            'delta': task.delta,
-            'due_date': task.due_date.isoformat(),
-            'due_time': task.due_time.isoformat(),
-            'is_completed': task.is_completed,
-            'created_at': task.created_at.isoformat(),
-            'updated_at': task.updated_at.isoformat()
-        })
+    # Page through the tasks by due date and priority (keyset pagination, see
+    # study_bunny/pagination.py); without a limit every task is returned
+    try:
+        limit = parse_limit(request.query_params.get('limit'))
+        queryset = keyset_queryset(queryset, TASK_LIST_ORDERING, request.query_params.get('cursor'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response({
+    page = {'next_cursor': None}
+    if request.query_params.get('stream', '').lower() == 'true':
+        # Write the JSON as the rows come in instead of building the whole list
+        response = StreamingHttpResponse(
+            stream_json_list(
+                'tasks',
+                _iter_task_list(queryset, limit, page),
+                head={'success': True},
+                tail=lambda count: {'count': count, 'next_cursor': page['next_cursor']},
+            ),
+            content_type='application/json'
+        )
+        return response
+    
+    tasks = list(_iter_task_list(queryset, limit, page))
+    result = {
         'success': True,
         'tasks': tasks,
         'count': len(tasks)
-    })
+    }
+    if limit is not None:
+        result['next_cursor'] = page['next_cursor']
+    return Response(result)
+
+
+def _iter_task_list(queryset, limit, page):
+    """
+    Yield the list_user_tasks items of a keyset-ordered queryset, reading the rows
+    in chunks. Stops after limit items and stores the next page's cursor in page.
+    """
+    rows = queryset.values_list(*TASK_LIST_FIELDS)
+    if limit is not None:
+        rows = rows[:limit + 1]
+    
+    last_row = None
+    for index, row in enumerate(rows.iterator(chunk_size=TASK_STREAM_CHUNK_SIZE)):
+        if index == limit:
+            values = dict(zip(TASK_LIST_FIELDS, last_row))
+            page['next_cursor'] = encode_cursor([values[field.lstrip('-')] for field in TASK_LIST_ORDERING])
+            break
+        last_row = row
+        task = dict(zip(TASK_LIST_FIELDS, row))
+        task['T_n'] = str(task['T_n'])
+        for field in ('due_date', 'due_time', 'created_at', 'updated_at'):
+            task[field] = task[field].isoformat()
+        yield task
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def bulk_update_tasks(request):
+    """
+    Create, update and delete many tasks in one transaction
+    
+    Body parameters:
+    - creates (list, optional): Task objects with the create_task fields
+    - updates (list, optional): {id, completed_so_far} progress updates
+    - deletes (list, optional): Task IDs to delete
+    
+    Returns:
+    - success (bool): Whether the batch was applied
+    - created, updated, deleted (list): Per-item results in request order, each
+      with index, success and the task or an error
+    - failed (int): Number of items that were skipped
+    """
+    batch = {}
+    for key in ('creates', 'updates', 'deletes'):
+        items = request.data.get(key) or []
+        if not isinstance(items, list):
+            return Response(
+                {'error': f'{key} must be a list'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        batch[key] = items
+    
+    try:
+        # Get or create demo user
+        user, created = User.objects.get_or_create(
+            username='demo_user',
+            defaults={'email': 'demo@studybunny.com', 'first_name': 'Demo', 'last_name': 'User'}
+        )
+        
+        result = apply_bulk_task_changes(user, **batch)
+        if not result['success']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response(
+            {'error': f'Error applying task batch: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
 
 @api_view(['POST'])
@@ -336,13 +437,29 @@ def create_task(request):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def list_daily_schedules(request):
-    """List daily schedules for the user"""
+    """
+    List daily schedules for the user, newest date first
+    
+    Query parameters:
+        limit: Page size (all schedules when omitted); the response then has a next_cursor
+        cursor: next_cursor of the previous page
+    """
     user, created = User.objects.get_or_create(
         username='demo_user',
         defaults={'email': 'demo@studybunny.com', 'first_name': 'Demo', 'last_name': 'User'}
     )
     
-    schedules = DailySchedule.objects.filter(user=user).order_by('-date')
+    # A user has one schedule per date, so the date alone is a unique keyset ordering
+    try:
+        limit = parse_limit(request.query_params.get('limit'))
+        schedules, next_cursor = paginate_keyset(
+            DailySchedule.objects.filter(user=user),
+            ('-date',),
+            cursor=request.query_params.get('cursor'),
+            limit=limit,
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     schedules_data = []
     
     for schedule in schedules:
@@ -353,11 +470,14 @@ def list_daily_schedules(request):
             'updated_at': schedule.updated_at.isoformat()
         })
     
-    return Response({
+    result = {
         'success': True,
         'schedules': schedules_data,
         'count': len(schedules_data)
-    })
+    }
+    if limit is not None:
+        result['next_cursor'] = next_cursor
+    return Response(result)
 
 
 @api_view(['POST'])
@@ -427,7 +547,7 @@ def generate_daily_plan(request):
     
     try:
         target_date = date.fromisoformat(request.data.get('date', timezone.now().date().isoformat()))
-        intensity = get_intensity()
+        intensity = get_user_intensity(user)
         
         plan = generate_daily_plan(user, target_date, intensity)
         
@@ -445,6 +565,7 @@ def generate_daily_plan(request):
         )
 
 
+@etag(schedule_etag)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_14_day_schedule(request):
@@ -462,7 +583,7 @@ def get_14_day_schedule(request):
             # Let the function handle timezone-aware default start date
             start_date = None
         
-        schedule_result = generate_14_day_schedule(user, start_date)
+        schedule_result = generate_14_day_schedule(user, start_date, intensity=get_user_intensity(user))
         
         return Response(schedule_result)
         
@@ -473,6 +594,33 @@ def get_14_day_schedule(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def get_tasks_for_range(request):
+    """
+    Get the tasks scheduled for each date from start to end (inclusive),
+    computed from a single 14-day schedule
+    """
+    user, created = User.objects.get_or_create(
+        username='demo_user',
+        defaults={'email': 'demo@studybunny.com', 'first_name': 'Demo', 'last_name': 'User'}
+    )
+    
+    try:
+        start_date = date.fromisoformat(request.query_params['start'])
+        end_date = date.fromisoformat(request.query_params.get('end', request.query_params['start']))
+    except KeyError:
+        return Response({'error': 'start is required'}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        return Response({'error': 'Invalid date format'}, status=status.HTTP_400_BAD_REQUEST)
+    round_to_5min = request.query_params.get('round', 'true').lower() == 'true'
+    
+    result = get_tasks_for_date_range(user, start_date, end_date, round_to_5min=round_to_5min)
+    if not result['success']:
+        return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_statistics(request):
@@ -483,58 +631,51 @@ def get_statistics(request):
     )
     
     try:
-        # Get all tasks
-        all_tasks = Task.objects.filter(user=user)
-        completed_tasks = all_tasks.filter(is_completed=True)
+        # Per-day rollup rows (one query, O(days) instead of O(tasks))
+        daily_statistics = get_user_daily_statistics(user)
         
         # Calculate statistics
-        total_tasks = all_tasks.count()
-        completed_count = completed_tasks.count()
+        total_tasks = sum(row.tasks_created for row in daily_statistics.values())
+        completed_count = sum(row.tasks_completed for row in daily_statistics.values())
         completion_rate = (completed_count / total_tasks * 100) if total_tasks > 0 else 0
         
         # Calculate total study hours
-        total_hours = 0
-        for task in all_tasks:
-            hours = task.T_n.total_seconds() / 3600
-            total_hours += hours
+        total_hours = sum(row.scheduled_time.total_seconds() for row in daily_statistics.values()) / 3600
         
         # Get intensity-based score
-        intensity = get_intensity()
+        intensity = get_user_intensity(user)
         intensity_score = int(intensity * 100)  # Convert to 0-100 scale
         
+        # Completed tasks per day (by last update, in the current timezone)
+        completed_per_day = {day: row.tasks_completed for day, row in daily_statistics.items()}
+        
         # Calculate assignments done today
         today = timezone.now().date()
-        today_completed = completed_tasks.filter(updated_at__date=today).count()
+        today_completed = completed_per_day.get(today, 0)
+        
+        # Hours of completed tasks per creation day
+        hours_per_day = {day: row.completed_time for day, row in daily_statistics.items()}
         
         # Calculate weekly statistics for chart
-        from datetime import timedelta
         weekly_stats = []
         for i in range(7):
             day = today - timedelta(days=6-i)
-            day_completed = completed_tasks.filter(updated_at__date=day).count()
-            day_total_hours = 0
-            day_tasks = all_tasks.filter(created_at__date=day)
-            for task in day_tasks:
-                if task.is_completed:
-                    day_total_hours += task.T_n.total_seconds() / 3600
+            day_total_time = hours_per_day.get(day)
+            day_total_hours = day_total_time.total_seconds() / 3600 if day_total_time else 0
             
             weekly_stats.append({
                 'date': day.strftime('%Y-%m-%d'),
                 'day_name': day.strftime('%a'),
-                'completed_tasks': day_completed,
+                'completed_tasks': completed_per_day.get(day, 0),
                 'study_hours': round(day_total_hours, 1)
             })
         
         # Calculate streak (consecutive days with completed tasks)
         streak = 0
         current_date = today
-        while True:
-            day_completed_count = completed_tasks.filter(updated_at__date=current_date).count()
-            if day_completed_count > 0:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        while completed_per_day.get(current_date, 0) > 0:
+            streak += 1
+            current_date -= timedelta(days=1)
         
         # Calculate achievements
         achievements = []
@@ -619,6 +760,7 @@ def test_free_time(request):
             'error': str(e)
         })
 
+@etag(dashboard_etag)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_dashboard_stats(request):
@@ -632,12 +774,12 @@ def get_dashboard_stats(request):
             defaults={'email': 'demo@example.com'}
         )
         
-        # Get current intensity
-        current_intensity = get_intensity()
+        # Get the user's current intensity
+        current_intensity = get_user_intensity(demo_user)
         
         # Get required intensity from 14-day simulation
         try:
-            schedule_result = generate_14_day_schedule(demo_user)
+            schedule_result = generate_14_day_schedule(demo_user, intensity=current_intensity)
             print(f"🔍 DEBUG: Full schedule result: {schedule_result}")
             if schedule_result and 'minimum_required_intensity' in schedule_result:
                 minimum_required_intensity = schedule_result['minimum_required_intensity']
@@ -668,20 +810,18 @@ def get_dashboard_stats(request):
         print(f"   📊 Formula: 100 - ({minimum_required_intensity:.6f} * 75) = {personal_score:.1f}")
         print(f"   ✅ Personal Score: {personal_score:.1f} (using ONLY minimum required intensity)")
         
-        # Calculate other stats
-        total_tasks = Task.objects.filter(user=demo_user).count()
+        # Calculate other stats from the per-day rollup
+        daily_statistics = get_user_daily_statistics(demo_user)
+        total_tasks = sum(row.tasks_created for row in daily_statistics.values())
         
         # Calculate tasks completed in the last 7 days
-        from django.utils import timezone
         seven_days_ago = timezone.now().date() - timedelta(days=7)
-        tasks_completed_last_7_days = Task.objects.filter(
-            user=demo_user, 
-            is_completed=True,
-            updated_at__date__gte=seven_days_ago
-        ).count()
+        tasks_completed_last_7_days = sum(
+            row.tasks_completed for day, row in daily_statistics.items() if day >= seven_days_ago
+        )
         
         # Keep completion percent for performance score calculation
-        completed_tasks = Task.objects.filter(user=demo_user, is_completed=True).count()
+        completed_tasks = sum(row.tasks_completed for row in daily_statistics.values())
         completion_percent = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         # Calculate work hours percentile (placeholder)
@@ -0,0 +1,111 @@
+"""
+In-memory "what-if" task removal for StudyBunny
+
+get_optimal_daily_plan recommends dropping the lowest priority, longest
+tasks until the rest fit at the maximum intensity. RemovalWhatIf answers
+"can the rest be completed if the first k of those tasks are dropped?"
+from a preloaded task list, replaying the greedy of
+can_complete_tasks_with_intensity without touching the database.
+"""
+from datetime import timedelta
+from apps.core.capacity import CapacityCalendar
+from .simulation import get_user_today
+from study_bunny.instrumentation import record_simulation
+
+# Minimum free time needed to start a partial work session,
+# matching can_complete_tasks_with_intensity
+MIN_PARTIAL_TIME = timedelta(minutes=30)
+
+
+class RemovalWhatIf:
+    """
+    Feasibility of a task set with a prefix of it removed.
+
+    Tasks are given in removal order; removing k tasks drops tasks[:k].
+    Each day the remaining tasks are worked on highest priority first, then
+    by due date and time, until every task is scheduled or end_date passes.
+    """
+
+    def __init__(self, tasks, intensity, start_date, end_date, user_today=None, availability=None):
+        """
+        Args:
+            tasks (list): Incomplete Task instances in removal order
+            intensity (float): Intensity value between 0.0 and 1.0
+            start_date (date): First day of the period
+            end_date (date): Last day of the period (inclusive)
+            user_today (date, optional): The user's current date (defaults to today in CDT)
+            availability (Availability, optional): The user's availability (defaults to
+                08:00-24:00 every day)
+
+        Raises:
+            ValueError: If the intensity value is out of range
+        """
+        if user_today is None:
+            user_today = get_user_today()
+
+        self.tasks = list(tasks)
+        self.remaining_time = [task.T_n * (1.0 - task.completed_so_far / 100.0) for task in self.tasks]
+        # Indices into self.tasks in the order a day is filled
+        self.schedule_order = sorted(
+            range(len(self.tasks)),
+            key=lambda index: (-self.tasks[index].delta, self.tasks[index].due_date, self.tasks[index].due_time)
+        )
+
+        # Free time of each day does not depend on which tasks are removed
+        self.day_free_time = CapacityCalendar.for_period(
+            start_date, end_date, intensity, user_today=user_today, availability=availability
+        ).free_time
+
+    def completes_without(self, removal_count):
+        """
+        Check whether every task is scheduled once the first removal_count
+        tasks are removed
+        """
+        record_simulation()
+        pending = [index for index in self.schedule_order if index >= removal_count]
+        remaining_time = {index: self.remaining_time[index] for index in pending}
+
+        for day_free_time in self.day_free_time:
+            if not pending:
+                break
+            time_left = day_free_time
+            still_pending = []
+            for position, index in enumerate(pending):
+                if remaining_time[index] <= time_left:
+                    time_left -= remaining_time[index]
+                elif time_left > MIN_PARTIAL_TIME:
+                    # Partial session uses up the rest of the day
+                    remaining_time[index] -= time_left
+                    still_pending.extend(pending[position:])
+                    break
+                else:
+                    still_pending.append(index)
+            pending = still_pending
+
+        return not pending
+
+    def minimum_removals(self):
+        """
+        Find the fewest tasks to remove (as a prefix of the removal order)
+        for the rest to be completed.
+
+        Removing tasks only frees time for the others, so feasibility is
+        monotone in the prefix length and a binary search needs O(log n)
+        simulations.
+
+        Returns:
+            int: Number of tasks to remove, or None if even keeping only the
+                last task does not work
+        """
+        high = len(self.tasks) - 1
+        if high < 0 or not self.completes_without(high):
+            return None
+
+        low = 0
+        while low < high:
+            middle = (low + high) // 2
+            if self.completes_without(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return high
@@ -0,0 +1,8 @@
+"""
+Scheduler benchmark suite for StudyBunny
+
+Seeded synthetic task sets (generators.py) are loaded into a throwaway
+test database and the scheduling functions are timed against them
+(run.py). Results are written as JSON so runs from different releases can
+be compared (compare.py).
+"""
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage (from the backend directory):
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.2]
+
+Exits with status 1 if any benchmark's median time grew by more than the
+threshold (default 20%) or it issues more queries than in the baseline.
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path) as result_file:
+        report = json.load(result_file)
+    return {(result['benchmark'], result['size']): result for result in report['results']}
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare two sets of results keyed by (benchmark, size)
+
+    Returns:
+        tuple: (report lines, whether any regression was found)
+    """
+    lines = []
+    regressed = False
+    for key in sorted(set(baseline) & set(current)):
+        before, after = baseline[key], current[key]
+        ratio = after['median_seconds'] / before['median_seconds'] if before['median_seconds'] else 1.0
+        flags = []
+        if ratio > 1.0 + threshold:
+            flags.append('SLOWER')
+        if after['queries'] > before['queries']:
+            flags.append('MORE QUERIES')
+        regressed = regressed or bool(flags)
+        lines.append(
+            f"{key[0]:<50} {key[1]:>7}  {before['median_seconds'] * 1000:10.2f} -> "
+            f"{after['median_seconds'] * 1000:10.2f} ms ({ratio:5.2f}x)  "
+            f"queries {before['queries']} -> {after['queries']}  {' '.join(flags)}"
+        )
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline', help='Baseline results JSON')
+    parser.add_argument('current', help='Current results JSON')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed relative slowdown of the median time (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    lines, regressed = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    print('\n'.join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Seeded synthetic task generators for the scheduler benchmarks
+
+The same seed, count and start date always produce the same task set, so
+timings from different runs are comparable.
+"""
+import random
+from datetime import time, timedelta
+
+from apps.study.models import Task
+
+# (minutes, weight): mostly short and medium tasks with a tail of long ones
+DURATION_CHOICES = [(15, 10), (30, 20), (60, 25), (90, 15), (120, 12), (180, 8), (300, 6), (480, 3), (720, 1)]
+
+# Priority 1 (very low) to 5 (very high), skewed towards medium
+PRIORITY_WEIGHTS = [(1, 10), (2, 20), (3, 35), (4, 25), (5, 10)]
+
+# (first day, last day, weight) of due dates relative to the start date:
+# a cluster of near deadlines, the two-week horizon, and far-off work
+DEADLINE_BUCKETS = [(0, 6, 40), (7, 13, 35), (14, 60, 25)]
+
+DUE_TIMES = [time(9, 0), time(12, 0), time(17, 0), time(23, 59)]
+
+
+def _weighted_choice(rng, choices):
+    values = [value for value, _ in choices]
+    weights = [weight for _, weight in choices]
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def generate_tasks(user, count, start_date, seed=0, partial_share=0.3):
+    """
+    Build (unsaved) synthetic tasks for a user.
+
+    Args:
+        user: Owner of the tasks
+        count (int): Number of tasks to generate
+        start_date (date): Day the due dates are relative to (no task is due before it)
+        seed (int, optional): Random seed (defaults to 0)
+        partial_share (float, optional): Share of tasks that already have some progress (defaults to 0.3)
+
+    Returns:
+        list: Unsaved Task instances
+    """
+    rng = random.Random(f'{seed}:{count}')
+    tasks = []
+    for index in range(count):
+        first_day, last_day, _ = rng.choices(
+            DEADLINE_BUCKETS, weights=[bucket[2] for bucket in DEADLINE_BUCKETS], k=1
+        )[0]
+        progress = 0.0
+        if rng.random() < partial_share:
+            progress = float(rng.randrange(10, 95, 5))
+
+        tasks.append(Task(
+            user=user,
+            title=f'Benchmark task {index}',
+            description='',
+            T_n=timedelta(minutes=_weighted_choice(rng, DURATION_CHOICES)),
+            completed_so_far=progress,
+            delta=_weighted_choice(rng, PRIORITY_WEIGHTS),
+            due_date=start_date + timedelta(days=rng.randint(first_day, last_day)),
+            due_time=rng.choice(DUE_TIMES),
+        ))
+    return tasks
+
+
+def create_tasks(user, count, start_date, seed=0, partial_share=0.3, batch_size=2000):
+    """
+    Generate synthetic tasks and insert them with bulk_create (no signals fire)
+
+    Returns:
+        int: Number of tasks created
+    """
+    tasks = generate_tasks(user, count, start_date, seed=seed, partial_share=partial_share)
+    Task.objects.bulk_create(tasks, batch_size=batch_size)
+    return len(tasks)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+Run the scheduler benchmarks and write the results as JSON.
+
+A throwaway test database is created for the run, so existing data is
+never touched. For each task-set size one user gets a seeded synthetic
+task set, and every benchmark records wall time over several runs, the
+number of SQL queries and the peak Python memory allocated.
+
+Usage (from the backend directory):
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 10 100 1000 --repeat 5 --output results.json
+    python -m benchmarks.run --benchmarks get_14_day_schedule generate_daily_plan
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'study_bunny.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.study.task_utils import (
+    can_complete_tasks_with_intensity,
+    find_minimum_intensity_for_completion,
+    generate_daily_plan,
+    get_14_day_schedule,
+)
+from benchmarks.generators import create_tasks
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Intensity used by the benchmarks that take one
+BENCHMARK_INTENSITY = 0.5
+
+
+class BenchmarkContext:
+    """
+    The user and dates a benchmark runs against
+    """
+
+    def __init__(self, user, start_date):
+        self.user = user
+        self.start_date = start_date
+
+
+def _warm_schedule_cache(context):
+    get_14_day_schedule(context.user, start_date=context.start_date)
+
+
+# name -> (function to time, optional setup run before every timed call)
+BENCHMARKS = {
+    'get_14_day_schedule': (
+        lambda context: get_14_day_schedule(context.user, start_date=context.start_date, use_cache=False),
+        None,
+    ),
+    'get_14_day_schedule_cached': (
+        lambda context: get_14_day_schedule(context.user, start_date=context.start_date),
+        _warm_schedule_cache,
+    ),
+    'find_minimum_intensity_for_completion': (
+        lambda context: find_minimum_intensity_for_completion(
+            context.user, context.start_date, context.start_date + timedelta(days=13)
+        ),
+        None,
+    ),
+    'find_minimum_intensity_for_completion_analytic': (
+        lambda context: find_minimum_intensity_for_completion(
+            context.user, context.start_date, context.start_date + timedelta(days=13), solver='analytic'
+        ),
+        None,
+    ),
+    'generate_daily_plan': (
+        lambda context: generate_daily_plan(context.user, context.start_date, BENCHMARK_INTENSITY),
+        None,
+    ),
+    'can_complete_tasks_with_intensity': (
+        lambda context: can_complete_tasks_with_intensity(
+            context.user, BENCHMARK_INTENSITY, context.start_date, context.start_date + timedelta(days=30)
+        ),
+        None,
+    ),
+}
+
+
+def run_benchmark(name, context, repeat):
+    """
+    Time one benchmark against the current task set.
+
+    The scheduler's progress prints are discarded so they don't dominate the timings.
+
+    Returns:
+        dict: Timings in seconds, query count and peak memory in bytes
+    """
+    function, setup = BENCHMARKS[name]
+
+    with redirect_stdout(io.StringIO()):
+        # Warm-up run, which also counts the queries
+        cache.clear()
+        if setup is not None:
+            setup(context)
+        with CaptureQueriesContext(connection) as queries:
+            function(context)
+
+        timings = []
+        for _ in range(repeat):
+            cache.clear()
+            if setup is not None:
+                setup(context)
+            started = time.perf_counter()
+            function(context)
+            timings.append(time.perf_counter() - started)
+
+        # Separate run for memory: tracemalloc slows everything down
+        cache.clear()
+        if setup is not None:
+            setup(context)
+        tracemalloc.start()
+        try:
+            function(context)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'runs': repeat,
+        'min_seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'mean_seconds': statistics.mean(timings),
+        'max_seconds': max(timings),
+        'queries': len(queries),
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def run_suite(sizes, benchmark_names, repeat, seed, partial_share):
+    """
+    Run the selected benchmarks for every size in a throwaway test database
+
+    Returns:
+        list: One result dict per (benchmark, size)
+    """
+    results = []
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        # Start tomorrow so the time-of-day dependent "today" capacity never applies
+        start_date = timezone.now().date() + timedelta(days=1)
+        for size in sizes:
+            user = User.objects.create_user(username=f'benchmark_{size}')
+            create_tasks(user, size, start_date, seed=seed, partial_share=partial_share)
+            context = BenchmarkContext(user, start_date)
+
+            for name in benchmark_names:
+                result = run_benchmark(name, context, repeat)
+                result.update({'benchmark': name, 'size': size})
+                results.append(result)
+                print(
+                    f"{name:<50} {size:>7} tasks  median {result['median_seconds'] * 1000:10.2f} ms  "
+                    f"{result['queries']:>5} queries  peak {result['peak_memory_bytes'] / 1024:10.1f} KiB",
+                    file=sys.stderr
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the StudyBunny scheduler benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f'Task-set sizes (default: {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (default: 3)')
+    parser.add_argument('--seed', type=int, default=42, help='Task generator seed (default: 42)')
+    parser.add_argument('--partial-share', type=float, default=0.3,
+                        help='Share of tasks with partial progress (default: 0.3)')
+    parser.add_argument('--output', type=str, default=None, help='JSON output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    results = run_suite(args.sizes, args.benchmarks, args.repeat, args.seed, args.partial_share)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'seed': args.seed,
+            'partial_share': args.partial_share,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Django management command to rebuild the per-day statistics rollup
+
+The rollup is kept up to date by the Task signals. Run this once after
+deploying it, and after writes that bypass the signals (bulk imports,
+queryset updates).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user, per-day statistics rollup from the tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            action='append',
+            dest='user_ids',
+            default=None,
+            help='Only rebuild this user (can be repeated; default: every user)'
+        )
+
+    def handle(self, *args, **options):
+        from apps.study.stats_rollup import rebuild_daily_statistics
+
+        user_ids = options['user_ids']
+        scope = f'{len(user_ids)} users' if user_ids else 'all users'
+        self.stdout.write(f'Rebuilding the statistics rollup for {scope}')
+
+        started = time.perf_counter()
+        rows = rebuild_daily_statistics(user_ids)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} daily statistics rows in {elapsed:.2f}s'))
@@ -0,0 +1,160 @@
+"""
+Django management command to precompute 14-day schedules for every user
+
+Schedules are stored where get_14_day_schedule reads them: the materialized
+tables with SCHEDULE_MATERIALIZED, otherwise the cache. Worker processes only
+help in cache mode when the cache is shared (e.g. Redis), not the default
+per-process local memory cache.
+
+Like any stored schedule, they are served for SCHEDULE_CACHE_TIMEOUT unless
+--timeout says otherwise, and until one of the user's tasks changes. A run
+before the morning rush needs a --timeout that reaches it, e.g. computing
+--start-date tomorrow shortly before midnight with --timeout 43200. The first
+day of a schedule only counts the free time left when it was computed.
+"""
+import io
+import math
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.db import connections
+
+
+def _init_worker():
+    """
+    Worker process setup: make sure Django is loaded and don't reuse the
+    parent's database connections
+    """
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _recompute_chunk(user_ids, start_date, max_intensity, timeout):
+    """
+    Worker entry point: recompute the schedules of one chunk of users
+    """
+    from apps.study.task_utils import recompute_14_day_schedules
+    try:
+        # The scheduler prints its progress; keep the command output to the report
+        with redirect_stdout(io.StringIO()):
+            return recompute_14_day_schedules(user_ids, start_date, max_intensity, timeout)
+    finally:
+        connections.close_all()
+
+
+def _percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = 'Recompute the 14-day schedule of every user (e.g. nightly, before the morning rush)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of worker processes; 0 runs everything in this process (default: 4)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=50,
+            help='Users per chunk; each chunk loads its tasks with one query (default: 50)'
+        )
+        parser.add_argument(
+            '--start-date',
+            type=str,
+            default=None,
+            help='First day of the schedules in YYYY-MM-DD format (default: today)'
+        )
+        parser.add_argument(
+            '--max-intensity',
+            type=float,
+            default=0.9,
+            help='Maximum acceptable intensity (default: 0.9)'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=int,
+            default=None,
+            help='Seconds the schedules are served before being recomputed (default: SCHEDULE_CACHE_TIMEOUT)'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        chunk_size = options['chunk_size']
+        max_intensity = options['max_intensity']
+        timeout = options['timeout']
+
+        if workers < 0:
+            raise CommandError('--workers must be 0 or more')
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if timeout is not None and timeout < 1:
+            raise CommandError('--timeout must be at least 1')
+
+        if options['start_date']:
+            try:
+                start_date = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--start-date must be in YYYY-MM-DD format')
+        else:
+            from apps.study.simulation import get_user_today
+            start_date = get_user_today()
+
+        user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+        chunks = [user_ids[index:index + chunk_size] for index in range(0, len(user_ids), chunk_size)]
+        self.stdout.write(
+            f'Recomputing schedules from {start_date} for {len(user_ids)} users '
+            f'in {len(chunks)} chunks with {workers or "no"} worker processes'
+        )
+
+        started = time.perf_counter()
+        results = []
+        if workers == 0:
+            for chunk in chunks:
+                results.extend(_recompute_chunk(chunk, start_date, max_intensity, timeout))
+        else:
+            # Children must open their own connections, not share the parent's socket
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = [
+                    executor.submit(_recompute_chunk, chunk, start_date, max_intensity, timeout)
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        self.stdout.write(self.style.WARNING(f'Chunk failed: {e}'))
+        elapsed = time.perf_counter() - started
+
+        failed = [result['user_id'] for result in results if not result['success']]
+        latencies = sorted(result['seconds'] for result in results)
+        throughput = len(results) / elapsed if elapsed > 0 else 0.0
+
+        self.stdout.write(
+            f'Latency per user: p50 {_percentile(latencies, 50) * 1000:.1f} ms, '
+            f'p95 {_percentile(latencies, 95) * 1000:.1f} ms, '
+            f'p99 {_percentile(latencies, 99) * 1000:.1f} ms'
+        )
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Failed for {len(failed)} users: {failed}'))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Recomputed {len(results) - len(failed)}/{len(user_ids)} schedules '
+                f'in {elapsed:.2f}s ({throughput:.1f} users/sec)'
+            )
+        )
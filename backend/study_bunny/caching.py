@@ -0,0 +1,36 @@
+"""
+Cache helpers shared by the StudyBunny apps
+
+Cached schedules and intensities are invalidated by replacing version
+tokens in Django's cache. Other processes (e.g. the other gunicorn
+workers) only see a new token when they share the cache, so a
+per-process backend such as LocMemCache leaves them serving stale
+values until their entries expire. settings_production therefore always
+configures a shared cache, and the schedule cache refuses to run on a
+per-process one there (SCHEDULE_CACHE_REQUIRE_SHARED).
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+# Seconds cached schedules and intensities may be served without a reload
+DEFAULT_CACHE_TIMEOUT = 300
+
+# Backends whose entries are only visible to the process that wrote them
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def get_cache_timeout():
+    """
+    Get the SCHEDULE_CACHE_TIMEOUT setting in seconds
+    """
+    return getattr(settings, 'SCHEDULE_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+
+
+def is_process_local_cache(alias='default'):
+    """
+    Check whether a cache is private to the current process
+    """
+    backend = caches[alias]
+    return f'{type(backend).__module__}.{type(backend).__name__}' in PROCESS_LOCAL_BACKENDS
@@ -0,0 +1,219 @@
+"""
+Opt-in request instrumentation for StudyBunny
+
+When INSTRUMENTATION_ENABLED is set, InstrumentationMiddleware records for
+every request:
+- the number of SQL queries and the time spent in them
+- the time spent in the task_utils scheduler functions (@scheduler_timed)
+- the number of schedule simulations run (record_simulation)
+
+The numbers are returned in a Server-Timing header and aggregated per URL
+name over a rolling window of recent requests, served by the
+instrumentation stats endpoint in apps/core. A streaming response's body
+is produced after its headers are sent, so it gets no header; its numbers
+are recorded once the body has been sent (or the client went away). With the setting off the
+middleware removes itself and the hooks are no-ops.
+"""
+import functools
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Requests kept per URL name for the rolling percentiles
+DEFAULT_ROLLING_WINDOW = 500
+
+_current_metrics = ContextVar('studybunny_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Counters for the request being handled
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.scheduler_seconds = 0.0
+        self.simulations = 0
+        self.scheduler_depth = 0
+
+
+def is_instrumentation_enabled():
+    """
+    Check whether request instrumentation is turned on
+    """
+    return getattr(settings, 'INSTRUMENTATION_ENABLED', False)
+
+
+def record_simulation(count=1):
+    """
+    Count schedule simulations run for the current request (no-op outside one)
+    """
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.simulations += count
+
+
+def scheduler_timed(function):
+    """
+    Decorator adding a scheduler function's run time to the current request.
+    Nested scheduler calls are covered by the outermost one.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None or metrics.scheduler_depth:
+            return function(*args, **kwargs)
+
+        metrics.scheduler_depth = 1
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            metrics.scheduler_seconds += time.perf_counter() - started
+            metrics.scheduler_depth = 0
+    return wrapper
+
+
+def _percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    rank = max(1, math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """
+    Rolling per-URL-name samples of the request metrics, shared by all
+    threads of the process
+    """
+
+    FIELDS = ('total_ms', 'db_ms', 'queries', 'scheduler_ms', 'simulations')
+
+    def __init__(self, window=DEFAULT_ROLLING_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+
+    def record(self, url_name, sample):
+        with self._lock:
+            self._samples[url_name].append(sample)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """
+        Get p50/p95 of every metric per URL name
+
+        Returns:
+            dict: URL name -> {'count': int, field: {'p50': float, 'p95': float}, ...}
+        """
+        with self._lock:
+            samples = {url_name: list(values) for url_name, values in self._samples.items()}
+
+        summary = {}
+        for url_name, values in sorted(samples.items()):
+            endpoint = {'count': len(values)}
+            for field in self.FIELDS:
+                ordered = sorted(value[field] for value in values)
+                endpoint[field] = {
+                    'p50': _percentile(ordered, 50),
+                    'p95': _percentile(ordered, 95),
+                }
+            summary[url_name] = endpoint
+        return summary
+
+
+endpoint_stats = EndpointStats()
+
+
+class InstrumentationMiddleware:
+    """
+    Measure queries, scheduler time and simulations per request
+    """
+
+    def __init__(self, get_response):
+        if not is_instrumentation_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        with self._measuring(metrics):
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._measured_content(request, response.streaming_content, metrics, started)
+            return response
+
+        total_seconds = time.perf_counter() - started
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.query_seconds * 1000:.2f};desc="{metrics.query_count} queries"',
+            f'scheduler;dur={metrics.scheduler_seconds * 1000:.2f}',
+            f'simulations;desc="{metrics.simulations}"',
+            f'total;dur={total_seconds * 1000:.2f}',
+        ])
+        self._record(request, metrics, total_seconds)
+        return response
+
+    def _measured_content(self, request, content, metrics, started):
+        """
+        Stream the body, counting the queries run while producing it, and
+        record the request once it has been sent
+        """
+        try:
+            iterator = iter(content)
+            while True:
+                with self._measuring(metrics):
+                    chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self._record(request, metrics, time.perf_counter() - started)
+
+    @staticmethod
+    def _record(request, metrics, total_seconds):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None and resolver_match.url_name:
+            endpoint_stats.record(resolver_match.url_name, {
+                'total_ms': total_seconds * 1000,
+                'db_ms': metrics.query_seconds * 1000,
+                'queries': metrics.query_count,
+                'scheduler_ms': metrics.scheduler_seconds * 1000,
+                'simulations': metrics.simulations,
+            })
+
+    @classmethod
+    @contextmanager
+    def _measuring(cls, metrics):
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(cls._time_query(metrics)))
+                yield
+        finally:
+            _current_metrics.reset(token)
+
+    @staticmethod
+    def _time_query(metrics):
+        def execute_wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                metrics.query_count += 1
+                metrics.query_seconds += time.perf_counter() - started
+        return execute_wrapper
@@ -0,0 +1,165 @@
+"""
+Keyset (cursor) pagination and streamed JSON lists for StudyBunny
+
+A page is the rows after the last row of the previous page in a fixed,
+unique ordering, fetched with a range condition on the ordering columns:
+
+    (a > x) OR (a = x AND b < y) OR (a = x AND b = y AND id > z)
+
+for an ordering of ('a', '-b', 'id'). With an index on the ordering
+columns every page is an index range scan of page-size rows, however far
+into the list it is, unlike OFFSET which reads and discards every earlier
+row. The cursor handed to clients is the ordering values of the last row,
+base64-encoded JSON.
+
+stream_json_list writes a JSON object whose list is produced row by row,
+for StreamingHttpResponse, so large lists are never built in memory.
+"""
+import base64
+import binascii
+import functools
+import json
+import operator
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+# Largest page size a client can ask for
+MAX_PAGE_SIZE = 500
+
+
+def parse_limit(value, default=None, maximum=MAX_PAGE_SIZE):
+    """
+    Parse a page size query parameter
+
+    Args:
+        value (str): The parameter (None or empty for the default)
+        default (int, optional): Page size when the parameter is missing (None for no paging)
+        maximum (int, optional): Largest accepted page size
+
+    Returns:
+        int: The page size, or default
+
+    Raises:
+        ValueError: If the value is not an integer between 1 and maximum
+    """
+    if value in (None, ''):
+        return default
+    limit = int(value)
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
+
+
+def _field_name(ordering_field):
+    return ordering_field.lstrip('-')
+
+
+def encode_cursor(values):
+    """
+    Encode the ordering values of a row as an opaque cursor
+    """
+    payload = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode())
+    return encoded.decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """
+    Decode a cursor into ordering values of the model's field types
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the ordering
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError("Invalid cursor")
+    try:
+        return [
+            model._meta.get_field(_field_name(field)).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except ValidationError:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(ordering, values):
+    """
+    Build the condition selecting the rows after values in the given ordering
+    """
+    conditions = []
+    for depth, field in enumerate(ordering):
+        equal = {_field_name(previous): value for previous, value in zip(ordering[:depth], values)}
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        conditions.append(Q(**equal, **{f'{_field_name(field)}__{lookup}': values[depth]}))
+    return functools.reduce(operator.or_, conditions)
+
+
+def keyset_queryset(queryset, ordering, cursor=None):
+    """
+    Order a queryset for keyset pagination and start it after the cursor
+
+    Args:
+        queryset: The rows to page through
+        ordering (tuple): Field names, '-' prefixed for descending; must end with a unique field
+        cursor (str, optional): Cursor of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return queryset
+
+
+def paginate_keyset(queryset, ordering, cursor=None, limit=None):
+    """
+    Fetch one page of model instances
+
+    Returns:
+        tuple: (list of instances, cursor of the next page or None on the last page)
+    """
+    queryset = keyset_queryset(queryset, ordering, cursor)
+    if limit is None:
+        return list(queryset), None
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, _field_name(field)) for field in ordering])
+
+
+def stream_json_list(list_key, items, head=None, tail=None):
+    """
+    Stream a JSON object with one list member produced item by item.
+
+    Args:
+        list_key (str): Name of the list member
+        items: Iterable of JSON-serializable items
+        head (dict, optional): Members written before the list
+        tail (callable, optional): Called with the number of items once the list is
+            written; returns the members written after it
+
+    Yields:
+        str: Chunks of the JSON document
+    """
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    members = [f'{encoder.encode(key)}:{encoder.encode(value)}' for key, value in (head or {}).items()]
+    yield '{' + ''.join(member + ',' for member in members) + f'{encoder.encode(list_key)}:['
+
+    count = 0
+    for item in items:
+        yield (',' if count else '') + encoder.encode(item)
+        count += 1
+
+    closing = ''.join(
+        f',{encoder.encode(key)}:{encoder.encode(value)}' for key, value in (tail(count) if tail else {}).items()
+    )
+    yield ']' + closing + '}'
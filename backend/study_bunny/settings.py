@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'study_bunny.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -125,6 +126,22 @@ CORS_ALLOWED_ORIGINS = [
 # Change this value anytime to adjust system behavior
 STUDYBUNNY_INTENSITY = 0.7
 
+# Seconds a generated 14-day schedule stays in the per-user schedule cache
+SCHEDULE_CACHE_TIMEOUT = 300
+
+# Only cache schedules when the cache backend is shared between processes; the
+# development server is a single process, so its local memory cache is fine
+SCHEDULE_CACHE_REQUIRE_SHARED = False
+
+# Serve 14-day schedules from the DailySchedule/TaskAssignment tables instead of the cache,
+# optionally recomputing a user's plan in a worker thread whenever one of their tasks changes
+SCHEDULE_MATERIALIZED = os.environ.get('SCHEDULE_MATERIALIZED', 'False') == 'True'
+SCHEDULE_MATERIALIZE_IN_BACKGROUND = os.environ.get('SCHEDULE_MATERIALIZE_IN_BACKGROUND', 'False') == 'True'
+
+# Record per-request query counts, scheduler time and simulations (Server-Timing header
+# and /api/core/instrumentation/stats/); off by default
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'False') == 'True'
+
 # Canvas Integration Settings (now configured via frontend)
 CANVAS_BASE_URL = 'https://canvas.instructure.com'  # Default base URL
 
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'study_bunny.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
@@ -240,7 +241,9 @@ REST_FRAMEWORK = {
     ],
 }
 
-# Cache Configuration (optional, using AWS ElastiCache)
+# Cache Configuration (Redis via AWS ElastiCache, or a file cache shared by the workers)
+# Schedule and intensity invalidation goes through the cache, so it must be shared by
+# every gunicorn worker; the per-process local memory default is never used here
 USE_REDIS = env.bool('USE_REDIS', default=False)
 
 if USE_REDIS:
@@ -253,4 +256,23 @@ if USE_REDIS:
             }
         }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': env('CACHE_DIR', default=os.path.join(BASE_DIR, 'cache')),
+        }
+    }
+
+# Schedules are cached only on a shared cache
+SCHEDULE_CACHE_TIMEOUT = 300
+SCHEDULE_CACHE_REQUIRE_SHARED = True
+
+# Serve 14-day schedules from the DailySchedule/TaskAssignment tables instead of the cache,
+# optionally recomputing a user's plan in a worker thread whenever one of their tasks changes
+SCHEDULE_MATERIALIZED = env.bool('SCHEDULE_MATERIALIZED', default=False)
+SCHEDULE_MATERIALIZE_IN_BACKGROUND = env.bool('SCHEDULE_MATERIALIZE_IN_BACKGROUND', default=False)
 
+# Record per-request query counts, scheduler time and simulations (Server-Timing header
+# and /api/core/instrumentation/stats/); the middleware removes itself when off
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=False)